@@ -0,0 +1,77 @@
+"""
+Throughput of the RDF toolkit strategies under concurrent sessions.
+
+Runs every STRATEGIES operation against every cached building from a thread pool and
+reports queries/second per thread count, with and without a process-wide query lock
+(the previous behaviour of `_safe_query`).
+
+    python benchmarks/rdf_concurrency.py --threads 1 2 4 8 --rounds 20
+
+Note: rdflib's SPARQL engine is pure Python, so with the GIL enabled the lock-free path
+mostly removes convoying between sessions; near-linear scaling needs a free-threaded
+interpreter (python3.13t or later).
+"""
+import argparse
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from brick_assistant.tools import rdf_query
+from brick_assistant.tools.rdf_query import RDFToolkitArgs, STRATEGIES, graph_cache, load_graph
+
+
+def _buildings():
+    names = []
+    for path in sorted(rdf_query.settings.TTL_FILES_PATH.glob("bui_*.ttl")):
+        name = path.stem[len("bui_"):]
+        if graph_cache.warm([name])[name] is None:
+            names.append(name)
+    return names
+
+
+def _work(buildings, rounds):
+    return [
+        (building, op)
+        for _ in range(rounds)
+        for building in buildings
+        for op in STRATEGIES
+    ]
+
+
+def _run_one(item, lock):
+    building, op = item
+    args = RDFToolkitArgs(building_name=building, operation=op)
+    if lock is None:
+        STRATEGIES[op](load_graph(building), args)
+    else:
+        with lock:
+            STRATEGIES[op](load_graph(building), args)
+
+
+def bench(threads, work, lock):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(lambda item: _run_one(item, lock), work))
+    return len(work) / (time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    buildings = _buildings()
+    work = _work(buildings, args.rounds)
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"{len(buildings)} buildings, {len(work)} queries per run, GIL enabled: {gil}")
+    print(f"{'threads':>8} {'global lock q/s':>16} {'lock-free q/s':>14}")
+    for n in args.threads:
+        locked = bench(n, work, threading.RLock())
+        free = bench(n, work, None)
+        print(f"{n:>8} {locked:>16.0f} {free:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Latency of the built-in RDF operations: precomputed entity index vs SPARQL.
+
+Also checks that both backends return identical results for every building.
+
+    python benchmarks/rdf_index.py --repeat 200
+"""
+import argparse
+import time
+
+from brick_assistant.config import settings
+from brick_assistant.tools.rdf_query import RDFToolkitArgs, STRATEGIES, graph_cache, load_graph
+
+
+def _buildings():
+    names = [path.stem[len("bui_"):] for path in sorted(settings.TTL_FILES_PATH.glob("bui_*.ttl"))]
+    return [name for name, error in graph_cache.warm(names).items() if error is None]
+
+
+def _time(mode, graphs, repeat):
+    settings.RDF_QUERY_MODE = mode
+    timings = {}
+    for op, fn in STRATEGIES.items():
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for building, g in graphs:
+                fn(g, RDFToolkitArgs(building_name=building, operation=op))
+        timings[op] = (time.perf_counter() - start) / (repeat * len(graphs)) * 1e6
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    graphs = [(b, load_graph(b)) for b in _buildings()]
+    previous = settings.RDF_QUERY_MODE
+    try:
+        _time("verify", graphs, 1)  # raises IndexMismatchError on any difference
+        sparql = _time("sparql", graphs, args.repeat)
+        index = _time("index", graphs, args.repeat)
+    finally:
+        settings.RDF_QUERY_MODE = previous
+
+    print(f"{len(graphs)} buildings, results identical across backends")
+    print(f"{'operation':>26} {'sparql us':>10} {'index us':>9}")
+    for op in STRATEGIES:
+        print(f"{op:>26} {sparql[op]:>10.1f} {index[op]:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ from dotenv import load_dotenv
 from brick_assistant.config.configs import AgentConfig  
 
 from brick_assistant.graphs.wuerth_vanilla_graph_dev_rdf import WuerthVanillaGraphRDF
+from brick_assistant.graphs.wuerth_single_call_graph_rdf import WuerthSingleCallGraphRDF
 
 
 # Load .env file manually (for getting the values)
@@ -31,4 +32,7 @@ config = AgentConfig(
 # Create graph instances with injected config
 
 wuerth_vanilla_graph_devRDF = WuerthVanillaGraphRDF(keys=config)
-wuerth_vanilla_graph_devRDF_compiled = WuerthVanillaGraphRDF(keys=config)._compiled_graph()
\ No newline at end of file
+wuerth_vanilla_graph_devRDF_compiled = WuerthVanillaGraphRDF(keys=config)._compiled_graph()
+
+# Single-call entry variant (validation and routing in one LLM call)
+wuerth_single_call_graph_devRDF = WuerthSingleCallGraphRDF(keys=config)
@@ -1,8 +1,10 @@
-from typing import Literal, TypedDict, Union
+from typing import Any, Dict, List, Literal, Optional, TypedDict, Union
 from pydantic import Field,BaseModel
 from langchain.chat_models.base import BaseChatModel
 from pathlib import Path
 
+from brick_assistant.config import settings
+
 # Define the config
 class GraphConfig(TypedDict):
     model: Union[
@@ -20,4 +22,70 @@ class AgentConfig(BaseModel):
     metadata_file: Path = Field(..., description="Path to metadata JSON file")
     ttl_files_path: Path = Field(..., description="Directory containing TTL files")
     default_model: str = Field("gpt-4-1106-preview", description="Default LLM model")
-    top_k_results: int = Field(5, description="Number of results to return for searches")
\ No newline at end of file
+    top_k_results: int = Field(5, description="Number of results to return for searches")
+    intent_fast_path: bool = Field(
+        True, description="Route recognized RDF questions straight to rdf_toolkit, skipping the routing LLM calls"
+    )
+    metadata_filter: bool = Field(
+        True, description="Inject only the buildings the question refers to (full list when none match)"
+    )
+    context_budget_enabled: bool = Field(True, description="Compact old tool outputs to fit per-node input budgets")
+    context_budget_tokens: Dict[str, Optional[int]] = Field(
+        default_factory=lambda: dict(settings.CONTEXT_BUDGET_TOKENS),
+        description="Per-node input budget in approximate tokens: node -> tokens (None = unlimited)",
+    )
+    llm_cache_enabled: bool = Field(True, description="Cache LLM responses of the graph nodes on disk")
+    llm_cache_path: Path = Field(settings.LLM_CACHE_PATH, description="SQLite file of the LLM response cache")
+    llm_cache_max_entries: int = Field(settings.LLM_CACHE_MAX_ENTRIES, description="LRU bound of the LLM response cache")
+    llm_cache_policy: Dict[str, Dict[str, Any]] = Field(
+        default_factory=lambda: dict(settings.LLM_CACHE_POLICY),
+        description="Per-node cache policy: node -> {'enabled': bool, 'ttl_s': seconds or None}",
+    )
+    db_pool_size: int = Field(5, description="Persistent connections kept in the SQL pool (ignored for SQLite)")
+    db_max_overflow: int = Field(10, description="Extra connections allowed above db_pool_size under load (ignored for SQLite)")
+    db_pool_pre_ping: bool = Field(True, description="Test pooled connections before use")
+    db_pool_recycle_s: int = Field(1800, description="Recycle pooled connections older than this (seconds)")
+    db_pool_timeout_s: float = Field(30.0, description="Seconds to wait for a free pooled connection")
+    db_statement_timeout_ms: Optional[int] = Field(
+        30000, description="Server-side statement timeout (PostgreSQL only); None disables it"
+    )
+    sql_schema_ttl_s: Optional[float] = Field(
+        settings.SQL_SCHEMA_TTL_S, description="Lifetime of the cached SQL schema (None = until refresh)"
+    )
+    sql_schema_injection: bool = Field(
+        False, description="Inject the cached schema after list_tables, skipping the call_get_schema LLM hop"
+    )
+    sql_schema_tables: Optional[List[str]] = Field(
+        None, description="Timeseries tables whose schema is injected (default: every usable table)"
+    )
+    sql_streaming: bool = Field(
+        True, description="Run sql_db_query on a server-side cursor and return a bounded summary instead of every row"
+    )
+    sql_stream_max_rows: int = Field(settings.SQL_STREAM_MAX_ROWS, description="Rows streamed before the result is truncated")
+    sql_stream_max_bytes: int = Field(settings.SQL_STREAM_MAX_BYTES, description="Bytes of row text streamed before truncating")
+    sql_stream_sample_rows: int = Field(settings.SQL_STREAM_SAMPLE_ROWS, description="Rows shown verbatim in the summary")
+    sql_validator_enabled: bool = Field(
+        True, description="Check generated SQL with the local validator instead of the check_query LLM call"
+    )
+    sql_validator_llm_fallback: bool = Field(
+        True, description="Use the check_query LLM call for queries the validator cannot parse (else reject them)"
+    )
+    sql_max_rows: int = Field(settings.SQL_MAX_ROWS, description="Upper bound enforced on explicit LIMITs of generated SQL")
+    uuid_handles: bool = Field(
+        True, description="Capture rdf_toolkit UUID sets under handles ('@bcgw_temp') that SQL and sensor_stats expand"
+    )
+    sensor_stats_enabled: bool = Field(
+        True, description="Offer generate_query the typed sensor_stats aggregation tool next to sql_db_query"
+    )
+    sensor_table: str = Field(settings.SENSOR_TABLE, description="Timeseries table queried by sensor_stats")
+    sensor_columns: Dict[str, str] = Field(
+        default_factory=lambda: dict(settings.SENSOR_COLUMNS),
+        description="Columns of the timeseries table: {'uuid': ..., 'time': ..., 'value': ...}",
+    )
+    sql_cache_enabled: bool = Field(True, description="Cache sql_db_query results (read-only queries)")
+    sql_cache_ttl_s: float = Field(settings.SQL_CACHE_TTL_S, description="Maximum age of a cached SQL result")
+    sql_cache_bucket_s: float = Field(
+        settings.SQL_CACHE_BUCKET_S, description="Time bucket for queries with relative time windows (NOW(), INTERVAL, ...)"
+    )
+    sql_cache_max_entries: int = Field(settings.SQL_CACHE_MAX_ENTRIES, description="LRU bound of the SQL result cache")
+    sql_cache_max_bytes: int = Field(settings.SQL_CACHE_MAX_BYTES, description="Size bound of the SQL result cache")
@@ -24,4 +24,79 @@ TOP_K_RESULTS = 5
 
 # File Paths
 METADATA_FILE = "data/metadataloc.json"
-TTL_FILES_PATH = Path("data/ttl_files")  
\ No newline at end of file
+TTL_FILES_PATH = Path("data/ttl_files")
+SNAPSHOT_FILES_PATH = Path("data/snapshots")
+SCHEMA_CACHE_PATH = Path("data/schema_cache")
+
+# RDF graph cache
+GRAPH_CACHE_MAX_ENTRIES = 32
+GRAPH_CACHE_MAX_TRIPLES = 1_000_000
+
+# RDF query backend: "index" (precomputed entity index), "sparql" or "verify" (both, compared)
+RDF_QUERY_MODE = "index"
+
+# rdf_toolkit result memo (keyed by arguments + TTL content digest)
+RDF_RESULT_CACHE_MAX_ENTRIES = 1024
+RDF_RESULT_CACHE_MAX_BYTES = 16 * 1024 * 1024
+
+# sql_db_query result cache. Queries with relative time windows (NOW(), INTERVAL, ...)
+# are also keyed by a time bucket of SQL_CACHE_BUCKET_S seconds.
+SQL_CACHE_TTL_S = 900
+SQL_CACHE_BUCKET_S = 300
+SQL_CACHE_MAX_ENTRIES = 512
+SQL_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+# Local SQL validator (check_query): upper bound for explicit LIMITs; queries without
+# a LIMIT get TOP_K_RESULTS
+SQL_MAX_ROWS = 1000
+
+# Streaming sql_db_query execution (server-side cursor): stop after this many rows or
+# bytes of row text; the summary shows the first SQL_STREAM_SAMPLE_ROWS rows
+SQL_STREAM_MAX_ROWS = 100_000
+SQL_STREAM_MAX_BYTES = 16 * 1024 * 1024
+SQL_STREAM_SAMPLE_ROWS = 20
+SQL_STREAM_FETCH_SIZE = 1000
+
+# Cached SQL schema introspection (table names, DDL and sample rows); None = until refresh()
+SQL_SCHEMA_TTL_S = 3600
+
+# sensor_stats tool: timeseries table and its columns (uuid, time, value), and result bounds
+SENSOR_TABLE = "sensor_data"
+SENSOR_COLUMNS = {"uuid": "uuid", "time": "timestamp", "value": "value"}
+SENSOR_STATS_MAX_UUIDS = 200
+SENSOR_STATS_MAX_ROWS = 500
+SENSOR_STATS_DECIMALS = 3
+
+# Thread pool size for rdf_toolkit portfolio mode (one operation over many buildings)
+PORTFOLIO_MAX_WORKERS = 8
+
+# BrickExploration schema summary budget (compact JSON bytes, ~4 bytes per token)
+SCHEMA_SUMMARY_MAX_BYTES = 8000
+SCHEMA_EXAMPLES_PER_PREDICATE = 2
+
+# LLM response cache (SQLite, exact match). Per-node policy: enabled flag and TTL in seconds
+# (None = no expiry); nodes not listed use "default".
+LLM_CACHE_PATH = Path("data/llm_cache.sqlite")
+LLM_CACHE_MAX_ENTRIES = 10_000
+LLM_CACHE_POLICY = {
+    "default": {"enabled": True, "ttl_s": 24 * 3600},
+    "evaluate_user_query": {"enabled": True, "ttl_s": 7 * 24 * 3600},
+    "evaluate_and_route": {"enabled": True, "ttl_s": 7 * 24 * 3600},
+    "tables_or_rdf": {"enabled": True, "ttl_s": 7 * 24 * 3600},
+    "call_get_schema": {"enabled": True, "ttl_s": 24 * 3600},
+    "generate_query": {"enabled": True, "ttl_s": 3600},
+    "check_query": {"enabled": True, "ttl_s": 24 * 3600},
+    "tables_or_end": {"enabled": True, "ttl_s": 3600},
+}
+
+# Context budget: maximum approximate input tokens of the conversation per node (system
+# prompt excluded); above it, older tool outputs are compacted. None = no budget.
+CONTEXT_BUDGET_TOKENS = {
+    "default": 6000,
+    "evaluate_user_query": 4000,
+    "evaluate_and_route": 4000,
+    "tables_or_rdf": 4000,
+    "call_get_schema": 4000,
+    "generate_query": 8000,
+    "tables_or_end": 8000,
+}
@@ -0,0 +1,229 @@
+"""
+Local evaluation runner over evals/dataset_ttl.Examples.
+
+The graph is built once and the examples run concurrently on a thread pool (each on its own
+thread_id). Per example it records latency, LLM calls and token usage (through a callback
+handler), the response and, optionally, the grade. Results go to a local JSON or CSV file;
+no LangSmith access is needed.
+
+    python -m brick_assistant.evals.runner --variant single_call --max-concurrency 8 --output eval.json
+    python -m brick_assistant.evals.runner --offline --output eval.csv   # scripted model, no API keys
+
+`--offline` replaces the LLM with helpers/scripted_llm.py (lexicon-driven rdf_toolkit calls,
+or recorded answers with `--answers`) and skips grading, so the run works in CI sandboxes.
+"""
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import argparse
+import csv
+import json
+import os
+import statistics
+import threading
+import time
+import uuid
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from brick_assistant.config.configs import AgentConfig
+from brick_assistant.evals.dataset_ttl import Examples
+from brick_assistant.graphs.wuerth_single_call_graph_rdf import WuerthSingleCallGraphRDF
+from brick_assistant.graphs.wuerth_vanilla_graph_dev_rdf import WuerthVanillaGraphRDF
+from brick_assistant.helpers.scripted_llm import ScriptedChatModel, load_answers, offline_responder, scripted_answers
+
+GRAPH_VARIANTS = {
+    "vanilla": WuerthVanillaGraphRDF,
+    "single_call": WuerthSingleCallGraphRDF,
+}
+
+Grader = Callable[[Dict[str, Any], Dict[str, Any], Dict[str, Any]], bool]
+
+CSV_FIELDS = [
+    "index", "question", "reference", "response", "correct", "error",
+    "latency_s", "llm_calls", "input_tokens", "output_tokens", "total_tokens",
+]
+
+
+class UsageCallback(BaseCallbackHandler):
+    """Counts the LLM calls and tokens of one graph run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.llm_calls = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.total_tokens = 0
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        input_tokens = output_tokens = total_tokens = 0
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+                input_tokens += usage.get("input_tokens", 0)
+                output_tokens += usage.get("output_tokens", 0)
+                total_tokens += usage.get("total_tokens", 0)
+        if not total_tokens:
+            # providers that only report usage in llm_output
+            usage = (response.llm_output or {}).get("token_usage") or {}
+            input_tokens = usage.get("prompt_tokens", 0)
+            output_tokens = usage.get("completion_tokens", 0)
+            total_tokens = usage.get("total_tokens", input_tokens + output_tokens)
+        with self._lock:
+            self.llm_calls += 1
+            self.input_tokens += input_tokens
+            self.output_tokens += output_tokens
+            self.total_tokens += total_tokens
+
+    def usage(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "llm_calls": self.llm_calls,
+                "input_tokens": self.input_tokens,
+                "output_tokens": self.output_tokens,
+                "total_tokens": self.total_tokens,
+            }
+
+
+def run_examples(graph, examples: Sequence[Dict[str, Any]], max_concurrency: int = 8,
+                 grader: Optional[Grader] = None) -> List[Dict[str, Any]]:
+    """
+    Run dataset examples through an already built graph.
+
+    Args:
+        graph: A built AbstractWuerthGraphRDF (compiled once, shared by all examples).
+        examples: Records with inputs.question and outputs.response, as in dataset_ttl.Examples.
+        max_concurrency: Examples in flight at once.
+        grader: Optional (inputs, outputs, reference_outputs) -> bool, e.g. grader.final_answer_correct.
+
+    Returns:
+        List[Dict[str, Any]]: One record per example, in dataset order.
+    """
+    compiled = graph._compiled_graph()
+
+    def run_one(index: int) -> Dict[str, Any]:
+        example = examples[index]
+        question = example["inputs"]["question"]
+        reference = example.get("outputs", {}).get("response")
+        usage = UsageCallback()
+        config = graph._thread_config(uuid.uuid4().hex)
+        config["callbacks"] = [usage]
+        response, error, correct = None, None, None
+        start = time.perf_counter()
+        try:
+            state = compiled.invoke(graph._prepare_input({"user_prompt": question}), config)
+            response = state["messages"][-1].content
+        except Exception as e:
+            error = f"{e.__class__.__name__}: {e}"
+        latency = time.perf_counter() - start
+        if grader is not None and error is None:
+            try:
+                correct = bool(grader({"question": question}, {"response": response}, {"response": reference}))
+            except Exception as e:
+                error = f"grader {e.__class__.__name__}: {e}"
+        return {
+            "index": index,
+            "question": question,
+            "reference": reference,
+            "response": response,
+            "correct": correct,
+            "error": error,
+            "latency_s": round(latency, 4),
+            **usage.usage(),
+        }
+
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as pool:
+        return list(pool.map(run_one, range(len(examples))))
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[int(q) - 1]
+
+
+def summarize(records: List[Dict[str, Any]], wall_s: float) -> Dict[str, Any]:
+    """Aggregate latency, LLM usage, errors and accuracy of a run."""
+    latencies = [r["latency_s"] for r in records]
+    graded = [r["correct"] for r in records if r["correct"] is not None]
+    return {
+        "examples": len(records),
+        "errors": sum(1 for r in records if r["error"]),
+        "accuracy": sum(graded) / len(graded) if graded else None,
+        "wall_s": round(wall_s, 3),
+        "latency_mean_s": round(statistics.fmean(latencies), 4) if latencies else 0.0,
+        "latency_p50_s": round(_percentile(latencies, 50), 4),
+        "latency_p95_s": round(_percentile(latencies, 95), 4),
+        "llm_calls": sum(r["llm_calls"] for r in records),
+        "input_tokens": sum(r["input_tokens"] for r in records),
+        "output_tokens": sum(r["output_tokens"] for r in records),
+        "total_tokens": sum(r["total_tokens"] for r in records),
+    }
+
+
+def write_results(path: Path, records: List[Dict[str, Any]], summary: Dict[str, Any], metadata: Dict[str, Any]) -> None:
+    """JSON ({metadata, summary, records}) or, for a .csv path, one row per example."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix.lower() == ".csv":
+        with open(path, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+            writer.writerows(records)
+        return
+    with open(path, "w") as file:
+        json.dump({"metadata": metadata, "summary": summary, "records": records}, file, indent=2, ensure_ascii=False)
+
+
+def build_graph(variant: str, offline: bool = False, answers: Optional[Path] = None, **config: Any):
+    """Build the graph under evaluation once; offline runs use a ScriptedChatModel."""
+    metadata_file = Path(config.pop("metadata_file", "data/metadataloc.json"))
+    keys = AgentConfig(
+        database_uri=config.pop("database_uri", None) or os.getenv("DATABASE_URI") or "sqlite://",
+        openai_api_key=config.pop("openai_api_key", None) or os.getenv("OPENAI_API_KEY") or "offline",
+        metadata_file=metadata_file,
+        ttl_files_path=Path(config.pop("ttl_files_path", "data/ttl_files")),
+        llm_cache_enabled=False,  # measure the model, not the response cache
+        **config,
+    )
+    llm: Any = "openai"
+    if offline:
+        responder = offline_responder(metadata_file)
+        if answers is not None:
+            responder = scripted_answers(load_answers(answers), fallback=responder)
+        llm = ScriptedChatModel(responder=responder)
+    return GRAPH_VARIANTS[variant](keys=keys, llm=llm)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--variant", choices=sorted(GRAPH_VARIANTS), default="vanilla")
+    parser.add_argument("--max-concurrency", type=int, default=8)
+    parser.add_argument("--offline", action="store_true", help="scripted model instead of the LLM, no grading")
+    parser.add_argument("--answers", type=Path, help="offline: JSON of recorded answers (question -> response)")
+    parser.add_argument("--no-grade", action="store_true", help="skip the LLM grader")
+    parser.add_argument("--limit", type=int, help="only the first N examples")
+    parser.add_argument("--database-uri", help="defaults to $DATABASE_URI")
+    parser.add_argument("--output", type=Path, default=Path("eval_results.json"), help=".json or .csv")
+    args = parser.parse_args(argv)
+
+    examples = Examples[:args.limit] if args.limit else Examples
+    grader = None
+    if not (args.offline or args.no_grade):
+        from brick_assistant.evals.grader import final_answer_correct
+        grader = final_answer_correct
+
+    graph = build_graph(args.variant, offline=args.offline, answers=args.answers, database_uri=args.database_uri)
+    start = time.perf_counter()
+    records = run_examples(graph, examples, max_concurrency=args.max_concurrency, grader=grader)
+    summary = summarize(records, time.perf_counter() - start)
+    metadata = {"variant": args.variant, "offline": args.offline, "max_concurrency": args.max_concurrency}
+    write_results(args.output, records, summary, metadata)
+
+    print(json.dumps(summary, indent=2))
+    print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
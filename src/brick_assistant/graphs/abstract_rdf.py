@@ -1,29 +1,67 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Union, Optional
+from typing import Any, Dict, List, Sequence, Union, Optional
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import time
+import uuid
 
 from langchain.chat_models.base import BaseChatModel
-from langgraph.graph import StateGraph
+from langgraph.graph import StateGraph, START
 from langgraph.checkpoint.base import BaseCheckpointSaver
-from langchain_community.utilities.sql_database import SQLDatabase
 from langchain_community.agent_toolkits import SQLDatabaseToolkit
 from langgraph.prebuilt import ToolNode
+from langchain_core.runnables import Runnable, RunnableLambda
 
 from brick_assistant.helpers.llm_models import _get_llm
+from brick_assistant.helpers.llm_cache import SQLiteLRUCache
+from brick_assistant.helpers.database import LazySQLDatabase, engine_args_for
+from brick_assistant.helpers.context_budget import ContextBudget
 
-from brick_assistant.config.configs import AgentConfig
+from brick_assistant.config.configs import AgentConfig, GraphConfig
 
 from brick_assistant.tools.rdf_query import rdf_toolkit_tool
+from brick_assistant.tools.sql_query import SQLQueryTool, SQLResultCache
+from brick_assistant.tools.sql_schema import CachedListTablesTool, CachedTableInfoTool, SchemaCatalog
+from brick_assistant.tools.sensor_stats import SensorStatsTool
+from brick_assistant.tools.sql_validator import SQLValidator
+from brick_assistant.config import settings
+from brick_assistant.tools.intent import IntentMatcher, intent_matcher_for
 
 class AbstractWuerthGraphRDF(ABC):
+    # Node that validates the question; the intent fast path falls back to it
+    entry_node = "evaluate_user_query"
+
     def __init__(self, keys: AgentConfig, llm: Union[str, BaseChatModel] = "openai", checkpointer: Optional[BaseCheckpointSaver] = None):       
         self.workflow = None
         self.graph = None
+        self._batch_compiled = None
         self.checkpointer = checkpointer
         self.keys = keys
         self.model = _get_llm(llm, llm_api_key = self.keys.openai_api_key)
+        self.llm_cache = None
+        if self.keys.llm_cache_enabled:
+            self.llm_cache = SQLiteLRUCache(
+                self.keys.llm_cache_path,
+                max_entries=self.keys.llm_cache_max_entries,
+                policies=self.keys.llm_cache_policy,
+            )
+            # copy, so a model instance passed in by the caller keeps its own cache setting
+            self.model = self.model.model_copy(update={"cache": self.llm_cache})
+        self.sql_cache = None
+        if self.keys.sql_cache_enabled:
+            self.sql_cache = SQLResultCache(
+                ttl_s=self.keys.sql_cache_ttl_s,
+                bucket_s=self.keys.sql_cache_bucket_s,
+                max_entries=self.keys.sql_cache_max_entries,
+                max_bytes=self.keys.sql_cache_max_bytes,
+            )
+        # local check_query; None = LLM check for every query
+        self.sql_validator = SQLValidator(top_k=settings.TOP_K_RESULTS, max_rows=self.keys.sql_max_rows) if self.keys.sql_validator_enabled else None
+        self.context_budget = ContextBudget(self.keys.context_budget_tokens) if self.keys.context_budget_enabled else None
         self.config = {"configurable": {"thread_id":"1","llm_model":self.model}}
         self.result = None
         self._db_toolkit = None
+        self._schema_catalog = None
         self._db_tool_nodes = None
         self._db_tools_func = None
         self._static_tool_nodes = None
@@ -31,22 +69,69 @@ class AbstractWuerthGraphRDF(ABC):
 
     @property
     def db_toolkit(self):
-        """Lazy load the SQLDatabaseToolkit."""
+        """
+        Lazy load the SQLDatabaseToolkit.
+
+        The database behind it is a LazySQLDatabase: building the tools (and the graph)
+        opens no connection; the pooled engine is created when a SQL tool first runs.
+        """
         if self._db_toolkit is None:
-            #try:
-            db = SQLDatabase.from_uri(self.keys.database_uri)
+            engine_args = engine_args_for(
+                self.keys.database_uri,
+                pool_size=self.keys.db_pool_size,
+                max_overflow=self.keys.db_max_overflow,
+                pool_pre_ping=self.keys.db_pool_pre_ping,
+                pool_recycle_s=self.keys.db_pool_recycle_s,
+                pool_timeout_s=self.keys.db_pool_timeout_s,
+                statement_timeout_ms=self.keys.db_statement_timeout_ms,
+            )
+            db = LazySQLDatabase(self.keys.database_uri, engine_args=engine_args)
             self._db_toolkit = SQLDatabaseToolkit(db=db, llm=self.model)
         return self._db_toolkit
+
+    def db_pool_stats(self) -> Dict[str, Any]:
+        """Connection pool metrics of the SQL tools ('connected' is False until a SQL node ran)."""
+        return self.db_toolkit.db.pool_stats()
     
     @property
     def db_tools(self):
         """
         Get the tools from the SQLDatabaseToolkit.
+
+        `sql_db_query` is replaced by SQLQueryTool, which puts `self.sql_cache` in front of the database
+        (and streams results into a bounded summary with `keys.sql_streaming`),
+        and `sql_db_list_tables` / `sql_db_schema` are served from `self.schema_catalog`.
+        With `keys.sensor_stats_enabled`, the typed `sensor_stats` aggregation tool is added.
         
         Returns:
             List: A list of tools available in the SQLDatabaseToolkit.
         """
-        return self.db_toolkit.get_tools()
+        db = self.db_toolkit.db
+        tools = []
+        for tool in self.db_toolkit.get_tools():
+            if tool.name == "sql_db_query":
+                tool = SQLQueryTool(
+                    db=db, cache=self.sql_cache, description=tool.description,
+                    streaming=self.keys.sql_streaming,
+                    stream_max_rows=self.keys.sql_stream_max_rows,
+                    stream_max_bytes=self.keys.sql_stream_max_bytes,
+                    stream_sample_rows=self.keys.sql_stream_sample_rows,
+                )
+            elif tool.name == "sql_db_list_tables":
+                tool = CachedListTablesTool(db=db, catalog=self.schema_catalog)
+            elif tool.name == "sql_db_schema":
+                tool = CachedTableInfoTool(db=db, catalog=self.schema_catalog, description=tool.description)
+            tools.append(tool)
+        if self.keys.sensor_stats_enabled:
+            tools.append(SensorStatsTool(db=db, table=self.keys.sensor_table, columns=self.keys.sensor_columns))
+        return tools
+
+    @property
+    def schema_catalog(self) -> SchemaCatalog:
+        """Cached table names and table info of the SQL database (reflected on first use)."""
+        if self._schema_catalog is None:
+            self._schema_catalog = SchemaCatalog(self.db_toolkit.db, ttl_s=self.keys.sql_schema_ttl_s)
+        return self._schema_catalog
     
     @property
     def db_tool_nodes(self) -> Dict[str, ToolNode]:
@@ -69,23 +154,70 @@ class AbstractWuerthGraphRDF(ABC):
         return self._static_tool_nodes
     
     @property
-    def node_functions(self) -> Dict[str, callable]:
+    def intent_matcher(self) -> IntentMatcher:
+        """Intent matcher over the buildings of `keys.metadata_file` (shared, with match-rate counters)."""
+        return intent_matcher_for(str(self.keys.metadata_file))
+
+    def llm_cache_stats(self) -> Dict[str, Any]:
+        """LLM response cache metrics (per-node hits, misses, hit_rate), empty when the cache is disabled."""
+        return self.llm_cache.stats() if self.llm_cache is not None else {}
+
+    def sql_cache_stats(self) -> Dict[str, Any]:
+        """SQL result cache metrics (entries, bytes, hits, misses, hit_rate), empty when the cache is disabled."""
+        return self.sql_cache.stats() if self.sql_cache is not None else {}
+
+    def sql_validator_stats(self) -> Dict[str, Any]:
+        """Local check_query metrics (validated, rejected, rewritten, unparsed, hits per rule), empty when disabled."""
+        return self.sql_validator.stats() if self.sql_validator is not None else {}
+
+    def context_budget_stats(self) -> Dict[str, Any]:
+        """Per-node input token metrics (tokens_in, tokens_sent, tokens_trimmed), empty when budgeting is disabled."""
+        return self.context_budget.stats() if self.context_budget is not None else {}
+
+    def _fit(self, state: Dict[str, Any], node: str) -> Dict[str, Any]:
+        """State as seen by the LLM call of `node`: messages compacted to the node's input budget."""
+        if self.context_budget is None:
+            return state
+        return self.context_budget.fit_state(state, node)
+
+    def intent_stats(self) -> Dict[str, Any]:
+        """Fast-path match statistics: attempts, matches, match_rate and matches per operation."""
+        return self.intent_matcher.stats()
+
+    @property
+    def node_functions(self) -> Dict[str, Runnable]:
         """Create and cache node functions with dependencies injected."""
         if self._node_functions is None:
             self._node_functions = self._create_node_functions()
         return self._node_functions
     
-    def _create_node_functions(self) -> Dict[str, callable]:
-        """Create wrapper functions with LLM and ToolNode instances bound."""
+    def _create_node_functions(self) -> Dict[str, Runnable]:
+        """
+        Create wrapper functions with LLM and ToolNode instances bound.
+
+        Each node is a RunnableLambda with a sync and an async implementation, so the same
+        compiled graph serves `invoke`/`stream` and `ainvoke`/`astream` (async LLM calls).
+        """
         
         from brick_assistant.tools.functions import (
             evaluate_user_query,
+            aevaluate_user_query,
+            evaluate_and_route,
+            aevaluate_and_route,
             call_get_schema,
+            acall_get_schema,
             generate_query,
+            agenerate_query,
             check_query,
+            acheck_query,
             tables_or_rdf,
+            atables_or_rdf,
             tables_or_end,
-            enforced_metadata_keys_call
+            atables_or_end,
+            enforced_metadata_keys_call,
+            inject_schema,
+            intent_fast_path,
+            capture_uuid_handles
         )
         
         # Get tool nodes
@@ -95,52 +227,91 @@ class AbstractWuerthGraphRDF(ABC):
         
         # Create wrapper functions with dependencies injected
         def evaluate_user_query_wrapper(state):
-            return evaluate_user_query(state, self.model)
+            return evaluate_user_query(self._fit(state, 'evaluate_user_query'), self.model)
+
+        async def aevaluate_user_query_wrapper(state):
+            return await aevaluate_user_query(self._fit(state, 'evaluate_user_query'), self.model)
+
+        def evaluate_and_route_wrapper(state):
+            return evaluate_and_route(self._fit(state, 'evaluate_and_route'), self.model, db_tools['sql_db_list_tables'], rdf_toolkit_tool)
+
+        async def aevaluate_and_route_wrapper(state):
+            return await aevaluate_and_route(self._fit(state, 'evaluate_and_route'), self.model, db_tools['sql_db_list_tables'], rdf_toolkit_tool)
         
         def call_get_schema_wrapper(state):
-            return call_get_schema(state, self.model, db_tools['sql_db_schema'])
+            return call_get_schema(self._fit(state, 'call_get_schema'), self.model, db_tools['sql_db_schema'])
+
+        async def acall_get_schema_wrapper(state):
+            return await acall_get_schema(self._fit(state, 'call_get_schema'), self.model, db_tools['sql_db_schema'])
         
         def generate_query_wrapper(state):
             return generate_query(
-                state, 
+                self._fit(state, 'generate_query'), 
                 self.model, 
                 db_tools['sql_db_query'], 
-                rdf_toolkit_tool 
+                rdf_toolkit_tool,
+                sensor_stats_tool=db_tools.get('sensor_stats')
             )
+
+        async def agenerate_query_wrapper(state):
+            return await agenerate_query(self._fit(state, 'generate_query'), self.model, db_tools['sql_db_query'], rdf_toolkit_tool,
+                                         sensor_stats_tool=db_tools.get('sensor_stats'))
         
         def check_query_wrapper(state):
-            return check_query(state, self.model, db_tools['sql_db_query'])
+            return check_query(state, self.model, db_tools['sql_db_query'],
+                               validator=self.sql_validator, llm_fallback=self.keys.sql_validator_llm_fallback)
+
+        async def acheck_query_wrapper(state):
+            return await acheck_query(state, self.model, db_tools['sql_db_query'],
+                                      validator=self.sql_validator, llm_fallback=self.keys.sql_validator_llm_fallback)
         
         def tables_or_rdf_wrapper(state):
             return tables_or_rdf(
-                state, 
+                self._fit(state, 'tables_or_rdf'), 
                 self.model, 
                 db_tools['sql_db_list_tables'], 
                 rdf_toolkit_tool
             )
+
+        async def atables_or_rdf_wrapper(state):
+            return await atables_or_rdf(self._fit(state, 'tables_or_rdf'), self.model, db_tools['sql_db_list_tables'], rdf_toolkit_tool)
         
         def tables_or_end_wrapper(state):
             return tables_or_end(
-                state, 
+                self._fit(state, 'tables_or_end'), 
                 self.model, 
                 db_tools['sql_db_list_tables'], 
                 rdf_toolkit_tool 
             )
+
+        async def atables_or_end_wrapper(state):
+            return await atables_or_end(self._fit(state, 'tables_or_end'), self.model, db_tools['sql_db_list_tables'], rdf_toolkit_tool)
         
         def metadata_keys_call_wrapper(state):
             return enforced_metadata_keys_call(
                 state,
-                path = self.keys.metadata_file
+                path = self.keys.metadata_file,
+                filter_relevant = self.keys.metadata_filter
             )        
         
+        def inject_schema_wrapper(state):
+            return inject_schema(state, self.schema_catalog, tables=self.keys.sql_schema_tables)
+
+        def intent_fast_path_wrapper(state):
+            return intent_fast_path(state, self.intent_matcher, fallback=self.entry_node)
+
         return {
-            'evaluate_user_query': evaluate_user_query_wrapper,
-            'call_get_schema': call_get_schema_wrapper,
-            'generate_query': generate_query_wrapper,
-            'check_query': check_query_wrapper,
-            'tables_or_rdf': tables_or_rdf_wrapper,
-            'tables_or_end': tables_or_end_wrapper,
-            'metadata_keys_call': metadata_keys_call_wrapper
+            'evaluate_user_query': RunnableLambda(evaluate_user_query_wrapper, afunc=aevaluate_user_query_wrapper, name='evaluate_user_query'),
+            'evaluate_and_route': RunnableLambda(evaluate_and_route_wrapper, afunc=aevaluate_and_route_wrapper, name='evaluate_and_route'),
+            'call_get_schema': RunnableLambda(call_get_schema_wrapper, afunc=acall_get_schema_wrapper, name='call_get_schema'),
+            'generate_query': RunnableLambda(generate_query_wrapper, afunc=agenerate_query_wrapper, name='generate_query'),
+            'check_query': RunnableLambda(check_query_wrapper, afunc=acheck_query_wrapper, name='check_query'),
+            'tables_or_rdf': RunnableLambda(tables_or_rdf_wrapper, afunc=atables_or_rdf_wrapper, name='tables_or_rdf'),
+            'tables_or_end': RunnableLambda(tables_or_end_wrapper, afunc=atables_or_end_wrapper, name='tables_or_end'),
+            'metadata_keys_call': metadata_keys_call_wrapper,
+            'intent_fast_path': intent_fast_path_wrapper,
+            'inject_schema': inject_schema_wrapper,
+            'capture_uuid_handles': capture_uuid_handles
         }
 
         
@@ -151,6 +322,90 @@ class AbstractWuerthGraphRDF(ABC):
         """
         pass
 
+    def _build_workflow(self, entry_node: str) -> StateGraph:
+        """
+        Wire the workflow shared by the graph variants around `entry_node`, the node that
+        validates the question (and, for some variants, emits the first tool call).
+
+        Args:
+            entry_node (str): Name of the entry node in `node_functions`.
+
+        Returns:
+            StateGraph: The uncompiled workflow.
+        """
+        from brick_assistant.tools.functions import MessagesState
+
+        workflow = StateGraph(MessagesState, config_schema=GraphConfig)
+
+        # Db Nodes loading
+        db_nodes = self.db_tool_nodes
+        static_nodes = self.static_tool_nodes
+
+        # Add all nodes
+        node_funcs = self.node_functions
+
+        # Add nodes - mix of functions and direct tool nodes
+        workflow.add_node(entry_node, node_funcs[entry_node])
+        workflow.add_node("metadata_keys_call", node_funcs['metadata_keys_call'])
+        if self.keys.intent_fast_path:
+            workflow.add_node("intent_fast_path", node_funcs['intent_fast_path'])
+        workflow.add_node("tables_or_rdf", node_funcs['tables_or_rdf'])
+        workflow.add_node("rdf_toolkit", static_nodes['rdf_toolkit'])
+        if self.keys.uuid_handles:
+            workflow.add_node("capture_uuid_handles", node_funcs['capture_uuid_handles'])
+        workflow.add_node("tables_or_end", node_funcs['tables_or_end'])
+        workflow.add_node("list_tables_tool", db_nodes['sql_db_list_tables'])
+        if self.keys.sql_schema_injection:
+            workflow.add_node("inject_schema", node_funcs['inject_schema'])
+        else:
+            workflow.add_node("call_get_schema", node_funcs['call_get_schema'])
+            workflow.add_node("get_schema", db_nodes['sql_db_schema'])
+        workflow.add_node("generate_query", node_funcs['generate_query'])
+        workflow.add_node("check_query", node_funcs['check_query'])
+        workflow.add_node("run_query", db_nodes['sql_db_query'])
+        if self.keys.sensor_stats_enabled:
+            workflow.add_node("sensor_stats", db_nodes['sensor_stats'])
+
+        # Add ONLY the edges that are NOT handled by Commands
+        # Start with the entry point - these are fixed sequential flows
+        workflow.add_edge(START, "metadata_keys_call")
+        if self.keys.intent_fast_path:
+            # intent_fast_path -> rdf_toolkit or the entry node (handled by Command)
+            workflow.add_edge("metadata_keys_call", "intent_fast_path")
+        else:
+            workflow.add_edge("metadata_keys_call", entry_node)
+
+        # After rdf_toolkit, always go to tables_or_end (fixed flow)
+        if self.keys.uuid_handles:
+            # UUID sets of the result are stored under handles before the next LLM call
+            workflow.add_edge("rdf_toolkit", "capture_uuid_handles")
+            workflow.add_edge("capture_uuid_handles", "tables_or_end")
+        else:
+            workflow.add_edge("rdf_toolkit", "tables_or_end")
+
+        # After list_tables_tool, always proceed through schema retrieval (fixed flow)
+        if self.keys.sql_schema_injection:
+            # cached schema injected directly: no call_get_schema LLM hop, no reflection round trip
+            workflow.add_edge("list_tables_tool", "inject_schema")
+            workflow.add_edge("inject_schema", "generate_query")
+        else:
+            workflow.add_edge("list_tables_tool", "call_get_schema")
+            workflow.add_edge("call_get_schema", "get_schema")
+            workflow.add_edge("get_schema", "generate_query")
+
+        # After running the query, always go back to generate_query (fixed flow)
+        workflow.add_edge("run_query", "generate_query")
+        if self.keys.sensor_stats_enabled:
+            workflow.add_edge("sensor_stats", "generate_query")
+
+        # EDGES HANDLED BY COMMANDS:
+        # - evaluate_user_query -> tables_or_rdf or END
+        # - evaluate_and_route -> rdf_toolkit, list_tables_tool, tables_or_rdf or END
+        # - tables_or_rdf / tables_or_end -> list_tables_tool, rdf_toolkit or END
+        # - generate_query -> check_query, rdf_toolkit, sensor_stats or END
+        # - check_query -> run_query, or generate_query when the validator rejects the query
+        return workflow
+
     def compile_graph(self):
         """
         Compile the graph using the workflow and configuration.
@@ -174,6 +429,101 @@ class AbstractWuerthGraphRDF(ABC):
             raise ValueError("Graph has not been compiled yet. Call compile_graph() first.")
         return self.graph
             
+    def _batch_graph(self) -> StateGraph:
+        """
+        Compiled graph for batch items: compiled without the checkpointer, since every item is a
+        one-shot conversation on its own thread and its checkpoints would never be read again.
+        """
+        if self.checkpointer is None:
+            return self._compiled_graph()
+        if self._batch_compiled is None:
+            self._compiled_graph()  # raises if the graph was never compiled
+            self._batch_compiled = self.workflow.compile()
+        return self._batch_compiled
+
+    def _prepare_input(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        if "user_prompt" not in input_data:
+            raise ValueError("Input data must contain a 'user_prompt' key.")
+        
+        # Ensure we have messages in the input
+        if "messages" not in input_data:
+            input_data["messages"] = [{"role": "user", "content": input_data["user_prompt"]}]
+        return input_data
+
+    def _thread_config(self, thread_id: str) -> Dict[str, Any]:
+        """Copy of `self.config` bound to its own conversation thread."""
+        return {**self.config, "configurable": {**self.config["configurable"], "thread_id": thread_id}}
+
+    def _batch_items(self, questions: Sequence[Union[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        return [
+            {"user_prompt": q} if isinstance(q, str) else dict(q)
+            for q in questions
+        ]
+
+    @staticmethod
+    def _batch_record(index: int, item: Dict[str, Any], thread_id: str, start: float,
+                      state: Optional[Dict[str, Any]] = None, error: Optional[BaseException] = None) -> Dict[str, Any]:
+        response = None
+        if state and state.get("messages"):
+            response = getattr(state["messages"][-1], "content", None)
+        return {
+            "index": index,
+            "question": item.get("user_prompt"),
+            "thread_id": thread_id,
+            "response": response,
+            "state": state,
+            "error": f"{error.__class__.__name__}: {error}" if error is not None else None,
+            "elapsed_s": time.perf_counter() - start,
+        }
+
+    def run_batch(self, questions: Sequence[Union[str, Dict[str, Any]]], max_concurrency: int = 8) -> List[Dict[str, Any]]:
+        """
+        Run many questions through the compiled graph on a thread pool.
+
+        Every item gets its own thread_id and runs without the checkpointer (see `_batch_graph`),
+        so items never share state and a large batch leaves no checkpoints behind.
+        
+        Args:
+            questions: Question strings, or input dicts with a 'user_prompt' key.
+            max_concurrency (int): Maximum number of items in flight.
+        
+        Returns:
+            List[Dict[str, Any]]: One record per question, in input order, with the final state,
+            the last message content as 'response', 'error' (or None) and 'elapsed_s'.
+        """
+        graph = self._batch_graph()
+        items = self._batch_items(questions)
+
+        def run_item(index: int) -> Dict[str, Any]:
+            thread_id = uuid.uuid4().hex
+            start = time.perf_counter()
+            try:
+                state = graph.invoke(self._prepare_input(items[index]), self._thread_config(thread_id))
+                return self._batch_record(index, items[index], thread_id, start, state=state)
+            except Exception as e:
+                return self._batch_record(index, items[index], thread_id, start, error=e)
+
+        with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as pool:
+            return list(pool.map(run_item, range(len(items))))
+
+    async def arun_batch(self, questions: Sequence[Union[str, Dict[str, Any]]], max_concurrency: int = 8) -> List[Dict[str, Any]]:
+        """Async counterpart of `run_batch`: items run concurrently on the event loop, bounded by a semaphore."""
+        graph = self._batch_graph()
+        items = self._batch_items(questions)
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def run_item(index: int) -> Dict[str, Any]:
+            async with semaphore:
+                thread_id = uuid.uuid4().hex
+                start = time.perf_counter()
+                try:
+                    state = await graph.ainvoke(self._prepare_input(items[index]), self._thread_config(thread_id))
+                    return self._batch_record(index, items[index], thread_id, start, state=state)
+                except Exception as e:
+                    return self._batch_record(index, items[index], thread_id, start, error=e)
+
+        return list(await asyncio.gather(*(run_item(i) for i in range(len(items)))))
+
     @abstractmethod
     def run(self, input_data: Dict[str, Any], stream: bool = False) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
         """
@@ -181,8 +531,22 @@ class AbstractWuerthGraphRDF(ABC):
         
         Args:
             input_data (Dict[str, Any]): The input data for the graph.
+            stream (bool): If True, collect the node updates of the run (see `stream` to consume them as they happen).
         
         Returns:
             Union[Dict[str, Any], List[Dict[str, Any]]]: The output data and the history of states.
         """
+        pass
+
+    @abstractmethod
+    async def arun(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Async counterpart of `run`: nodes use async LLM calls, so one event loop can serve many conversations.
+        
+        Args:
+            input_data (Dict[str, Any]): The input data for the graph.
+        
+        Returns:
+            Dict[str, Any]: The final state.
+        """
         pass
\ No newline at end of file
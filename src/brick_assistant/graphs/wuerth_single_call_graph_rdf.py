@@ -0,0 +1,12 @@
+from brick_assistant.graphs.wuerth_vanilla_graph_dev_rdf import WuerthVanillaGraphRDF
+
+class WuerthSingleCallGraphRDF(WuerthVanillaGraphRDF):
+    """
+    Variant of WuerthVanillaGraphRDF with a single LLM call at the entry.
+
+    `evaluate_and_route` validates the question and emits the first tool call (or the final
+    answer) in one structured response, replacing the evaluate_user_query -> tables_or_rdf
+    round trips. tables_or_rdf is kept only as a fallback when the route lacks tool arguments.
+    """
+    entry_node = "evaluate_and_route"
+
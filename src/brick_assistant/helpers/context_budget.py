@@ -0,0 +1,125 @@
+"""
+Per-node input budget for the conversation sent to the LLM.
+
+MessagesState keeps every tool output verbatim, so a large sensor list or SQL result is
+re-sent on every later hop. `ContextBudget.fit` returns the message list a node should send:
+when it exceeds the node's token budget, tool outputs are compacted, oldest first, in two
+levels:
+
+1. compact:  JSON re-encoded without whitespace and with the long RDF namespace prefixes removed
+2. digest:   only the UUIDs and numbers of the output, plus a short head of the text
+
+Messages are never dropped (tool calls and tool results must stay paired), the outputs of
+the latest tool round (every tool message after the last AI message) are what the node is
+reacting to and are always sent verbatim, and the graph state itself is left untouched.
+"""
+from __future__ import annotations
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+import json
+import re
+import threading
+
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
+from langchain_core.messages.utils import count_tokens_approximately
+
+from brick_assistant.helpers.llm_cache import DEFAULT_NODE
+
+UUID_RE = re.compile(r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b")
+_NUMBER_RE = re.compile(r"(?<![\w.-])[-+]?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?(?![\w.])")
+_NAMESPACE_PREFIXES = ("https://brickschema.org/schema/Brick#", "urn:Building#")
+_DIGEST_HEAD_CHARS = 200
+
+
+def _tokens(messages: Sequence[BaseMessage]) -> int:
+    return count_tokens_approximately(list(messages))
+
+
+def compact_text(text: str) -> str:
+    """Lossless-for-the-LLM rewrite: compact JSON and no RDF namespace prefixes."""
+    try:
+        text = json.dumps(json.loads(text), ensure_ascii=False, separators=(",", ":"))
+    except (TypeError, ValueError):
+        text = re.sub(r"\s+", " ", text).strip()
+    for prefix in _NAMESPACE_PREFIXES:
+        text = text.replace(prefix, "")
+    return text
+
+
+def digest_text(text: str) -> str:
+    """Lossy summary keeping every UUID and number of the output."""
+    uuids = list(dict.fromkeys(UUID_RE.findall(text)))
+    without_uuids = UUID_RE.sub(" ", text)
+    numbers = list(dict.fromkeys(_NUMBER_RE.findall(without_uuids)))
+    head = compact_text(text)[:_DIGEST_HEAD_CHARS]
+    return compact_text(json.dumps({
+        "compacted_tool_output": True,
+        "compacted_from_chars": len(text),
+        "head": head,
+        "uuids": uuids,
+        "numbers": numbers,
+    }))
+
+
+class ContextBudget:
+    """
+    Args:
+        budgets: node name -> maximum approximate input tokens of the conversation
+            (system prompts excluded); None disables the budget for that node.
+            Nodes not listed use `budgets["default"]`.
+    """
+
+    def __init__(self, budgets: Mapping[str, Optional[int]]):
+        self.budgets = dict(budgets)
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Dict[str, int]] = {}
+
+    def budget_for(self, node: str) -> Optional[int]:
+        return self.budgets.get(node, self.budgets.get(DEFAULT_NODE))
+
+    def fit(self, messages: Sequence[BaseMessage], node: str) -> List[BaseMessage]:
+        """Return `messages` compacted to the budget of `node` (as far as compaction allows)."""
+        messages = list(messages)
+        budget = self.budget_for(node)
+        before = _tokens(messages)
+        after = before
+        if budget is not None and before > budget:
+            # oldest tool outputs first; the latest round is what the node is reacting to
+            latest_round = max((i for i, m in enumerate(messages) if isinstance(m, AIMessage)), default=0)
+            tool_positions = [i for i, m in enumerate(messages[:latest_round]) if isinstance(m, ToolMessage)]
+            for rewrite in (compact_text, digest_text):
+                for i in tool_positions:
+                    if after <= budget:
+                        break
+                    content = messages[i].content
+                    if not isinstance(content, str):
+                        continue
+                    new_content = rewrite(content)
+                    if len(new_content) < len(content):
+                        messages[i] = messages[i].model_copy(update={"content": new_content})
+                        after = _tokens(messages)
+        self._record(node, before, after, budget)
+        return messages
+
+    def fit_state(self, state: Mapping[str, Any], node: str) -> Dict[str, Any]:
+        """Copy of a graph state whose messages are fitted to the budget of `node`."""
+        return {**state, "messages": self.fit(state["messages"], node)}
+
+    def _record(self, node: str, before: int, after: int, budget: Optional[int]) -> None:
+        with self._lock:
+            m = self._metrics.setdefault(
+                node, {"calls": 0, "compacted_calls": 0, "tokens_in": 0, "tokens_sent": 0, "tokens_trimmed": 0, "over_budget": 0}
+            )
+            m["calls"] += 1
+            m["tokens_in"] += before
+            m["tokens_sent"] += after
+            m["tokens_trimmed"] += before - after
+            if after < before:
+                m["compacted_calls"] += 1
+            if budget is not None and after > budget:
+                m["over_budget"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-node token metrics and the total number of tokens trimmed."""
+        with self._lock:
+            nodes = {node: dict(m) for node, m in self._metrics.items()}
+        return {"tokens_trimmed": sum(m["tokens_trimmed"] for m in nodes.values()), "nodes": nodes}
@@ -0,0 +1,118 @@
+"""
+Lazily connected, pooled SQLDatabase for the SQL tools of the graph.
+
+`SQLDatabase.from_uri` creates the engine and reflects the schema immediately, which
+forces a database round trip when the graph is built, even for RDF-only traffic.
+`LazySQLDatabase` is a drop-in SQLDatabase whose engine is created (and the schema
+reflected) the first time a SQL tool actually uses it.
+"""
+from __future__ import annotations
+from typing import Any, Dict, Optional
+import threading
+
+from langchain_community.utilities.sql_database import SQLDatabase
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+
+
+def engine_args_for(database_uri: str, pool_size: int = 5, max_overflow: int = 10, pool_pre_ping: bool = True,
+                    pool_recycle_s: int = 1800, pool_timeout_s: float = 30.0,
+                    statement_timeout_ms: Optional[int] = None) -> Dict[str, Any]:
+    """
+    create_engine() keyword arguments for a pooled engine.
+
+    Pool sizing does not apply to SQLite (single-file / in-memory pools), and the
+    statement timeout is only set on PostgreSQL, as a connection option.
+    """
+    url = make_url(database_uri)
+    backend = url.get_backend_name()
+    if backend == "sqlite":
+        return {"pool_pre_ping": pool_pre_ping}
+    args: Dict[str, Any] = {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_pre_ping": pool_pre_ping,
+        "pool_recycle": pool_recycle_s,
+        "pool_timeout": pool_timeout_s,
+    }
+    if statement_timeout_ms and backend == "postgresql":
+        args["connect_args"] = {"options": f"-c statement_timeout={int(statement_timeout_ms)}"}
+    return args
+
+
+class LazySQLDatabase(SQLDatabase):
+    """
+    SQLDatabase that connects on first use.
+
+    The dialect is derived from the URI, so building the toolkit (and its query checker
+    prompt) never opens a connection. Any other attribute access materializes the
+    underlying SQLDatabase; a failed attempt (database down) is retried on the next use.
+    """
+
+    def __init__(self, database_uri: str, engine_args: Optional[Dict[str, Any]] = None, **kwargs: Any):
+        # deliberately not calling SQLDatabase.__init__: it reflects the schema
+        self._lazy_uri = database_uri
+        self._lazy_engine_args = dict(engine_args or {})
+        self._lazy_kwargs = kwargs
+        self._lazy_lock = threading.Lock()
+        self._lazy_ready = False
+        self._pool_events = {"connects": 0, "checkouts": 0, "checkins": 0, "invalidations": 0}
+
+    @property
+    def dialect(self) -> str:
+        return make_url(self._lazy_uri).get_backend_name()
+
+    @property
+    def database_key(self) -> str:
+        """Identity of the database (URI without password) that needs no connection."""
+        return make_url(self._lazy_uri).render_as_string(hide_password=True)
+
+    @property
+    def connected(self) -> bool:
+        return self._lazy_ready
+
+    def _materialize(self) -> None:
+        with self._lazy_lock:
+            if self._lazy_ready:
+                return
+            engine = create_engine(self._lazy_uri, **self._lazy_engine_args)
+            self._watch_pool(engine)
+            try:
+                SQLDatabase.__init__(self, engine, **self._lazy_kwargs)
+            except Exception:
+                engine.dispose()
+                raise
+            self._lazy_ready = True
+
+    def __getattr__(self, name: str) -> Any:
+        # only reached for attributes SQLDatabase.__init__ would have set (e.g. _engine)
+        if name.startswith(("__", "_lazy")) or name == "_pool_events" or self._lazy_ready:
+            raise AttributeError(name)
+        self._materialize()
+        return object.__getattribute__(self, name)
+
+    # ---------- pool metrics ----------
+    def _watch_pool(self, engine) -> None:
+        events = self._pool_events
+
+        def bump(key):
+            def listener(*_args):
+                events[key] += 1
+            return listener
+
+        event.listen(engine, "connect", bump("connects"))
+        event.listen(engine, "checkout", bump("checkouts"))
+        event.listen(engine, "checkin", bump("checkins"))
+        event.listen(engine, "invalidate", bump("invalidations"))
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Pool counters; 'connected' is False until a SQL tool has used the database."""
+        stats: Dict[str, Any] = {"connected": self._lazy_ready, "dialect": self.dialect, **self._pool_events}
+        if self._lazy_ready:
+            pool = self._engine.pool
+            stats["pool"] = pool.__class__.__name__
+            for name in ("size", "checkedout", "overflow", "checkedin"):
+                method = getattr(pool, name, None)
+                if callable(method):
+                    stats[name] = method()
+        return stats
@@ -0,0 +1,228 @@
+"""
+Persistent exact-match cache of LLM responses, plugged into a chat model's `cache` field.
+
+Entries live in a local SQLite file and are keyed by the sha256 of langchain's
+(prompt, llm_string) pair: the prompt is the serialized message list (system prompt
+included) and the llm_string holds the model parameters plus the bound tools, so a hit
+means the provider would have received exactly the same request.
+
+The graph node issuing a call is tracked with `node_scope`, which selects the per-node
+policy (enabled / TTL) and the bucket of the hit-rate metrics.
+"""
+from __future__ import annotations
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, Mapping, Optional, Union
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+
+from brick_assistant.config import settings
+
+_current_node: ContextVar[Optional[str]] = ContextVar("llm_cache_node", default=None)
+
+# Bucket used for calls made outside any node_scope
+DEFAULT_NODE = "default"
+
+
+@contextmanager
+def node_scope(node: str) -> Iterator[None]:
+    """Attribute the LLM calls made inside the block to graph node `node`."""
+    token = _current_node.set(node)
+    try:
+        yield
+    finally:
+        _current_node.reset(token)
+
+
+def current_node() -> str:
+    return _current_node.get() or DEFAULT_NODE
+
+
+# Per-run values of serialized messages that do not change what the provider answers
+_VOLATILE_FIELDS = ("id", "response_metadata", "usage_metadata")
+
+
+def canonical_prompt(prompt: str) -> str:
+    """
+    Strip run-specific values from a serialized message list.
+
+    Message ids are regenerated on every run and tool-call ids are random, so they are
+    dropped or renumbered in order of appearance; otherwise no repeated question would hit.
+    """
+    try:
+        messages = json.loads(prompt)
+    except ValueError:
+        return prompt
+    call_ids: Dict[str, str] = {}
+
+    def canonical_id(value: Any) -> Any:
+        if not isinstance(value, str):
+            return value
+        return call_ids.setdefault(value, f"call_{len(call_ids)}")
+
+    def walk(node: Any) -> Any:
+        if isinstance(node, list):
+            return [walk(v) for v in node]
+        if not isinstance(node, dict):
+            return node
+        kwargs = node.get("kwargs")
+        if node.get("type") == "constructor" and isinstance(kwargs, dict):
+            kwargs = {k: v for k, v in kwargs.items() if k not in _VOLATILE_FIELDS}
+            if "tool_call_id" in kwargs:
+                kwargs["tool_call_id"] = canonical_id(kwargs["tool_call_id"])
+            for call in kwargs.get("tool_calls") or ():
+                call["id"] = canonical_id(call.get("id"))
+            for call in (kwargs.get("additional_kwargs") or {}).get("tool_calls") or ():
+                call["id"] = canonical_id(call.get("id"))
+            return {**node, "kwargs": walk(kwargs)}
+        return {k: walk(v) for k, v in node.items()}
+
+    return json.dumps(walk(messages), sort_keys=True)
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    enabled: bool = True
+    ttl_s: Optional[float] = None  # None = never expires (still subject to LRU eviction)
+
+    @classmethod
+    def coerce(cls, value: Union["CachePolicy", Mapping[str, Any], bool]) -> "CachePolicy":
+        if isinstance(value, CachePolicy):
+            return value
+        if isinstance(value, bool):
+            return cls(enabled=value)
+        return cls(**value)
+
+
+class SQLiteLRUCache(BaseCache):
+    """
+    Size-bounded, disk-backed LRU response cache with per-node policies.
+
+    Args:
+        path: SQLite database file (created on first use); defaults to settings.LLM_CACHE_PATH.
+        max_entries: Least recently used entries are evicted beyond this count.
+        policies: node name -> CachePolicy (or a dict of its fields, or a bool); nodes
+            without an entry use `policies["default"]`, or an enabled, non-expiring policy.
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_entries: int = settings.LLM_CACHE_MAX_ENTRIES,
+                 policies: Optional[Mapping[str, Union[CachePolicy, Mapping[str, Any], bool]]] = None):
+        self.path = Path(path or settings.LLM_CACHE_PATH)
+        self.max_entries = max_entries
+        self.policies: Dict[str, CachePolicy] = {
+            node: CachePolicy.coerce(policy) for node, policy in (policies or {}).items()
+        }
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Dict[str, int]] = {}
+        self.evictions = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            " key TEXT PRIMARY KEY, node TEXT NOT NULL, value TEXT NOT NULL,"
+            " created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed)")
+
+    # ---------- policy & metrics ----------
+    def policy_for(self, node: str) -> CachePolicy:
+        return self.policies.get(node) or self.policies.get(DEFAULT_NODE) or CachePolicy()
+
+    def _count(self, node: str, event: str) -> None:
+        with self._lock:
+            counters = self._metrics.setdefault(node, {"hits": 0, "misses": 0, "expired": 0, "bypassed": 0})
+            counters[event] += 1
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\x00{canonical_prompt(prompt)}".encode("utf-8")).hexdigest()
+
+    # ---------- BaseCache ----------
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        node = current_node()
+        policy = self.policy_for(node)
+        if not policy.enabled:
+            self._count(node, "bypassed")
+            return None
+
+        key = self._key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, created FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is not None and policy.ttl_s is not None and now - row[1] > policy.ttl_s:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                row, expired = None, True
+            else:
+                expired = False
+            if row is not None:
+                self._conn.execute("UPDATE llm_cache SET accessed = ? WHERE key = ?", (now, key))
+
+        if row is None:
+            self._count(node, "expired" if expired else "misses")
+            return None
+        try:
+            value = loads(row[0])
+        except Exception:
+            # unreadable entry (e.g. written by an incompatible langchain version): treat as a miss
+            self._count(node, "misses")
+            return None
+        self._count(node, "hits")
+        return value
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        node = current_node()
+        if not self.policy_for(node).enabled:
+            return
+        value = dumps(return_val)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, node, value, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (self._key(prompt, llm_string), node, value, now, now),
+            )
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM llm_cache WHERE key IN (SELECT key FROM llm_cache ORDER BY accessed LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+                self.evictions += count - self.max_entries
+
+    def clear(self, **kwargs: Any) -> None:
+        """Drop every entry, or only those of one node with `clear(node="generate_query")`."""
+        node = kwargs.get("node")
+        with self._lock:
+            if node is None:
+                self._conn.execute("DELETE FROM llm_cache")
+            else:
+                self._conn.execute("DELETE FROM llm_cache WHERE node = ?", (node,))
+
+    # ---------- metrics ----------
+    def stats(self) -> Dict[str, Any]:
+        """Per-node hits/misses/expired/bypassed with hit_rate, plus entry and eviction totals."""
+        with self._lock:
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+            nodes = {}
+            for node, counters in self._metrics.items():
+                lookups = counters["hits"] + counters["misses"] + counters["expired"]
+                nodes[node] = {**counters, "hit_rate": counters["hits"] / lookups if lookups else 0.0}
+            evictions = self.evictions
+        hits = sum(n["hits"] for n in nodes.values())
+        lookups = sum(n["hits"] + n["misses"] + n["expired"] for n in nodes.values())
+        return {
+            "entries": entries,
+            "evictions": evictions,
+            "hits": hits,
+            "lookups": lookups,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "nodes": nodes,
+        }
@@ -0,0 +1,142 @@
+"""
+Scripted chat model for offline runs (evaluation in CI sandboxes, graph smoke tests).
+
+`ScriptedChatModel` answers every call with `responder(messages, tool_names)`, an AIMessage
+(plain answer or tool call), and reports approximate token usage so the usage accounting
+of the eval runner works without a provider. `offline_responder` drives the graphs through
+their real tools: questions recognized by the intent lexicon get the matching rdf_toolkit
+call, everything else is answered as "no offline answer".
+"""
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import asyncio
+import json
+import time
+import uuid
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from brick_assistant.tools.intent import IntentMatcher
+
+Responder = Callable[[Sequence[BaseMessage], List[str]], AIMessage]
+
+NO_OFFLINE_ANSWER = "No offline answer for this question."
+
+
+def tool_call(name: str, args: Dict[str, Any]) -> AIMessage:
+    """AIMessage with a single call of tool `name`."""
+    return AIMessage(content="", tool_calls=[{"name": name, "args": args, "id": f"call_{uuid.uuid4().hex}"}])
+
+
+class ScriptedChatModel(BaseChatModel):
+    """
+    Chat model whose replies come from a Python function instead of a provider.
+
+    Args:
+        responder: (messages, names of the bound tools) -> AIMessage.
+        latency_s: Simulated latency per call.
+    """
+
+    responder: Responder
+    latency_s: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools: Sequence[Any], tool_choice: Optional[Any] = None, **kwargs: Any):
+        return self.bind(tools=[convert_to_openai_tool(t) for t in tools], **kwargs)
+
+    def _reply(self, messages: List[BaseMessage], tools: Optional[List[Dict[str, Any]]]) -> ChatResult:
+        names = [t["function"]["name"] for t in tools or []]
+        message = self.responder(messages, names)
+        input_tokens = count_tokens_approximately(messages)
+        output_tokens = count_tokens_approximately([message])
+        message = message.model_copy(update={"usage_metadata": {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        }})
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None,
+                  tools: Optional[List[Dict[str, Any]]] = None, **kwargs: Any) -> ChatResult:
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        return self._reply(messages, tools)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None,
+                         tools: Optional[List[Dict[str, Any]]] = None, **kwargs: Any) -> ChatResult:
+        if self.latency_s:
+            await asyncio.sleep(self.latency_s)
+        return self._reply(messages, tools)
+
+
+def _question(messages: Sequence[BaseMessage]) -> str:
+    for message in messages:
+        if isinstance(message, HumanMessage):
+            return str(message.content)
+    return ""
+
+
+def offline_responder(metadata_file: Path) -> Responder:
+    """
+    Responder that routes lexicon-recognized questions to rdf_toolkit and answers with its output.
+
+    Structured outputs (QueryEvaluation / RouteDecision) always accept the question; routing
+    nodes call rdf_toolkit when the intent matcher recognizes the question; any node seeing a
+    tool result answers with it.
+    """
+    matcher = IntentMatcher.from_metadata(Path(metadata_file))
+
+    def respond(messages: Sequence[BaseMessage], tools: List[str]) -> AIMessage:
+        question = _question(messages)
+        match = matcher.match(question)
+        if "QueryEvaluation" in tools:
+            return tool_call("QueryEvaluation", {"is_valid": True, "clarified_query": question, "explanation": "offline"})
+        if "RouteDecision" in tools:
+            decision = {"is_valid": True, "clarified_query": question, "explanation": "offline"}
+            if match is not None:
+                return tool_call("RouteDecision", {**decision, "route": "rdf_toolkit", "rdf_call": match.args})
+            return tool_call("RouteDecision", {**decision, "route": "end", "answer": NO_OFFLINE_ANSWER})
+        last = messages[-1] if messages else None
+        if isinstance(last, ToolMessage):
+            return AIMessage(content=f"Offline answer from {last.name}: {last.content}")
+        if "rdf_toolkit" in tools and match is not None:
+            return tool_call("rdf_toolkit", match.args)
+        return AIMessage(content=NO_OFFLINE_ANSWER)
+
+    return respond
+
+
+def scripted_answers(answers: Dict[str, str], fallback: Optional[Responder] = None) -> Responder:
+    """Responder answering known questions verbatim (e.g. recorded answers), else `fallback`."""
+
+    def respond(messages: Sequence[BaseMessage], tools: List[str]) -> AIMessage:
+        question = _question(messages)
+        if question in answers:
+            if "QueryEvaluation" in tools:
+                return tool_call("QueryEvaluation", {"is_valid": True, "clarified_query": question, "explanation": "scripted"})
+            if "RouteDecision" in tools:
+                return tool_call("RouteDecision", {"is_valid": True, "clarified_query": question, "explanation": "scripted",
+                                                   "route": "end", "answer": answers[question]})
+            return AIMessage(content=answers[question])
+        if fallback is not None:
+            return fallback(messages, tools)
+        return AIMessage(content=NO_OFFLINE_ANSWER)
+
+    return respond
+
+
+def load_answers(path: Path) -> Dict[str, str]:
+    """question -> answer map from a JSON object, or from a list of {"question", "response"} records."""
+    with open(path, "r") as file:
+        data = json.load(file)
+    if isinstance(data, dict):
+        return {str(k): str(v) for k, v in data.items()}
+    return {str(r["question"]): str(r["response"]) for r in data if r.get("response") is not None}
@@ -0,0 +1,217 @@
+from __future__ import annotations
+from bisect import bisect_left, bisect_right
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import json
+import os
+import threading
+
+from rdflib import Graph
+
+from brick_assistant.config import settings
+from brick_assistant.tools.graph_cache import BuildingGraphCache
+from brick_assistant.tools.rdf_index import BuildingIndex, index_for
+from brick_assistant.tools.snapshot import load_building_graph
+
+# Numeric attributes with a sorted index (top-k / range lookups).
+NUMERIC_FIELDS = (
+    "area_m2",
+    "sensor_count",
+    "temperature_sensor_count",
+    "meter_count",
+    "zone_count",
+    "latitude",
+    "longitude",
+)
+
+
+@dataclass(frozen=True)
+class CatalogRow:
+    building: str
+    location: Optional[str]
+    latitude: Optional[float]
+    longitude: Optional[float]
+    area_m2: Optional[float]
+    area_unit: Optional[str]
+    sensor_count: int
+    temperature_sensor_count: int
+    meter_count: int
+    zone_count: int
+    primary_function: Optional[str]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _distinct_subjects(rows: Iterable[tuple]) -> int:
+    return len({row[0] for row in rows})
+
+
+def build_row(building: str, idx: BuildingIndex, location: Optional[str] = None) -> CatalogRow:
+    """Materialize one catalog row from a building index; `location` (from metadata) wins over the TTL one."""
+    return CatalogRow(
+        building=building,
+        location=location or idx.location,
+        latitude=idx.latitude,
+        longitude=idx.longitude,
+        area_m2=idx.area_value if idx.area_unit == "m2" else None,
+        area_unit=idx.area_unit,
+        sensor_count=_distinct_subjects(idx.rows["generic_sensors"]),
+        temperature_sensor_count=_distinct_subjects(idx.rows["temperature_sensors_uuid"]),
+        meter_count=_distinct_subjects(idx.rows["meters"]),
+        zone_count=_distinct_subjects(idx.rows["zones"]),
+        primary_function=idx.primary_function,
+    )
+
+
+class BuildingCatalog:
+    """
+    Materialized one-row-per-building catalog with sorted numeric indexes.
+
+    Built from the building graphs plus the metadata file, lazily on first use. Every lookup
+    re-checks file mtimes and rebuilds only the rows of buildings whose TTL content changed.
+
+    With `graphs` (rdf_query's shared cache), buildings are parsed once for both the catalog
+    and rdf_toolkit, and rows come from the same entity index the operations use; without it
+    the TTL files are loaded directly (through their snapshots when fresh) from `ttl_dir`.
+    """
+
+    def __init__(self, ttl_dir: Optional[Path] = None, metadata_file: Optional[Path] = None,
+                 graphs: Optional[BuildingGraphCache] = None):
+        self._ttl_dir = ttl_dir
+        self._metadata_file = metadata_file
+        self._graphs = graphs
+        self._lock = threading.Lock()
+        self._version: Optional[Tuple] = None
+        # building -> (mtime_ns, content digest or None, row)
+        self._row_cache: Dict[str, Tuple[int, Optional[str], CatalogRow]] = {}
+        self.rows: Dict[str, CatalogRow] = {}
+        self.errors: Dict[str, str] = {}
+        self._sorted: Dict[str, List[Tuple[float, str]]] = {}
+        self._keys: Dict[str, List[float]] = {}
+
+    @property
+    def ttl_dir(self) -> Path:
+        return Path(self._ttl_dir or settings.TTL_FILES_PATH)
+
+    @property
+    def metadata_file(self) -> Path:
+        return Path(self._metadata_file or settings.METADATA_FILE)
+
+    # ---------- build ----------
+    def _current_version(self) -> Tuple[Tuple[Tuple[str, int], ...], int]:
+        ttl = tuple(
+            (p.stem[len("bui_"):].upper(), os.stat(p).st_mtime_ns)
+            for p in sorted(self.ttl_dir.glob("bui_*.ttl"))
+        )
+        try:
+            meta_mtime = os.stat(self.metadata_file).st_mtime_ns
+        except FileNotFoundError:
+            meta_mtime = 0
+        return ttl, meta_mtime
+
+    def _load_locations(self) -> Dict[str, str]:
+        try:
+            with open(self.metadata_file, "r") as file:
+                metadata = json.load(file)
+        except FileNotFoundError:
+            return {}
+        return {code.upper(): entry.get("location") for code, entry in metadata.items() if isinstance(entry, dict)}
+
+    def _load(self, building: str) -> Tuple[Graph, Optional[str]]:
+        if self._graphs is not None:
+            entry = self._graphs.entry(building)
+            return entry.graph, entry.digest
+        return load_building_graph(self.ttl_dir / f"bui_{building}.ttl"), None
+
+    def refresh(self, force: bool = False) -> "BuildingCatalog":
+        """Bring the catalog up to date with the files on disk."""
+        version = self._current_version()
+        with self._lock:
+            if not force and version == self._version:
+                return self
+            locations = self._load_locations()
+            ttl_versions, _ = version
+            rows: Dict[str, CatalogRow] = {}
+            errors: Dict[str, str] = {}
+            for building, mtime_ns in ttl_versions:
+                cached = self._row_cache.get(building)
+                try:
+                    if force or cached is None or cached[0] != mtime_ns:
+                        graph, digest = self._load(building)
+                        if force or cached is None or digest is None or cached[1] != digest:
+                            idx = index_for(graph) if self._graphs is not None else BuildingIndex.from_graph(graph)
+                            cached = (mtime_ns, digest, build_row(building, idx))
+                        else:
+                            cached = (mtime_ns, digest, cached[2])  # touched but unchanged
+                        self._row_cache[building] = cached
+                    row = cached[2]
+                    location = locations.get(building)
+                    if location and location != row.location:
+                        row = CatalogRow(**{**row.to_dict(), "location": location})
+                    rows[building] = row
+                except Exception as e:
+                    errors[building] = f"{e.__class__.__name__}: {e}"
+            for stale in set(self._row_cache) - {b for b, _ in ttl_versions}:
+                del self._row_cache[stale]
+
+            self.rows = rows
+            self.errors = errors
+            self._sorted = {
+                name: sorted((getattr(r, name), r.building) for r in rows.values() if getattr(r, name) is not None)
+                for name in NUMERIC_FIELDS
+            }
+            self._keys = {name: [v for v, _ in entries] for name, entries in self._sorted.items()}
+            self._version = version
+        return self
+
+    # ---------- lookups ----------
+    def _check_field(self, attribute: str) -> None:
+        if attribute not in NUMERIC_FIELDS:
+            raise ValueError(f"Unknown catalog attribute '{attribute}', expected one of {list(NUMERIC_FIELDS)}")
+
+    def top_k(self, attribute: str, k: int, descending: bool = True,
+              scope: Optional[Iterable[str]] = None) -> List[CatalogRow]:
+        """The `k` buildings with the largest (or smallest) value of `attribute`."""
+        self._check_field(attribute)
+        entries = self._sorted[attribute]
+        ordered = reversed(entries) if descending else iter(entries)
+        scope = set(scope) if scope is not None else None
+        out: List[CatalogRow] = []
+        for _, building in ordered:
+            if scope is not None and building not in scope:
+                continue
+            out.append(self.rows[building])
+            if len(out) >= k:
+                break
+        return out
+
+    def range(self, attribute: str, min_value: Optional[float] = None, max_value: Optional[float] = None,
+              scope: Optional[Iterable[str]] = None) -> List[CatalogRow]:
+        """Buildings with `min_value <= attribute <= max_value` (open-ended when a bound is None), ascending."""
+        self._check_field(attribute)
+        keys = self._keys[attribute]
+        lo = 0 if min_value is None else bisect_left(keys, min_value)
+        hi = len(keys) if max_value is None else bisect_right(keys, max_value)
+        scope = set(scope) if scope is not None else None
+        return [
+            self.rows[building]
+            for _, building in self._sorted[attribute][lo:hi]
+            if scope is None or building in scope
+        ]
+
+    def group_by_location(self, scope: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Buildings grouped by location, with counts and total area per location."""
+        scope = set(scope) if scope is not None else None
+        groups: Dict[str, Dict[str, Any]] = {}
+        for building in sorted(self.rows):
+            if scope is not None and building not in scope:
+                continue
+            row = self.rows[building]
+            group = groups.setdefault(row.location or "unknown", {"buildings": [], "count": 0, "total_area_m2": 0.0})
+            group["buildings"].append(building)
+            group["count"] += 1
+            group["total_area_m2"] += row.area_m2 or 0.0
+        return groups
+
@@ -1,20 +1,24 @@
 from brick_assistant.config import settings
 from brick_assistant.tools import prompts
+from brick_assistant.tools.rdf_query import RDFToolkitArgs
+from brick_assistant.helpers.llm_cache import node_scope
+from brick_assistant.tools.metadata_index import compact_json, metadata_index_for
+from brick_assistant.tools.uuid_handles import merge_uuid_sets, uuid_sets_from_result
 from pydantic import BaseModel, Field
 
 from langgraph.graph import MessagesState as BaseMessagesState
 from langchain.chat_models.base import BaseChatModel
 
-from langchain_core.messages import AIMessage
+from langchain_core.messages import AIMessage, ToolMessage
 
 # REFACTOR FROM EDGES TO COMMANDS
 from langgraph.graph import END
 from typing import Literal
 from langgraph.types import Command 
 
-from typing import Dict, Optional, List
+from typing import Annotated, Dict, Optional, List
 import json
-from functools import lru_cache
+import uuid
 from pathlib import Path
 
 
@@ -23,16 +27,28 @@ class QueryEvaluation(BaseModel):
     clarified_query: str = Field(description="Clarified version of the query")
     explanation: str = Field(description="Explanation of the evaluation")
 
+class RouteDecision(QueryEvaluation):
+    """Single-call variant of QueryEvaluation: validity plus the first step of the workflow."""
+    route: Literal["rdf_toolkit", "list_tables", "end"] = Field(
+        description="First step: rdf_toolkit, list_tables (time-series with known UUIDs) or end (answer directly)"
+    )
+    rdf_call: Optional[RDFToolkitArgs] = Field(None, description="rdf_toolkit arguments when route is rdf_toolkit")
+    answer: Optional[str] = Field(None, description="Final answer when route is end")
+
 class MessagesState(BaseMessagesState):
     query_evaluation: Optional[QueryEvaluation] = None 
+    # UUID handle ('@bcgw_temp') -> UUIDs, captured from rdf_toolkit results
+    uuid_sets: Annotated[Dict[str, List[str]], merge_uuid_sets]
     
-def evaluate_user_query(state: MessagesState, llm_instance: BaseChatModel) -> Command[Literal["tables_or_rdf", END]]:
+def _evaluate_user_query_call(state: MessagesState, llm_instance: BaseChatModel):
     system_message = {
         "role": "system",
         "content": prompts.EVALUATE_USER_QUERY_PROMPT
     }   
     structured_llm = llm_instance.with_structured_output(QueryEvaluation)
-    evaluation_result = structured_llm.invoke([system_message] + state["messages"])
+    return structured_llm, [system_message] + state["messages"]
+
+def _evaluate_user_query_command(evaluation_result: QueryEvaluation) -> Command[Literal["tables_or_rdf", END]]:
     query_eval = evaluation_result
 
     if query_eval and query_eval.is_valid:
@@ -46,22 +62,117 @@ def evaluate_user_query(state: MessagesState, llm_instance: BaseChatModel) -> Co
     
     return Command(update=update, goto=goto)
 
-def call_get_schema(state: MessagesState,llm_instance: BaseChatModel, get_schema_tool):
-    llm_with_tools =llm_instance.bind_tools([get_schema_tool], tool_choice="any")
-    response = llm_with_tools.invoke(state["messages"])
-    return {"messages": [response]}
+def evaluate_user_query(state: MessagesState, llm_instance: BaseChatModel) -> Command[Literal["tables_or_rdf", END]]:
+    structured_llm, messages = _evaluate_user_query_call(state, llm_instance)
+    with node_scope("evaluate_user_query"):
+        response = structured_llm.invoke(messages)
+    return _evaluate_user_query_command(response)
+
+async def aevaluate_user_query(state: MessagesState, llm_instance: BaseChatModel) -> Command[Literal["tables_or_rdf", END]]:
+    structured_llm, messages = _evaluate_user_query_call(state, llm_instance)
+    with node_scope("evaluate_user_query"):
+        response = await structured_llm.ainvoke(messages)
+    return _evaluate_user_query_command(response)
 
-def generate_query(state: MessagesState, llm_instance: BaseChatModel, run_query_tool, rdf_toolkit) -> Command[Literal["check_query","rdf_toolkit", END]]:
+def _evaluate_and_route_call(state: MessagesState, llm_instance: BaseChatModel):
     system_message = {
         "role": "system",
-        "content": prompts.GENERATE_QUERY_SYSTEM_PROMPT.format(
-            dialect="postgresql",
-            top_k=settings.TOP_K_RESULTS
-        ),
+        "content": prompts.EVALUATE_AND_ROUTE_PROMPT
     }
-    llm_with_tools = llm_instance.bind_tools([run_query_tool,rdf_toolkit])
-    response = llm_with_tools.invoke([system_message] + state["messages"])
+    structured_llm = llm_instance.with_structured_output(RouteDecision)
+    return structured_llm, [system_message] + state["messages"]
+
+def _evaluate_and_route_command(decision: RouteDecision, list_tables_tool, rdf_toolkit) -> Command[Literal["rdf_toolkit", "list_tables_tool", "tables_or_rdf", END]]:
+    # Same state shape as evaluate_user_query, plus the tool call it would have taken tables_or_rdf a second LLM call to emit
+    evaluation = QueryEvaluation(
+        is_valid=decision.is_valid,
+        clarified_query=decision.clarified_query,
+        explanation=decision.explanation,
+    )
+    if not decision.is_valid:
+        message = AIMessage(content=f"Query evaluation: {decision.explanation}")
+        goto = END
+    elif decision.route == "rdf_toolkit" and decision.rdf_call is not None:
+        message = AIMessage(content="", tool_calls=[{
+            "name": rdf_toolkit.name,
+            "args": decision.rdf_call.model_dump(exclude_none=True),
+            "id": f"route_{uuid.uuid4().hex}",
+        }])
+        goto = "rdf_toolkit"
+    elif decision.route == "list_tables":
+        message = AIMessage(content="", tool_calls=[{
+            "name": list_tables_tool.name,
+            "args": {"tool_input": ""},
+            "id": f"route_{uuid.uuid4().hex}",
+        }])
+        goto = "list_tables_tool"
+    elif decision.route == "end":
+        message = AIMessage(content=decision.answer or decision.explanation)
+        goto = END
+    else:
+        # rdf_toolkit chosen without arguments: let the two-call router emit the tool call
+        message = AIMessage(content=f"Query evaluation: {decision.explanation}")
+        goto = "tables_or_rdf"
+    return Command(update={"messages": [message], "query_evaluation": evaluation}, goto=goto)
+
+def evaluate_and_route(state: MessagesState, llm_instance: BaseChatModel, list_tables_tool, rdf_toolkit) -> Command[Literal["rdf_toolkit", "list_tables_tool", "tables_or_rdf", END]]:
+    structured_llm, messages = _evaluate_and_route_call(state, llm_instance)
+    with node_scope("evaluate_and_route"):
+        response = structured_llm.invoke(messages)
+    return _evaluate_and_route_command(response, list_tables_tool, rdf_toolkit)
+
+async def aevaluate_and_route(state: MessagesState, llm_instance: BaseChatModel, list_tables_tool, rdf_toolkit) -> Command[Literal["rdf_toolkit", "list_tables_tool", "tables_or_rdf", END]]:
+    structured_llm, messages = _evaluate_and_route_call(state, llm_instance)
+    with node_scope("evaluate_and_route"):
+        response = await structured_llm.ainvoke(messages)
+    return _evaluate_and_route_command(response, list_tables_tool, rdf_toolkit)
+
+def call_get_schema(state: MessagesState,llm_instance: BaseChatModel, get_schema_tool):
+    llm_with_tools =llm_instance.bind_tools([get_schema_tool], tool_choice="any")
+    with node_scope("call_get_schema"):
+        response = llm_with_tools.invoke(state["messages"])
+    return {"messages": [response]}
+
+async def acall_get_schema(state: MessagesState, llm_instance: BaseChatModel, get_schema_tool):
+    llm_with_tools = llm_instance.bind_tools([get_schema_tool], tool_choice="any")
+    with node_scope("call_get_schema"):
+        response = await llm_with_tools.ainvoke(state["messages"])
+    return {"messages": [response]}
 
+def inject_schema(state: MessagesState, schema_catalog, tables: Optional[List[str]] = None) -> Dict[str, List]:
+    """
+    Schema step without the call_get_schema LLM hop.
+
+    Emits the sql_db_schema tool call and its result (from the cached schema catalog) for
+    `tables`, or for every usable table when none are configured.
+    """
+    call_id = f"schema_{uuid.uuid4().hex}"
+    try:
+        names = list(tables) if tables else schema_catalog.table_names()
+        content = schema_catalog.table_info_no_throw(names)
+    except Exception as e:
+        names, content = list(tables or []), f"Error: {e}"
+    call = AIMessage(content="", tool_calls=[{"name": "sql_db_schema", "args": {"table_names": ", ".join(names)}, "id": call_id}])
+    result = ToolMessage(content=content, name="sql_db_schema", tool_call_id=call_id)
+    return {"messages": [call, result]}
+
+def _generate_query_call(state: MessagesState, llm_instance: BaseChatModel, run_query_tool, rdf_toolkit, sensor_stats_tool=None):
+    content = prompts.GENERATE_QUERY_SYSTEM_PROMPT.format(
+        dialect="postgresql",
+        top_k=settings.TOP_K_RESULTS
+    )
+    tools = [run_query_tool, rdf_toolkit]
+    if sensor_stats_tool is not None:
+        content += prompts.SENSOR_STATS_PROMPT
+        tools.append(sensor_stats_tool)
+    if state.get("uuid_sets"):
+        handles = "\n".join(f"- {handle}: {len(uuids)} UUIDs" for handle, uuids in sorted(state["uuid_sets"].items()))
+        content += prompts.UUID_HANDLES_PROMPT.format(handles=handles)
+    system_message = {"role": "system", "content": content}
+    llm_with_tools = llm_instance.bind_tools(tools)
+    return llm_with_tools, [system_message] + state["messages"]
+
+def _generate_query_command(response) -> Command[Literal["check_query","rdf_toolkit","sensor_stats", END]]:
     # Fix: Initialize goto to END by default
     goto = END
     
@@ -72,14 +183,28 @@ def generate_query(state: MessagesState, llm_instance: BaseChatModel, run_query_
             goto = "check_query"
         elif tool_call.get("name") == "rdf_toolkit":
             goto = "rdf_toolkit"
+        elif tool_call.get("name") == "sensor_stats":
+            # typed aggregation: parameterized SQL, no check_query pass needed
+            goto = "sensor_stats"
         # else remains END
 
     update = {"messages": [response]}
     return Command(update=update, goto=goto)
 
+def generate_query(state: MessagesState, llm_instance: BaseChatModel, run_query_tool, rdf_toolkit, sensor_stats_tool=None) -> Command[Literal["check_query","rdf_toolkit","sensor_stats", END]]:
+    llm_with_tools, messages = _generate_query_call(state, llm_instance, run_query_tool, rdf_toolkit, sensor_stats_tool)
+    with node_scope("generate_query"):
+        response = llm_with_tools.invoke(messages)
+    return _generate_query_command(response)
 
+async def agenerate_query(state: MessagesState, llm_instance: BaseChatModel, run_query_tool, rdf_toolkit, sensor_stats_tool=None) -> Command[Literal["check_query","rdf_toolkit","sensor_stats", END]]:
+    llm_with_tools, messages = _generate_query_call(state, llm_instance, run_query_tool, rdf_toolkit, sensor_stats_tool)
+    with node_scope("generate_query"):
+        response = await llm_with_tools.ainvoke(messages)
+    return _generate_query_command(response)
 
-def check_query(state: MessagesState, llm_instance: BaseChatModel, run_query_tool):
+
+def _check_query_call(state: MessagesState, llm_instance: BaseChatModel, run_query_tool):
     system_message = {
         "role": "system",
         "content": prompts.CHECK_QUERY_SYSTEM_PROMPT.format(
@@ -90,20 +215,62 @@ def check_query(state: MessagesState, llm_instance: BaseChatModel, run_query_too
     tool_call = state["messages"][-1].tool_calls[0]
     user_message = {"role": "user", "content": tool_call["args"]["query"]}
     llm_with_tools = llm_instance.bind_tools([run_query_tool], tool_choice="any")
-    response = llm_with_tools.invoke([system_message, user_message])
+    return llm_with_tools, [system_message, user_message]
+
+def _checked_query_command(state: MessagesState, result, tool_call) -> Command[Literal["run_query", "generate_query"]]:
+    # the generate_query message is replaced (same id) so it carries exactly the call that runs or is answered
+    last = state["messages"][-1]
+    if result.ok:
+        call = {**tool_call, "args": {**tool_call["args"], "query": result.query}}
+        message = AIMessage(content=last.content, tool_calls=[call], id=last.id)
+        return Command(update={"messages": [message]}, goto="run_query")
+    message = AIMessage(content=last.content, tool_calls=[tool_call], id=last.id)
+    rejection = ToolMessage(content=result.feedback(), name=tool_call["name"], tool_call_id=tool_call["id"])
+    return Command(update={"messages": [message, rejection]}, goto="generate_query")
+
+def check_query(state: MessagesState, llm_instance: BaseChatModel, run_query_tool, validator=None,
+                llm_fallback: bool = True) -> Command[Literal["run_query", "generate_query"]]:
+    """
+    Check the query of the pending sql_db_query call.
+
+    With a SQLValidator the check is local: valid (possibly rewritten) queries go to run_query,
+    rejected ones go back to generate_query with the reasons. The LLM check is only used for
+    queries the validator cannot parse (when `llm_fallback`), and its rewrite is validated again.
+    Without a validator every query goes through the LLM check.
+    """
+    tool_call = state["messages"][-1].tool_calls[0]
+    if validator is not None:
+        result = validator.validate(tool_call["args"]["query"])
+        if result.parsed or not llm_fallback:
+            return _checked_query_command(state, result, tool_call)
+    llm_with_tools, messages = _check_query_call(state, llm_instance, run_query_tool)
+    with node_scope("check_query"):
+        response = llm_with_tools.invoke(messages)
+    if validator is not None:
+        query = response.tool_calls[0]["args"]["query"] if response.tool_calls else tool_call["args"]["query"]
+        return _checked_query_command(state, validator.validate(query), tool_call)
     response.id = state["messages"][-1].id
 
-    return {"messages": [response]}
+    return Command(update={"messages": [response]}, goto="run_query")
 
-def tables_or_rdf(state: MessagesState, llm_instance: BaseChatModel, list_tables_tool, rdf_toolkit) -> Command[Literal["list_tables_tool", "rdf_toolkit", END]]:
-    system_message = {
-        "role": "system",
-        "content": prompts.RDF_DB_PROMPT,
-    }
-    
-    llm_with_tools = llm_instance.bind_tools([list_tables_tool, rdf_toolkit])
-    response = llm_with_tools.invoke([system_message] + state["messages"]) 
+async def acheck_query(state: MessagesState, llm_instance: BaseChatModel, run_query_tool, validator=None,
+                       llm_fallback: bool = True) -> Command[Literal["run_query", "generate_query"]]:
+    tool_call = state["messages"][-1].tool_calls[0]
+    if validator is not None:
+        result = validator.validate(tool_call["args"]["query"])
+        if result.parsed or not llm_fallback:
+            return _checked_query_command(state, result, tool_call)
+    llm_with_tools, messages = _check_query_call(state, llm_instance, run_query_tool)
+    with node_scope("check_query"):
+        response = await llm_with_tools.ainvoke(messages)
+    if validator is not None:
+        query = response.tool_calls[0]["args"]["query"] if response.tool_calls else tool_call["args"]["query"]
+        return _checked_query_command(state, validator.validate(query), tool_call)
+    response.id = state["messages"][-1].id
+
+    return Command(update={"messages": [response]}, goto="run_query")
 
+def _tables_or_x_command(response) -> Command[Literal["list_tables_tool", "rdf_toolkit", END]]:
     goto = END
     if hasattr(response, 'tool_calls') and response.tool_calls:
         tool_call = response.tool_calls[0]
@@ -115,51 +282,134 @@ def tables_or_rdf(state: MessagesState, llm_instance: BaseChatModel, list_tables
     update = {"messages": [response]}
     return Command(update=update, goto=goto)  
 
+def _tables_or_rdf_call(state: MessagesState, llm_instance: BaseChatModel, list_tables_tool, rdf_toolkit):
+    system_message = {
+        "role": "system",
+        "content": prompts.RDF_DB_PROMPT,
+    }
+    
+    llm_with_tools = llm_instance.bind_tools([list_tables_tool, rdf_toolkit])
+    return llm_with_tools, [system_message] + state["messages"]
+
+def tables_or_rdf(state: MessagesState, llm_instance: BaseChatModel, list_tables_tool, rdf_toolkit) -> Command[Literal["list_tables_tool", "rdf_toolkit", END]]:
+    llm_with_tools, messages = _tables_or_rdf_call(state, llm_instance, list_tables_tool, rdf_toolkit)
+    with node_scope("tables_or_rdf"):
+        response = llm_with_tools.invoke(messages)
+    return _tables_or_x_command(response)
 
-def tables_or_end(state: MessagesState, llm_instance: BaseChatModel, list_tables_tool, rdf_toolkit) -> Command[Literal["list_tables_tool", "rdf_toolkit", END]]:
+async def atables_or_rdf(state: MessagesState, llm_instance: BaseChatModel, list_tables_tool, rdf_toolkit) -> Command[Literal["list_tables_tool", "rdf_toolkit", END]]:
+    llm_with_tools, messages = _tables_or_rdf_call(state, llm_instance, list_tables_tool, rdf_toolkit)
+    with node_scope("tables_or_rdf"):
+        response = await llm_with_tools.ainvoke(messages)
+    return _tables_or_x_command(response)
+
+
+def _tables_or_end_call(state: MessagesState, llm_instance: BaseChatModel, list_tables_tool, rdf_toolkit):
     system_message = {
         "role": "system",
         "content": prompts.TABLES_OR_END_PROMPT,
     }    
     llm_with_tools = llm_instance.bind_tools([list_tables_tool, rdf_toolkit])
-    response = llm_with_tools.invoke([system_message] + state["messages"])
+    return llm_with_tools, [system_message] + state["messages"]
 
-    goto = END
-    if hasattr(response, 'tool_calls') and response.tool_calls:
-        tool_call = response.tool_calls[0]
-        if tool_call.get("name") == "rdf_toolkit":
-            goto = "rdf_toolkit"    
-        if tool_call.get("name") == "list_tables_tool" or tool_call.get("name") == "list_tables" or tool_call.get("name") == "sql_db_list_tables":
-            goto = "list_tables_tool"
+def tables_or_end(state: MessagesState, llm_instance: BaseChatModel, list_tables_tool, rdf_toolkit) -> Command[Literal["list_tables_tool", "rdf_toolkit", END]]:
+    llm_with_tools, messages = _tables_or_end_call(state, llm_instance, list_tables_tool, rdf_toolkit)
+    with node_scope("tables_or_end"):
+        response = llm_with_tools.invoke(messages)
+    return _tables_or_x_command(response)
 
-    update = {"messages": [response]}
-    return Command(update=update, goto=goto)
+async def atables_or_end(state: MessagesState, llm_instance: BaseChatModel, list_tables_tool, rdf_toolkit) -> Command[Literal["list_tables_tool", "rdf_toolkit", END]]:
+    llm_with_tools, messages = _tables_or_end_call(state, llm_instance, list_tables_tool, rdf_toolkit)
+    with node_scope("tables_or_end"):
+        response = await llm_with_tools.ainvoke(messages)
+    return _tables_or_x_command(response)
 
 # ============================================
 # Functional interfaces for use in graph nodes
 # ============================================
 
-@lru_cache(maxsize=1)
-def load_metadata(path_str: str) -> Dict:
-    """Load and cache metadata from file."""
-    with open(path_str, 'r') as file:
-        return json.load(file)
+def _last_user_question(state: MessagesState) -> str:
+    question = next(
+        (m.content for m in reversed(state["messages"]) if getattr(m, "type", None) == "human"),
+        "",
+    )
+    return question if isinstance(question, str) else ""
 
-def enforced_metadata_keys_call(state: MessagesState,path: Path) -> Dict[str, List]:
+def enforced_metadata_keys_call(state: MessagesState, path: Path, filter_relevant: bool = True) -> Dict[str, List]:
     """
     Functional interface for metadata keys retrieval.
     Used directly in graph nodes.
+
+    With `filter_relevant`, only the buildings the question refers to (by code or location,
+    fuzzily matched) are injected; the full list is used when none match.
     """
-    metadata = load_metadata(str(path))
-    buildings = {
-        outer_key: metadata[outer_key]["location"] 
-        for outer_key in metadata.keys()
-    }
-    
+    index = metadata_index_for(str(path))
+    buildings = index.relevant(_last_user_question(state)) if filter_relevant else dict(index.buildings)
+
     # Return in a format consistent with other nodes
+    if len(buildings) < len(index.buildings):
+        content = (
+            f"Buildings relevant to the question ({len(buildings)} of {len(index.buildings)} in the portfolio): "
+            f"{compact_json(buildings)}"
+        )
+    else:
+        content = f"Available buildings and locations: {compact_json(buildings)}"
+    return {"messages": [AIMessage(content=content)]}
+
+def capture_uuid_handles(state: MessagesState) -> Dict:
+    """
+    Store the UUID sets of the latest rdf_toolkit results under short handles (see tools/uuid_handles.py).
+
+    Each result that yields handles is rewritten in place (same message id) with a leading
+    "uuid_handles" entry ({handle: number of UUIDs}), so the LLM knows which handles exist.
+    """
+    messages = state["messages"]
+    results = []
+    for message in reversed(messages):
+        if not isinstance(message, ToolMessage):
+            break
+        results.append(message)
+    if not results or len(results) == len(messages):
+        return {}
+    calls = {call["id"]: call for call in getattr(messages[-len(results) - 1], "tool_calls", [])}
+    uuid_sets, updated = {}, []
+    for message in reversed(results):
+        call = calls.get(message.tool_call_id)
+        if message.name != "rdf_toolkit" or call is None:
+            continue
+        try:
+            payload = json.loads(message.content)
+        except (TypeError, ValueError):
+            continue
+        sets = uuid_sets_from_result(payload, call["args"])
+        if not sets:
+            continue
+        uuid_sets.update(sets)
+        annotated = {"uuid_handles": {handle: len(uuids) for handle, uuids in sets.items()}, **payload}
+        updated.append(message.model_copy(update={"content": json.dumps(annotated, ensure_ascii=False)}))
+    if not uuid_sets:
+        return {}
+    return {"uuid_sets": uuid_sets, "messages": updated}
+
+def intent_fast_path(state: MessagesState, matcher, fallback: str = "evaluate_user_query") -> Command[Literal["rdf_toolkit", "evaluate_user_query", "evaluate_and_route"]]:
+    """
+    Route recognized questions straight to rdf_toolkit, skipping the routing LLM calls.
+
+    `matcher` is an `intent.IntentMatcher`; when it finds no unambiguous intent the
+    question continues through the graph's entry node (`fallback`) as usual.
+    """
+    question = _last_user_question(state)
+    match = matcher.match(question)
+    if match is None:
+        return Command(goto=fallback)
+
     message = AIMessage(
-        content=f"Available buildings and locations: {json.dumps(buildings, indent=2)}"
+        content="",
+        tool_calls=[{"name": "rdf_toolkit", "args": match.args, "id": f"intent_{uuid.uuid4().hex}"}],
     )
-    return {"messages": [message]}
-
-   
+    evaluation = QueryEvaluation(
+        is_valid=True,
+        clarified_query=question,
+        explanation=f"Matched intent '{match.operation}' for {', '.join(match.buildings)}",
+    )
+    return Command(update={"messages": [message], "query_evaluation": evaluation}, goto="rdf_toolkit")
@@ -0,0 +1,172 @@
+from __future__ import annotations
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional
+import hashlib
+import os
+import threading
+
+from rdflib import Graph
+
+
+def file_digest(path: Path) -> str:
+    """Return the sha256 hex digest of a file's content."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+@dataclass
+class CacheEntry:
+    graph: Graph
+    path: Path
+    mtime_ns: int
+    digest: str
+    triples: int
+
+
+class BuildingGraphCache:
+    """
+    Bounded LRU cache of parsed building graphs.
+
+    Entries are keyed by the upper-cased building name and validated against the
+    backing file on every lookup: if the mtime changed the content hash is recomputed
+    and the graph is reloaded only when the content actually differs.
+    The cache is bounded both by number of entries and by the total number of triples
+    held (a cheap proxy for memory usage).
+
+    `on_reload(building)` is called after a changed file has been reloaded, so caches
+    derived from the old graph can drop their entries.
+
+    Cached graphs are shared between callers and threads: treat them as read-only.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[Path], Graph],
+        path_for: Callable[[str], Path],
+        max_entries: int = 32,
+        max_triples: int = 1_000_000,
+        on_reload: Optional[Callable[[str], object]] = None,
+    ):
+        self._loader = loader
+        self._path_for = path_for
+        self._on_reload = on_reload
+        self.max_entries = max_entries
+        self.max_triples = max_triples
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._total_triples = 0
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.reloads = 0
+
+    # ---------- public API ----------
+    def get(self, building_name: str) -> Graph:
+        """Return the graph for `building_name`, loading it on a miss or when the file changed."""
+        return self.entry(building_name).graph
+
+    def entry(self, building_name: str) -> CacheEntry:
+        """Return the validated cache entry (graph plus file version) for `building_name`."""
+        key = building_name.upper()
+        path = self._path_for(key)
+        mtime_ns = os.stat(path).st_mtime_ns  # raises FileNotFoundError for unknown buildings
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.mtime_ns == mtime_ns:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Load outside the global lock so different buildings parse in parallel,
+        # but serialize loads of the same building.
+        with key_lock:
+            with self._lock:
+                current = self._entries.get(key)
+                if current is not None and current.mtime_ns == mtime_ns:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return current
+
+            digest = file_digest(path)
+            if current is not None and current.digest == digest:
+                # Touched but unchanged: keep the parsed graph.
+                with self._lock:
+                    current.mtime_ns = mtime_ns
+                    self.hits += 1
+                    return current
+
+            graph = self._loader(path)
+            new_entry = CacheEntry(graph=graph, path=path, mtime_ns=mtime_ns, digest=digest, triples=len(graph))
+            with self._lock:
+                self.misses += 1
+                if current is not None:
+                    self.reloads += 1
+                self._put(key, new_entry)
+            if current is not None and self._on_reload is not None:
+                self._on_reload(key)
+            return new_entry
+
+    def warm(self, buildings: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        Preload the given buildings.
+
+        Returns:
+            Dict[str, Optional[str]]: building -> None on success, or the error message.
+        """
+        report: Dict[str, Optional[str]] = {}
+        for building in buildings:
+            try:
+                self.entry(building)
+                report[building] = None
+            except Exception as e:
+                report[building] = f"{e.__class__.__name__}: {e}"
+        return report
+
+    def invalidate(self, building_name: Optional[str] = None) -> None:
+        """Drop one building from the cache, or everything when no building is given."""
+        with self._lock:
+            if building_name is None:
+                self._entries.clear()
+                self._total_triples = 0
+                return
+            entry = self._entries.pop(building_name.upper(), None)
+            if entry is not None:
+                self._total_triples -= entry.triples
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "triples": self._total_triples,
+                "hits": self.hits,
+                "misses": self.misses,
+                "reloads": self.reloads,
+                "evictions": self.evictions,
+            }
+
+    def __contains__(self, building_name: str) -> bool:
+        with self._lock:
+            return building_name.upper() in self._entries
+
+    # ---------- internals ----------
+    def _put(self, key: str, entry: CacheEntry) -> None:
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._total_triples -= old.triples
+        self._entries[key] = entry
+        self._total_triples += entry.triples
+        # Always keep the most recent entry, even if it alone exceeds the bound.
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or self._total_triples > self.max_triples
+        ):
+            _, evicted = self._entries.popitem(last=False)
+            self._total_triples -= evicted.triples
+            self.evictions += 1
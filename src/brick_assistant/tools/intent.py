@@ -0,0 +1,153 @@
+"""
+Deterministic intent matcher for the most common RDF questions.
+
+Questions such as "area of BCGW", "temperature sensors in BCGG" or "zones in Grottaminarda"
+map to exactly one rdf_toolkit operation and a known set of buildings. Recognizing them with
+a small lexicon lets the graph call the tool directly instead of paying for the
+evaluate_user_query and tables_or_rdf LLM round trips. Anything ambiguous (several operations,
+no building, time-series, live-value or ranking wording) is left to the LLM path.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import json
+import re
+import threading
+
+from brick_assistant.tools.rdf_query import STRATEGIES
+
+# Phrases per single-building operation. The longest matching phrase wins, so
+# "temperature sensors" selects temperature_sensors_uuid rather than generic_sensors.
+OPERATION_LEXICON: Dict[str, Tuple[str, ...]] = {
+    "area": ("area", "surface", "floor area", "square meters", "square metres", "m2", "sqm", "how big"),
+    "temperature_sensors_uuid": (
+        "temperature sensor", "temperature sensors", "temp sensor", "temp sensors",
+        "temperature probe", "temperature probes", "thermometer", "thermometers",
+    ),
+    "zones": ("zone", "zones", "hvac zone", "hvac zones"),
+    "generic_sensors": ("sensor", "sensors", "points", "all sensors"),
+    "meters": ("meter", "meters", "energy meter", "energy meters", "power meter", "power meters"),
+}
+
+# Wording that needs time-series data, ranking across buildings or reasoning the
+# built-in operations cannot provide: always defer to the LLM path.
+VETO_TERMS: Tuple[str, ...] = (
+    "average", "mean", "median", "maximum", "minimum", "max", "min", "sum", "total consumption",
+    "trend", "reading", "readings", "value", "values", "measured", "measurement", "consumption",
+    "yesterday", "today", "last", "since", "between", "hour", "hours", "day", "days", "week",
+    "weeks", "month", "months", "year", "years", "compare", "comparison", "versus", "vs",
+    "largest", "smallest", "biggest", "highest", "lowest", "top", "rank", "most", "least",
+    "which building", "what building", "timeseries", "time series", "sql", "table", "tables",
+    # live values: present tense and measured quantities (outside a lexicon phrase such as
+    # "temperature sensors" or "energy meters", which are masked before the veto check)
+    "now", "right now", "current", "currently", "latest", "temperature", "power", "energy",
+    "hot", "cold", "humidity",
+)
+
+# "area 2", "area B", "area_3": a location inside the building, not its floor area
+AREA_LOCATION_PATTERN = re.compile(r"(?<![\w])area[\s_#-]*(?:\d+|[a-z])(?![\w])", re.IGNORECASE)
+
+
+def _phrase_pattern(phrases: Iterable[str]) -> re.Pattern:
+    alternatives = sorted({re.escape(p.lower()) for p in phrases}, key=len, reverse=True)
+    return re.compile(r"(?<![\w])(?:" + "|".join(alternatives) + r")(?![\w])", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class IntentMatch:
+    operation: str
+    buildings: Tuple[str, ...]
+
+    @property
+    def args(self) -> Dict[str, Any]:
+        """rdf_toolkit arguments; several buildings use the tool's comma-separated portfolio form."""
+        return {"building_name": ",".join(self.buildings), "operation": self.operation}
+
+
+class IntentMatcher:
+    """
+    Rule/lexicon-based matcher from a question to one rdf_toolkit operation plus buildings.
+
+    Buildings are recognized by code ("BCGW") or by location ("Bussolengo") as listed in the
+    metadata file; a location shared by several buildings resolves to all of them.
+    """
+
+    def __init__(self, buildings: Dict[str, Optional[str]],
+                 lexicon: Optional[Dict[str, Tuple[str, ...]]] = None,
+                 veto_terms: Iterable[str] = VETO_TERMS):
+        lexicon = OPERATION_LEXICON if lexicon is None else lexicon
+        unknown = set(lexicon) - set(STRATEGIES)
+        if unknown:
+            raise ValueError(f"Lexicon refers to unknown rdf_toolkit operations: {sorted(unknown)}")
+
+        self._phrase_to_op: Dict[str, str] = {p.lower(): op for op, phrases in lexicon.items() for p in phrases}
+        self._op_pattern = _phrase_pattern(self._phrase_to_op)
+        self._veto_pattern = _phrase_pattern(veto_terms)
+
+        self._codes = {code.upper() for code in buildings}
+        self._by_location: Dict[str, List[str]] = {}
+        for code, location in sorted(buildings.items()):
+            if location and location.lower() != "unknown":
+                self._by_location.setdefault(location.lower(), []).append(code.upper())
+        self._building_pattern = _phrase_pattern(list(self._codes) + list(self._by_location))
+
+        self._lock = threading.Lock()
+        self.attempts = 0
+        self.matches = 0
+        self.by_operation: Dict[str, int] = {}
+
+    @classmethod
+    def from_metadata(cls, path: Path) -> "IntentMatcher":
+        with open(path, "r") as file:
+            metadata = json.load(file)
+        return cls({code: entry.get("location") for code, entry in metadata.items() if isinstance(entry, dict)})
+
+    def _operation(self, question: str) -> Optional[str]:
+        # leftmost-longest scan: a shorter phrase inside a longer one ("sensors" in
+        # "temperature sensors") is never reported separately
+        operations = {self._phrase_to_op[m.group(0).lower()] for m in self._op_pattern.finditer(question)}
+        return operations.pop() if len(operations) == 1 else None
+
+    def _buildings(self, question: str) -> Tuple[str, ...]:
+        found: List[str] = []
+        for m in self._building_pattern.finditer(question):
+            token = m.group(0)
+            if token.upper() in self._codes:
+                found.append(token.upper())
+            else:
+                found.extend(self._by_location.get(token.lower(), ()))
+        return tuple(dict.fromkeys(found))
+
+    def match(self, question: str) -> Optional[IntentMatch]:
+        """Return the recognized intent, or None when the question should go through the LLM."""
+        result = None
+        question = AREA_LOCATION_PATTERN.sub(" ", question or "")
+        if question and not self._veto_pattern.search(self._op_pattern.sub(" ", question)):
+            operation = self._operation(question)
+            buildings = self._buildings(question) if operation else ()
+            if operation and buildings:
+                result = IntentMatch(operation=operation, buildings=buildings)
+
+        with self._lock:
+            self.attempts += 1
+            if result is not None:
+                self.matches += 1
+                self.by_operation[result.operation] = self.by_operation.get(result.operation, 0) + 1
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "attempts": self.attempts,
+                "matches": self.matches,
+                "match_rate": self.matches / self.attempts if self.attempts else 0.0,
+                "by_operation": dict(self.by_operation),
+            }
+
+
+@lru_cache(maxsize=None)
+def intent_matcher_for(path_str: str) -> IntentMatcher:
+    """Shared matcher (and match-rate counters) per metadata file."""
+    return IntentMatcher.from_metadata(Path(path_str))
@@ -0,0 +1,78 @@
+"""
+Building metadata index used to inject only the buildings a question is about.
+
+Buildings are matched on their code ("BCGW") and location name ("Bussolengo"), exactly
+or fuzzily (difflib) to tolerate typos such as "Busolengo" or "BCWG". When nothing
+matches, callers fall back to the full list.
+"""
+from __future__ import annotations
+from difflib import get_close_matches
+from functools import lru_cache
+from typing import Dict, List, Optional
+import json
+import re
+
+# difflib ratio needed for a fuzzy hit. Codes are short, so one wrong character in a
+# 4-character code (ratio 0.75) still counts; location names need to be closer.
+CODE_CUTOFF = 0.75
+LOCATION_CUTOFF = 0.85
+
+_WORD_RE = re.compile(r"[\w']+")
+
+
+def compact_json(value) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+class MetadataIndex:
+    def __init__(self, buildings: Dict[str, Optional[str]]):
+        # code -> location, in file order
+        self.buildings: Dict[str, Optional[str]] = {code.upper(): location for code, location in buildings.items()}
+        self._by_location: Dict[str, List[str]] = {}
+        for code, location in self.buildings.items():
+            if location and location.lower() != "unknown":
+                self._by_location.setdefault(location.lower(), []).append(code)
+        self._max_words = max((len(loc.split()) for loc in self._by_location), default=1)
+
+    @classmethod
+    def from_metadata(cls, metadata: Dict) -> "MetadataIndex":
+        return cls({code: entry.get("location") for code, entry in metadata.items() if isinstance(entry, dict)})
+
+    def _ngrams(self, question: str) -> List[str]:
+        words = _WORD_RE.findall(question.lower())
+        return [
+            " ".join(words[i:i + n])
+            for n in range(self._max_words, 0, -1)
+            for i in range(len(words) - n + 1)
+        ]
+
+    def match(self, question: str) -> List[str]:
+        """Codes of the buildings the question refers to, in file order (empty when none)."""
+        found = set()
+        code_lengths = {len(code) for code in self.buildings}
+        for gram in self._ngrams(question or ""):
+            upper = gram.upper()
+            if upper in self.buildings:
+                found.add(upper)
+            elif gram in self._by_location:
+                found.update(self._by_location[gram])
+            else:
+                if " " not in gram and len(gram) in code_lengths:
+                    found.update(get_close_matches(upper, self.buildings, n=3, cutoff=CODE_CUTOFF))
+                if len(gram) >= 4:
+                    for location in get_close_matches(gram, self._by_location, n=2, cutoff=LOCATION_CUTOFF):
+                        found.update(self._by_location[location])
+        return [code for code in self.buildings if code in found]
+
+    def relevant(self, question: str) -> Dict[str, Optional[str]]:
+        """code -> location for the buildings matching the question, or every building when none match."""
+        codes = self.match(question)
+        if not codes:
+            return dict(self.buildings)
+        return {code: self.buildings[code] for code in codes}
+
+
+@lru_cache(maxsize=None)
+def metadata_index_for(path_str: str) -> MetadataIndex:
+    with open(path_str, "r") as file:
+        return MetadataIndex.from_metadata(json.load(file))
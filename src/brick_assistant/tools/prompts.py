@@ -40,6 +40,25 @@ provided by the metadata resolution step.
 
 """
 
+# Appended to GENERATE_QUERY_SYSTEM_PROMPT when UUID handles were captured from rdf_toolkit results
+UUID_HANDLES_PROMPT = """
+## UUID HANDLES
+The UUID sets collected from the metadata are available as handles:
+{handles}
+Filter with the handle instead of copying UUIDs, e.g. `WHERE uuid IN (@bcgw_temp)` or
+`WHERE uuid IN (@bcgw_meters, @bcgu_meters)`; the handles are expanded into the exact UUIDs when the
+query runs. Handles can also be passed in the `uuids` list of sensor_stats.
+"""
+
+# Appended to GENERATE_QUERY_SYSTEM_PROMPT when the sensor_stats tool is bound
+SENSOR_STATS_PROMPT = """
+## SENSOR AGGREGATES
+For averages, minimums, maximums, totals or reading counts of sensors/meters over a time window
+(optionally per hour, day, week or month), call the **sensor_stats** tool with the UUIDs collected
+from the metadata instead of writing SQL. Write SQL with sql_db_query only for questions sensor_stats
+cannot answer (e.g. individual readings, thresholds, comparisons between columns).
+"""
+
 CHECK_QUERY_SYSTEM_PROMPT = """
 You are a SQL expert with a strong attention to detail.
 Double check the {dialect} query for common mistakes, including:
@@ -236,4 +255,30 @@ You are a planner for a single tool named "rdf_toolkit".
   - operation: one of ["area","zones","temperature_sensors_uuid","generic_sensors","meters"] depending on the user query.
   - Optionally set location_filter and/or limit if the user implies them.
 - If unsure, choose "generic_sensors".
-"""
\ No newline at end of file
+"""
+EVALUATE_AND_ROUTE_PROMPT = """You are the entry point of a building information retrieval system. In ONE structured response you
+validate the user query AND decide the first step of the workflow.
+
+## 1. VALIDITY
+- The query is valid if it is relevant for the BUILDING DOMAIN (buildings, locations, sensors, meters, zones, areas, measurements).
+- Do not be too strict: a building name that looks like gibberish may still be a valid building code, check it against the
+  pre-resolved metadata. Sensor names do not need to be given, they come up later from the RDF files.
+- NEVER ask the user for clarification. If the query is invalid (gibberish, unrelated to buildings) set is_valid to False,
+  clarified_query to an empty string, and explain why in explanation.
+- If the query is valid set is_valid to True, give a clarified version of the query and explain why it is valid.
+
+## 2. ROUTE (only when the query is valid)
+The building codes and their locations are ALREADY available in the conversation (e.g. BCGU: Monopoli).
+- route = "end": the question is answerable from the pre-resolved building/location metadata alone
+  (e.g. "Where is BCGW located?", "Which building is in Monopoli?"). Put the complete answer in `answer`.
+- route = "rdf_toolkit": the question needs building metadata beyond name/location (area, zones, sensors and their UUIDs,
+  meters, rankings across buildings). Fill `rdf_call` with the rdf_toolkit arguments:
+  - building_name: the building code from the metadata (comma-separated codes or '*' for several buildings), never invented.
+  - operation: "area", "temperature_sensors_uuid", "zones", "generic_sensors" or "meters" for one building;
+    "catalog_top_k", "catalog_range" or "catalog_group_by_location" for rankings, ranges and per-location aggregates.
+  - location_filter, limit, attribute, order, min_value, max_value only when the question implies them.
+  Time-series questions (readings, averages, trends) also start here: the sensor UUIDs must be collected first.
+- route = "list_tables": the question is about time-series data and the sensor UUIDs are already known in the conversation.
+
+Never query for building names or locations, and never route to SQL by building name: SQL is queried by sensor UUID only.
+"""
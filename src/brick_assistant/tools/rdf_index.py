@@ -0,0 +1,165 @@
+from __future__ import annotations
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+import re
+import threading
+import weakref
+
+from rdflib import Graph, Namespace, RDF
+from rdflib.term import Node
+
+BRICK = Namespace("https://brickschema.org/schema/Brick#")
+
+# Class suffixes used by the built-in operations (see rdf_query.STRATEGIES).
+CLASS_SUFFIXES = ("Temperature_Sensor", "Sensor", "Meter")
+_BUILDING_ATTRIBUTES = (BRICK.hasLocation, BRICK.hasCoordinates, BRICK.buildingPrimaryFunction)
+
+_AREA_RE = re.compile(r"^\s*([-+]?\d+(?:[.,]\d+)?)\s*(.*?)\s*$")
+_UNIT_ALIASES = {
+    "": "m2",
+    "m2": "m2",
+    "m²": "m2",
+    "sqm": "m2",
+    "sq m": "m2",
+    "square meter": "m2",
+    "square meters": "m2",
+    "square metre": "m2",
+    "square metres": "m2",
+}
+
+Row = Tuple[Node, ...]
+
+
+def parse_area(value) -> Tuple[Optional[float], Optional[str]]:
+    """Parse a free-text area literal such as "1527 square meter" into (1527.0, "m2")."""
+    if value is None:
+        return None, None
+    match = _AREA_RE.match(str(value))
+    if not match:
+        return None, None
+    unit = match.group(2).lower()
+    return float(match.group(1).replace(",", ".")), _UNIT_ALIASES.get(unit, unit)
+
+
+def _to_float(value) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def row_key(row: Row) -> Tuple[str, ...]:
+    """Canonical sort key for result rows, shared by the SPARQL and index paths."""
+    return tuple(str(term) for term in row)
+
+
+@dataclass
+class BuildingIndex:
+    """
+    Load-time index of a building graph.
+
+    Built in a single pass over the triples; the built-in operations are then answered
+    with dictionary lookups instead of SPARQL evaluation. `rows` holds the pre-sorted
+    result rows of each operation, in the same column order as the SPARQL queries.
+    """
+    types: Dict[Node, List[Node]] = field(default_factory=lambda: defaultdict(list))
+    by_class_suffix: Dict[str, List[Tuple[Node, Node]]] = field(default_factory=lambda: defaultdict(list))
+    uuids: Dict[Node, List[Node]] = field(default_factory=lambda: defaultdict(list))
+    is_point_of: Dict[Node, List[Node]] = field(default_factory=lambda: defaultdict(list))
+    feeds: Dict[Node, List[Node]] = field(default_factory=lambda: defaultdict(list))
+    is_part_of: Dict[Node, List[Node]] = field(default_factory=lambda: defaultdict(list))
+    areas: List[Node] = field(default_factory=list)
+    area_value: Optional[float] = None
+    area_unit: Optional[str] = None
+    location: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    primary_function: Optional[str] = None
+    rows: Dict[str, List[Row]] = field(default_factory=dict)
+
+    @classmethod
+    def from_graph(cls, g: Graph) -> "BuildingIndex":
+        idx = cls()
+        area_nodes: List[Node] = []
+        values: Dict[Node, List[Node]] = defaultdict(list)
+        # blank-node valued building attributes: [ brick:value ... ] / [ brick:latitude ... ; brick:longitude ... ]
+        attribute_nodes: Dict[Node, List[Node]] = defaultdict(list)
+        latitudes: Dict[Node, List[Node]] = defaultdict(list)
+        longitudes: Dict[Node, List[Node]] = defaultdict(list)
+        maps = {
+            BRICK.hasUUID: idx.uuids,
+            BRICK.isPointOf: idx.is_point_of,
+            BRICK.feeds: idx.feeds,
+            BRICK.isPartOf: idx.is_part_of,
+            BRICK.value: values,
+            BRICK.latitude: latitudes,
+            BRICK.longitude: longitudes,
+        }
+        for s, p, o in g:
+            if p == RDF.type:
+                idx.types[s].append(o)
+                cls_str = str(o)
+                for suffix in CLASS_SUFFIXES:
+                    if cls_str.endswith(suffix):
+                        idx.by_class_suffix[suffix].append((s, o))
+            elif p == BRICK.hasArea:
+                area_nodes.append(o)
+            elif p in _BUILDING_ATTRIBUTES:
+                attribute_nodes[p].append(o)
+            else:
+                target = maps.get(p)
+                if target is not None:
+                    target[s].append(o)
+
+        idx.areas = [v for node in area_nodes for v in values.get(node, ())]
+        idx.rows = {
+            "area": sorted(((v,) for v in idx.areas), key=row_key),
+            "temperature_sensors_uuid": idx._typed_rows("Temperature_Sensor", idx.is_point_of),
+            "zones": sorted(
+                ((z, b) for z, classes in idx.types.items() if BRICK.Zone in classes
+                 for b in idx.is_part_of.get(z, ())),
+                key=row_key,
+            ),
+            "generic_sensors": idx._typed_rows("Sensor", idx.is_point_of),
+            "meters": idx._typed_rows("Meter", idx.feeds),
+        }
+        idx.area_value, idx.area_unit = parse_area(idx.rows["area"][0][0] if idx.rows["area"] else None)
+
+        def first(nodes, source):
+            found = sorted(str(v) for node in nodes for v in source.get(node, ()))
+            return found[0] if found else None
+
+        idx.location = first(attribute_nodes.get(BRICK.hasLocation, ()), values)
+        idx.primary_function = first(attribute_nodes.get(BRICK.buildingPrimaryFunction, ()), values)
+        coordinates = attribute_nodes.get(BRICK.hasCoordinates, ())
+        idx.latitude = _to_float(first(coordinates, latitudes))
+        idx.longitude = _to_float(first(coordinates, longitudes))
+        return idx
+
+    def _typed_rows(self, suffix: str, relation: Dict[Node, List[Node]]) -> List[Row]:
+        # mirrors: ?s a ?cls ; brick:hasUUID ?uuid . FILTER STRENDS(STR(?cls), suffix) ?s <relation> ?target
+        return sorted(
+            (
+                (s, uuid, c, target)
+                for s, c in self.by_class_suffix.get(suffix, ())
+                for uuid in self.uuids.get(s, ())
+                for target in relation.get(s, ())
+            ),
+            key=row_key,
+        )
+
+
+_indexes: "weakref.WeakKeyDictionary[Graph, BuildingIndex]" = weakref.WeakKeyDictionary()
+_indexes_lock = threading.Lock()
+
+
+def index_for(g: Graph) -> BuildingIndex:
+    """Return the index of `g`, building it on first use. The graph must not be mutated afterwards."""
+    with _indexes_lock:
+        idx = _indexes.get(g)
+    if idx is None:
+        idx = BuildingIndex.from_graph(g)
+        with _indexes_lock:
+            idx = _indexes.setdefault(g, idx)
+    return idx
@@ -1,120 +1,329 @@
 from __future__ import annotations
-from typing import Literal, Optional, Dict, Any
+from typing import Literal, Optional, Dict, Any, List, Callable, Iterable, Tuple
+from pathlib import Path
 from pydantic import BaseModel, Field
-#from functools import lru_cache
 from rdflib import Graph
 from langchain_core.tools import tool
 
+from brick_assistant.config import settings
+from brick_assistant.tools.graph_cache import BuildingGraphCache
+from brick_assistant.tools.result_cache import ResultCache
+from brick_assistant.tools.snapshot import load_building_graph
+from brick_assistant.tools.rdf_index import index_for, row_key
+from brick_assistant.tools.catalog import NUMERIC_FIELDS, BuildingCatalog
 
+
+import fnmatch
+import re
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from rdflib import Namespace
 from rdflib.plugins.sparql import prepareQuery
 
-_sparql_lock = threading.RLock()   # re-entrant lets ops call each other safely
+# Only the non thread-safe parts are serialized: the pyparsing-based SPARQL parser and
+# rdflib's lazy plugin loading. Evaluation of prepared queries over the cached (read-only)
+# building graphs runs without any lock, so sessions on different buildings run in parallel.
+_sparql_lock = threading.RLock()
+_sparql_ready = threading.Event()
 BRICK = Namespace("https://brickschema.org/schema/Brick#")
 
-# Compile queries once (parsing happens here; protect it)
-with _sparql_lock:
-    Q_AREA = prepareQuery("""
-        PREFIX brick: <https://brickschema.org/schema/Brick#>
-        SELECT ?area_value 
-        WHERE {
-          ?subject brick:hasArea ?value .
-          ?value brick:value ?area_value .
-        }
-    """)
-    Q_TEMP_SENSORS_UUID = prepareQuery("""
-        PREFIX rdf:   <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
-        PREFIX brick: <https://brickschema.org/schema/Brick#>
-        SELECT ?sensor ?uuid ?cls ?location 
-        WHERE {
-          ?sensor a ?cls ; brick:hasUUID ?uuid .
-          FILTER STRENDS(STR(?cls), "Temperature_Sensor")
-          ?sensor brick:isPointOf ?location .
-        }
-    """)
-    Q_ZONES = prepareQuery("""
-        PREFIX brick: <https://brickschema.org/schema/Brick#>
-        SELECT ?zone ?building 
-        WHERE {
-          ?zone a brick:Zone .
-          ?zone brick:isPartOf ?building .
-        }
-    """)
-    Q_GENERIC_SENSORS = prepareQuery("""
-        PREFIX brick: <https://brickschema.org/schema/Brick#>
-        SELECT ?sensor ?uuid ?cls ?location 
-        WHERE {
-          ?sensor a ?cls ; brick:hasUUID ?uuid .
-          FILTER STRENDS(STR(?cls), "Sensor")
-          ?sensor brick:isPointOf ?location .
-        }
-    """)
-    Q_METERS = prepareQuery("""
-        PREFIX brick: <https://brickschema.org/schema/Brick#>
-        SELECT ?meter ?uuid ?cls ?location
-        WHERE {
-          ?meter a ?cls ; brick:hasUUID ?uuid .
-          FILTER STRENDS(STR(?cls), "Meter")
-          ?meter brick:feeds ?location .
-        }
-    """)
+def prepare_query(text: str, **kwargs):
+    """Compile a SPARQL query; the parser is not thread-safe, so this is serialized."""
+    with _sparql_lock:
+        return prepareQuery(text, **kwargs)
+
+# Compile queries once, through the serialized parser
+Q_AREA = prepare_query("""
+    PREFIX brick: <https://brickschema.org/schema/Brick#>
+    SELECT ?area_value 
+    WHERE {
+      ?subject brick:hasArea ?value .
+      ?value brick:value ?area_value .
+    }
+""")
+Q_TEMP_SENSORS_UUID = prepare_query("""
+    PREFIX rdf:   <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
+    PREFIX brick: <https://brickschema.org/schema/Brick#>
+    SELECT ?sensor ?uuid ?cls ?location 
+    WHERE {
+      ?sensor a ?cls ; brick:hasUUID ?uuid .
+      FILTER STRENDS(STR(?cls), "Temperature_Sensor")
+      ?sensor brick:isPointOf ?location .
+    }
+""")
+Q_ZONES = prepare_query("""
+    PREFIX brick: <https://brickschema.org/schema/Brick#>
+    SELECT ?zone ?building 
+    WHERE {
+      ?zone a brick:Zone .
+      ?zone brick:isPartOf ?building .
+    }
+""")
+Q_GENERIC_SENSORS = prepare_query("""
+    PREFIX brick: <https://brickschema.org/schema/Brick#>
+    SELECT ?sensor ?uuid ?cls ?location 
+    WHERE {
+      ?sensor a ?cls ; brick:hasUUID ?uuid .
+      FILTER STRENDS(STR(?cls), "Sensor")
+      ?sensor brick:isPointOf ?location .
+    }
+""")
+Q_METERS = prepare_query("""
+    PREFIX brick: <https://brickschema.org/schema/Brick#>
+    SELECT ?meter ?uuid ?cls ?location
+    WHERE {
+      ?meter a ?cls ; brick:hasUUID ?uuid .
+      FILTER STRENDS(STR(?cls), "Meter")
+      ?meter brick:feeds ?location .
+    }
+""")
 
-def _safe_query(g: Graph, q, **kwargs):
-    # evaluation itself is generally fine, but keep the lock if you still see issues
+def _ensure_sparql_ready() -> None:
+    """Resolve rdflib's lazily loaded SPARQL processor/result plugins exactly once."""
+    if _sparql_ready.is_set():
+        return
     with _sparql_lock:
-        return g.query(q, **kwargs)
+        if not _sparql_ready.is_set():
+            list(Graph().query(Q_ZONES))
+            _sparql_ready.set()
+
+def _safe_query(g: Graph, q, **kwargs):
+    # Lock-free: `g` must not be mutated while queried (cached graphs are read-only).
+    _ensure_sparql_ready()
+    return g.query(q, **kwargs)
+
+QUERIES = {
+    "area": Q_AREA,
+    "temperature_sensors_uuid": Q_TEMP_SENSORS_UUID,
+    "zones": Q_ZONES,
+    "generic_sensors": Q_GENERIC_SENSORS,
+    "meters": Q_METERS,
+}
+
+class IndexMismatchError(RuntimeError):
+    pass
+
+def _select(g: Graph, operation: str) -> List[tuple]:
+    """
+    Result rows of a built-in operation, sorted canonically and in the SPARQL projection order.
+
+    settings.RDF_QUERY_MODE selects the backend: "index" answers from the precomputed
+    per-building entity index, "sparql" evaluates the query, "verify" does both and raises
+    IndexMismatchError if they disagree.
+    """
+    mode = settings.RDF_QUERY_MODE
+    if mode == "index":
+        return index_for(g).rows[operation]
+    if mode not in ("sparql", "verify"):
+        raise ValueError(f"Unknown RDF_QUERY_MODE '{mode}'")
+    rows = sorted((tuple(r) for r in _safe_query(g, QUERIES[operation])), key=row_key)
+    if mode == "verify":
+        indexed = index_for(g).rows[operation]
+        if rows != indexed:
+            raise IndexMismatchError(
+                f"Index and SPARQL disagree for '{operation}': {len(indexed)} vs {len(rows)} rows"
+            )
+    return rows
+
 # ---------- infra ----------
-#@lru_cache(maxsize=32)
+def ttl_path(building_name: str) -> Path:
+    return settings.TTL_FILES_PATH / f"bui_{building_name.upper()}.ttl"
+
+# Results of the per-building operations. The key holds the TTL content digest, so an
+# edited file never serves stale results (see result_key()); graph_cache also drops a
+# building's results when it reloads the changed file.
+result_cache = ResultCache(
+    max_entries=settings.RDF_RESULT_CACHE_MAX_ENTRIES,
+    max_bytes=settings.RDF_RESULT_CACHE_MAX_BYTES,
+)
+
+def result_key(args: "RDFToolkitArgs", digest: str) -> Tuple:
+    return (args.building_name, args.operation, args.location_filter, args.limit, settings.RDF_QUERY_MODE, digest)
+
+def invalidate_results(building_name: Optional[str] = None) -> int:
+    """Drop cached rdf_toolkit results of one building (or all). Returns the number of entries dropped."""
+    if building_name is None:
+        return result_cache.invalidate()
+    name = building_name.upper()
+    return result_cache.invalidate(lambda key: key[0].upper() == name)
+
+graph_cache = BuildingGraphCache(
+    loader=load_building_graph,
+    path_for=ttl_path,
+    max_entries=settings.GRAPH_CACHE_MAX_ENTRIES,
+    max_triples=settings.GRAPH_CACHE_MAX_TRIPLES,
+    # results of the old file version can no longer be served
+    on_reload=invalidate_results,
+)
+
+# Portfolio catalog over the same parsed graphs (and entity indexes) as the operations
+building_catalog = BuildingCatalog(graphs=graph_cache)
+
 def load_graph(building_name: str) -> Graph:
-    file_path = f"data/ttl_files/bui_{building_name.upper()}.ttl"
-    g = Graph()
-    g.parse(file_path, format="turtle")
-    return g
+    """Return the (shared, read-only) graph of a building from the process-wide cache."""
+    return graph_cache.get(building_name)
+
+def list_buildings() -> List[str]:
+    """Names of all buildings with a TTL file, sorted."""
+    return sorted(p.stem[len("bui_"):].upper() for p in settings.TTL_FILES_PATH.glob("bui_*.ttl"))
+
+def is_portfolio(building_name: str) -> bool:
+    """True if `building_name` names several buildings: a comma-separated list and/or glob patterns."""
+    return "," in building_name or any(c in building_name for c in "*?[")
+
+def resolve_buildings(building_name: str) -> List[str]:
+    """Expand a comma-separated list of building names and glob patterns (e.g. "*", "BCG*") into names."""
+    known = None
+    names: List[str] = []
+    for part in building_name.split(","):
+        part = part.strip().upper()
+        if not part:
+            continue
+        if any(c in part for c in "*?["):
+            if known is None:
+                known = list_buildings()
+            names.extend(fnmatch.filter(known, part))
+        else:
+            names.append(part)
+    return list(dict.fromkeys(names))
 
 class RDFToolkitArgs(BaseModel):
-    building_name: str = Field(..., description="Building short name, e.g. 'HQ1'")
+    building_name: str = Field(
+        ...,
+        description="Building short name, e.g. 'HQ1'. For several buildings at once pass a comma-separated "
+                    "list ('HQ1,HQ2') and/or glob patterns ('*' for all buildings, 'BCG*').",
+    )
     operation: Literal[
         "area",
         "temperature_sensors_uuid",
         "zones",
         "generic_sensors",
         "meters",
+        "catalog_top_k",
+        "catalog_range",
+        "catalog_group_by_location",
         # add future ops here
     ]
 
     location_filter: Optional[str] = None
     limit: Optional[int] = Field(50, ge=1, le=1000)
+    # catalog operations only
+    attribute: Optional[Literal[NUMERIC_FIELDS]] = Field(
+        None, description="Numeric catalog attribute for catalog_top_k / catalog_range"
+    )
+    order: Literal["desc", "asc"] = Field("desc", description="catalog_top_k: 'desc' = largest first")
+    min_value: Optional[float] = Field(None, description="catalog_range: inclusive lower bound")
+    max_value: Optional[float] = Field(None, description="catalog_range: inclusive upper bound")
 
 # ---------- strategies ----------
 def op_area(g, args):
-    rows = list(_safe_query(g, Q_AREA))
-    area = rows[0]["area_value"] if rows else None
+    rows = _select(g, "area")
+    area = rows[0][0] if rows else None
     return {"building": args.building_name, "area": area}
 
+def _location_matcher(location_filter: Optional[str]) -> Optional[Callable[[str], bool]]:
+    """Case-insensitive regex search; falls back to a plain substring when the filter is not a valid regex."""
+    if not location_filter:
+        return None
+    try:
+        pattern = re.compile(location_filter, re.IGNORECASE)
+    except re.error:
+        pattern = re.compile(re.escape(location_filter), re.IGNORECASE)
+    return lambda value: pattern.search(value) is not None
+
+def _filter_limit(rows: Iterable[tuple], args, filter_columns: Tuple[int, ...],
+                  to_item: Callable[[tuple], Dict[str, str]]) -> Tuple[List[Dict[str, str]], int]:
+    """
+    Apply `location_filter` to the given row columns and shape at most `limit` items.
+
+    Rows past the limit are only counted, never shaped, so the returned total is exact.
+    """
+    match = _location_matcher(args.location_filter)
+    limit = args.limit
+    items: List[Dict[str, str]] = []
+    total = 0
+    for row in rows:
+        if match is not None and not any(match(str(row[i])) for i in filter_columns):
+            continue
+        total += 1
+        if limit is None or len(items) < limit:
+            items.append(to_item(row))
+    return items, total
+
+def _listing(args, key: str, items: List[Dict[str, str]], total: int) -> Dict[str, Any]:
+    return {"building": args.building_name, key: items, "total": total, "truncated": total > len(items)}
+
+def _sensor_item(row):
+    sensor, uuid, cls, location = row
+    return {"sensor": str(sensor), "uuid": str(uuid), "class": str(cls), "location": str(location)}
+
 def op_temperature_sensors_uuid(g, args):
-    rows = _safe_query(g, Q_TEMP_SENSORS_UUID)
-    out = [{"sensor": str(r["sensor"]), "uuid": str(r["uuid"]),
-            "class": str(r["cls"]), "location": str(r["location"])} for r in rows]
-    return {"building": args.building_name, "sensors": out}
+    out, total = _filter_limit(_select(g, "temperature_sensors_uuid"), args, (3,), _sensor_item)
+    return _listing(args, "sensors", out, total)
 
 def op_zones(g, args):
-    rows = _safe_query(g, Q_ZONES)
-    zones = [{"zone": str(r["zone"]), "building": str(r["building"])} for r in rows]
-    return {"building": args.building_name, "zones": zones}
+    zones, total = _filter_limit(
+        _select(g, "zones"), args, (0, 1),
+        lambda row: {"zone": str(row[0]), "building": str(row[1])},
+    )
+    return _listing(args, "zones", zones, total)
 
 def op_generic_sensors(g, args):
-    rows = _safe_query(g, Q_GENERIC_SENSORS)
-    sensors = [{"sensor": str(r["sensor"]), "uuid": str(r["uuid"]),
-                "class": str(r["cls"]), "location": str(r["location"])} for r in rows]
-    return {"building": args.building_name, "sensors": sensors}
+    sensors, total = _filter_limit(_select(g, "generic_sensors"), args, (3,), _sensor_item)
+    return _listing(args, "sensors", sensors, total)
 
 def op_meters(g, args):
-    rows = _safe_query(g, Q_METERS)
-    meters = [{"meter": str(r["meter"]), "uuid": str(r["uuid"]),
-               "class": str(r["cls"]), "feeds": str(r["location"])} for r in rows]
-    return {"building": args.building_name, "meters": meters}
+    meters, total = _filter_limit(
+        _select(g, "meters"), args, (3,),
+        lambda row: {"meter": str(row[0]), "uuid": str(row[1]), "class": str(row[2]), "feeds": str(row[3])},
+    )
+    return _listing(args, "meters", meters, total)
+# ---------- catalog strategies (portfolio-wide, no graph needed) ----------
+def _catalog_scope(args):
+    """Buildings the catalog operation is restricted to, and the location matcher."""
+    catalog = building_catalog.refresh()
+    scope = set(resolve_buildings(args.building_name))
+    match = _location_matcher(args.location_filter)
+    if match is not None:
+        scope = {b for b in scope if b in catalog.rows and match(catalog.rows[b].location or "")}
+    return catalog, scope
+
+def _catalog_errors(catalog, scope):
+    """Buildings in scope that could not be loaded into the catalog."""
+    return {b: e for b, e in catalog.errors.items() if b in scope}
+
+def _require_attribute(args):
+    if args.attribute is None:
+        raise ValueError(f"'attribute' is required for {args.operation}, one of {list(NUMERIC_FIELDS)}")
+    return args.attribute
+
+def op_catalog_top_k(args):
+    attribute = _require_attribute(args)
+    catalog, scope = _catalog_scope(args)
+    rows = catalog.top_k(attribute, args.limit or 10, descending=args.order == "desc", scope=scope)
+    return {"operation": args.operation, "attribute": attribute, "order": args.order,
+            "buildings": [r.to_dict() for r in rows], "errors": _catalog_errors(catalog, scope)}
 
+def op_catalog_range(args):
+    attribute = _require_attribute(args)
+    catalog, scope = _catalog_scope(args)
+    rows = catalog.range(attribute, args.min_value, args.max_value, scope=scope)
+    items = [r.to_dict() for r in rows[:args.limit]]
+    return {"operation": args.operation, "attribute": attribute,
+            "min_value": args.min_value, "max_value": args.max_value,
+            "buildings": items, "total": len(rows), "truncated": len(rows) > len(items),
+            "errors": _catalog_errors(catalog, scope)}
+
+def op_catalog_group_by_location(args):
+    catalog, scope = _catalog_scope(args)
+    return {"operation": args.operation, "locations": catalog.group_by_location(scope=scope),
+            "errors": _catalog_errors(catalog, scope)}
+
+CATALOG_STRATEGIES = {
+    "catalog_top_k": op_catalog_top_k,
+    "catalog_range": op_catalog_range,
+    "catalog_group_by_location": op_catalog_group_by_location,
+}
 
 STRATEGIES = {
     "area": op_area,
@@ -130,6 +339,10 @@ def rdf_toolkit_tool(
     operation: str,
     location_filter: Optional[str] = None,
     limit: Optional[int] = 50,
+    attribute: Optional[str] = None,
+    order: str = "desc",
+    min_value: Optional[float] = None,
+    max_value: Optional[float] = None,
 ) -> Dict[str, Any]:
     """
     Unified RDF facade for querying a building's Brick graph. **Call this tool exactly once per turn** and
@@ -139,18 +352,33 @@ def rdf_toolkit_tool(
     - building_name (str): REQUIRED. The building identifier (e.g., "HQ1"). Use the value already present in
       conversation/state/metadata; do not invent or guess. If unknown, ask the user for a valid building **before**
       calling this tool.
+      PORTFOLIO MODE: to run the operation on several buildings in ONE call pass a comma-separated list
+      ("HQ1,HQ2") and/or glob patterns ("*" = every building, "BCG*"). Prefer this over one call per
+      building for comparisons ("which building has the smallest area?").
     - operation (enum str): REQUIRED. One of:
         • "area"                     → return building floor area (m²)
         • "zones"                    → list zones and their parent building
         • "temperature_sensors_uuid" → list temperature sensors with UUIDs and locations
         • "generic_sensors"          → list all sensors (any class ending with "Sensor")
         • "meters"                   → list meters (any class ending with "Meter") and what they feed
-    - location_filter (str, optional): A substring/regex-like hint the tool MAY use to filter by location
-      (e.g., "Floor_2", "AHU", "West"). If unsupported by an operation, it is ignored.
-    - limit (int, optional, default=50): A soft cap; the tool MAY truncate long result lists to this size.
+        • "catalog_top_k"            → portfolio ranking: the `limit` buildings with the largest ("desc")
+                                       or smallest ("asc") `attribute`
+        • "catalog_range"            → buildings whose `attribute` lies in [min_value, max_value]
+        • "catalog_group_by_location"→ buildings grouped by location, with count and total area
+      Catalog operations answer portfolio questions in ONE call. `building_name` restricts the scope
+      ("*" = all buildings) and `location_filter` matches the building location (e.g. "Milano").
+    - location_filter (str, optional): Case-insensitive regex (or plain substring) matched against the
+      location IRI of sensors, the `feeds` IRI of meters, and the zone/building IRIs of zones
+      (e.g., "Zone_3", "Shop", "Building"). Ignored by "area".
+    - attribute (enum str, catalog_top_k / catalog_range only): one of "area_m2", "sensor_count",
+      "temperature_sensor_count", "meter_count", "zone_count", "latitude", "longitude".
+    - order ("desc" | "asc", catalog_top_k only, default "desc").
+    - min_value / max_value (float, catalog_range only): inclusive bounds; omit one for an open range.
+    - limit (int, optional, default=50): Maximum number of list items returned. Lists report the number of
+      matching items in "total" and set "truncated": true when items were cut at the limit.
 
     BEHAVIOR
-    - The tool loads & caches the TTL graph for `building_name`. If the TTL is missing, it returns
+    - The tool loads & caches the TTL graph for `building_name` (reloaded only when the file changes). If the TTL is missing, it returns
       {"error": "..."} — do NOT retry with a different building unless the user provided it.
     - Choose exactly ONE operation per call. Do not include SPARQL in arguments.
     - Prefer returning compact, structured data. No prose. No markdown. Never multiline strings.
@@ -169,7 +397,9 @@ def rdf_toolkit_tool(
         "zones": [
           {"zone": "urn:...#Z04", "building": "urn:...#HQ1"},
           ...
-        ]
+        ],
+        "total": 12,         # matching items before `limit`
+        "truncated": false   # true if items were cut at `limit`
       }
 
     - operation="temperature_sensors_uuid"
@@ -183,7 +413,9 @@ def rdf_toolkit_tool(
             "location": "urn:...#Room_201"
           },
           ...
-        ]
+        ],
+        "total": 8,
+        "truncated": false
       }
 
     - operation="generic_sensors"
@@ -192,7 +424,9 @@ def rdf_toolkit_tool(
         "sensors": [
           {"sensor": "...", "uuid": "...", "class": "...#Humidity_Sensor", "location": "..."},
           ...
-        ]
+        ],
+        "total": 8,
+        "truncated": false
       }
 
     - operation="meters"
@@ -206,36 +440,110 @@ def rdf_toolkit_tool(
             "feeds":  "urn:...#Panel_A"
           },
           ...
+        ],
+        "total": 2,
+        "truncated": false
+      }
+
+    - portfolio mode (building_name="*", a list or a glob): one entry per building, keyed by building name,
+      each shaped as above without the "building" key; failures are reported per building
+      {
+        "operation": "area",
+        "buildings": {"HQ1": {"area": "1527 square meter"}, ...},
+        "errors": {"HQ9": "FileNotFoundError: ..."}
+      }
+
+    - operation="catalog_top_k" (attribute="area_m2", order="asc", limit=1)
+      {
+        "operation": "catalog_top_k", "attribute": "area_m2", "order": "asc",
+        "buildings": [
+          {"building": "BCGG", "location": "Roma Corso Francia", "latitude": 41.9, "longitude": 12.4,
+           "area_m2": 171.0, "area_unit": "m2", "sensor_count": 5, "temperature_sensor_count": 5,
+           "meter_count": 2, "zone_count": 5, "primary_function": "Commercial"}
         ]
       }
 
+    - operation="catalog_range": same rows as catalog_top_k, ascending by `attribute`, plus "total"/"truncated"
+    - catalog operations also return "errors": {building: message} for buildings that could not be loaded
+
+    - operation="catalog_group_by_location"
+      {
+        "operation": "catalog_group_by_location",
+        "locations": {"Milano Via Padova": {"buildings": ["BCGN"], "count": 1, "total_area_m2": 178.0}, ...}
+      }
+
     OPERATION SELECTION HINTS
     - If the user asks about temperature sensors or their UUIDs → "temperature_sensors_uuid".
     - If the user asks about “what sensors do we have?” (unspecified type) → "generic_sensors".
     - If the user asks about meters / submetering / what a meter feeds → "meters".
     - If the user asks about areas, floor area, GFA → "area".
     - If the user asks about zones, rooms, spaces → "zones".
+    - If the user asks to rank, compare, filter or aggregate buildings (largest, smallest, total area,
+      buildings above N m², how many buildings in a city) → a catalog operation with building_name="*".
 
     ERROR CONTRACT
     - On any failure, return {"error": "<type>: <message>"}; do not mix errors with partial lists.
+    - In portfolio mode a failing building only appears under "errors"; the others are still returned.
 
     NOTES
     - SPARQL prefixes are handled internally; callers should NOT pass SPARQL.
-    - `location_filter` and `limit` are best-effort; the tool may apply simple filtering/truncation.
+    - Use `location_filter` and a small `limit` to keep results compact; check "truncated" before
+      assuming a list is complete.
     """
-    g = load_graph(building_name)
     args = RDFToolkitArgs(
         building_name=building_name,
         operation=operation,
         location_filter=location_filter,
         limit=limit,
+        attribute=attribute,
+        order=order,
+        min_value=min_value,
+        max_value=max_value,
     )
-    fn = STRATEGIES.get(operation)
-    if not fn:
+    if operation in CATALOG_STRATEGIES:
+        try:
+            return CATALOG_STRATEGIES[operation](args)
+        except Exception as e:
+            return {"error": f"Catalog operation failed: {e.__class__.__name__}: {e}"}
+    if operation not in STRATEGIES:
         return {"error": f"Unknown operation '{operation}'"}
+    if is_portfolio(building_name):
+        return _run_portfolio(args)
+    return _run_single(args)
+
+def _run_single(args: RDFToolkitArgs) -> Dict[str, Any]:
     try:
-        result = fn(g, args)
-        # Optional: truncate for limit / apply simple filters here if needed
-        return result
+        entry = graph_cache.entry(args.building_name)
+    except FileNotFoundError:
+        return {"error": f"FileNotFoundError: no TTL file for building '{args.building_name}'"}
     except Exception as e:
-        return {"error": f"RDF operation failed: {e.__class__.__name__}: {e}"}
+        return {"error": f"RDF load failed: {e.__class__.__name__}: {e}"}
+
+    def compute() -> Dict[str, Any]:
+        try:
+            return STRATEGIES[args.operation](entry.graph, args)
+        except Exception as e:
+            return {"error": f"RDF operation failed: {e.__class__.__name__}: {e}"}
+
+    result = result_cache.get_or_compute(
+        result_key(args, entry.digest), compute, cacheable=lambda r: "error" not in r
+    )
+    return dict(result)
+
+def _run_portfolio(args: RDFToolkitArgs) -> Dict[str, Any]:
+    """Fan one operation out over several buildings on a thread pool and merge the results by building."""
+    buildings = resolve_buildings(args.building_name)
+    if not buildings:
+        return {"error": f"No building matches '{args.building_name}'"}
+    workers = max(1, min(settings.PORTFOLIO_MAX_WORKERS, len(buildings)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(
+            lambda b: _run_single(args.model_copy(update={"building_name": b})), buildings
+        ))
+    merged: Dict[str, Any] = {"operation": args.operation, "buildings": {}, "errors": {}}
+    for building, result in zip(buildings, results, strict=True):
+        if "error" in result:
+            merged["errors"][building] = result["error"]
+        else:
+            merged["buildings"][building] = {k: v for k, v in result.items() if k != "building"}
+    return merged
@@ -0,0 +1,107 @@
+from __future__ import annotations
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+import json
+import threading
+import time
+
+
+def result_size(value: Any) -> int:
+    """Approximate in-memory weight of a tool result: its compact JSON length in bytes."""
+    return len(json.dumps(value, default=str, separators=(",", ":")).encode("utf-8"))
+
+
+class ResultCache:
+    """
+    Bounded LRU memo of tool results.
+
+    Bounded both by number of entries and by the total size of the cached results
+    (see `result_size`); entries optionally expire `ttl_s` seconds after insertion.
+    Callers put the data version (e.g. the TTL file digest) in the key, so a changed
+    file simply stops matching and its old entries age out.
+
+    Returned values are shared between callers: treat them as read-only.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 16 * 1024 * 1024, ttl_s: Optional[float] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_s = ttl_s
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int, float]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    # ---------- public API ----------
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return (found, value) for `key`."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl_s is not None and time.monotonic() - entry[2] > self.ttl_s:
+                self._drop(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        size = result_size(value)
+        with self._lock:
+            self._drop(key)
+            if size > self.max_bytes:
+                return  # would evict everything else and still not fit
+            self._entries[key] = (value, size, time.monotonic())
+            self._total_bytes += size
+            while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any],
+                       cacheable: Callable[[Any], bool] = lambda value: True) -> Any:
+        """Return the cached value of `key`, or compute it and cache it when `cacheable(value)`."""
+        found, value = self.get(key)
+        if found:
+            return value
+        value = compute()
+        if cacheable(value):
+            self.put(key, value)
+        return value
+
+    def invalidate(self, predicate: Optional[Callable[[Hashable], bool]] = None) -> int:
+        """Drop the entries whose key matches `predicate` (all entries when None). Returns the number dropped."""
+        with self._lock:
+            keys = [k for k in self._entries if predicate is None or predicate(k)]
+            for key in keys:
+                self._drop(key)
+            return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    # ---------- internals ----------
+    def _drop(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry[1]
@@ -0,0 +1,128 @@
+"""
+Disk-backed cache of per-building schema summaries.
+
+Entries are keyed by the sha256 of the TTL file content (plus the summary budget), so a
+summary is recomputed only when the file actually changes and survives process restarts.
+
+Precompute summaries for every building with:
+
+    python -m brick_assistant.tools.schema_cache [--ttl-dir data/ttl_files] [--cache-dir data/schema_cache]
+"""
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+import argparse
+import json
+import os
+import sys
+import threading
+
+from brick_assistant.config import settings
+from brick_assistant.tools.graph_cache import file_digest
+from brick_assistant.tools.snapshot import load_building_graph
+
+# Bump when the summary layout changes so old entries are ignored.
+SUMMARY_FORMAT = 2
+
+
+class SchemaSummaryCache:
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: int = settings.SCHEMA_SUMMARY_MAX_BYTES):
+        self.cache_dir = Path(cache_dir or settings.SCHEMA_CACHE_PATH)
+        self.max_bytes = max_bytes
+        # (path, mtime_ns, size) -> digest, so unchanged files are not re-hashed on every lookup
+        self._digests: Dict[Tuple[str, int, int], str] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _digest(self, ttl_path: Path) -> str:
+        st = os.stat(ttl_path)
+        key = (str(ttl_path), st.st_mtime_ns, st.st_size)
+        with self._lock:
+            digest = self._digests.get(key)
+        if digest is None:
+            digest = file_digest(ttl_path)
+            with self._lock:
+                self._digests[key] = digest
+        return digest
+
+    def entry_path(self, digest: str) -> Path:
+        return self.cache_dir / f"{digest}.b{self.max_bytes}.v{SUMMARY_FORMAT}.json"
+
+    def get(self, ttl_path: Path, building: str) -> Dict[str, Any]:
+        """Return the schema summary of `ttl_path`, computing and persisting it on a miss."""
+        from brick_assistant.tools.tools import summarize_schema
+
+        entry = self.entry_path(self._digest(ttl_path))
+        try:
+            with open(entry, "r") as f:
+                summary = json.load(f)
+            with self._lock:
+                self.hits += 1
+            return summary
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+
+        summary = summarize_schema(load_building_graph(ttl_path), building.upper(), max_bytes=self.max_bytes)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        tmp = entry.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(summary, f, separators=(",", ":"))
+        os.replace(tmp, entry)
+        with self._lock:
+            self.misses += 1
+        return summary
+
+    def precompute(self, ttl_dir: Optional[Path] = None) -> Dict[Path, Optional[str]]:
+        """
+        Compute (or refresh) the summary of every `bui_*.ttl` file in `ttl_dir`.
+
+        Returns:
+            Dict[Path, Optional[str]]: TTL path -> None on success, or the error message.
+        """
+        ttl_dir = Path(ttl_dir or settings.TTL_FILES_PATH)
+        report: Dict[Path, Optional[str]] = {}
+        for ttl_path in sorted(ttl_dir.glob("bui_*.ttl")):
+            try:
+                self.get(ttl_path, ttl_path.stem[len("bui_"):])
+                report[ttl_path] = None
+            except Exception as e:
+                report[ttl_path] = f"{e.__class__.__name__}: {e}"
+        return report
+
+    def prune(self, ttl_dir: Optional[Path] = None) -> int:
+        """Delete entries that do not match a current TTL file in `ttl_dir` at this budget. Returns the number removed."""
+        ttl_dir = Path(ttl_dir or settings.TTL_FILES_PATH)
+        live = {self.entry_path(self._digest(p)).name for p in ttl_dir.glob("bui_*.ttl")}
+        removed = 0
+        for entry in self.cache_dir.glob("*.json"):
+            if entry.name not in live:
+                entry.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Precompute schema summaries for every building TTL file.")
+    parser.add_argument("--ttl-dir", type=Path, default=settings.TTL_FILES_PATH)
+    parser.add_argument("--cache-dir", type=Path, default=settings.SCHEMA_CACHE_PATH)
+    parser.add_argument("--max-bytes", type=int, default=settings.SCHEMA_SUMMARY_MAX_BYTES)
+    parser.add_argument("--prune", action="store_true", help="also delete entries not matching the current files and budget")
+    args = parser.parse_args(argv)
+
+    cache = SchemaSummaryCache(args.cache_dir, max_bytes=args.max_bytes)
+    report = cache.precompute(args.ttl_dir)
+    for ttl_path, error in report.items():
+        print(f"{ttl_path} {'ok' if error is None else 'FAILED: ' + error.splitlines()[0]}")
+    if args.prune:
+        print(f"pruned {cache.prune(args.ttl_dir)} stale entries")
+    if any(report.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+Typed timeseries aggregation tool for the common sensor questions.
+
+`sensor_stats(uuids, start, end, agg, bucket)` answers "average / min / max / total of
+these sensors over this window (per hour / day / ...)" with one parameterized, index-friendly
+statement (`uuid = ANY(:uuids) AND ts >= :start AND ts < :end ... GROUP BY uuid, bucket`)
+instead of LLM-authored SQL, and returns compact numeric results.
+
+The timeseries table and its columns come from settings.SENSOR_TABLE / SENSOR_COLUMNS
+(overridable through AgentConfig). PostgreSQL (and DuckDB) use date_trunc and an array
+parameter; SQLite, used as a local stand-in, uses strftime and an expanding IN list.
+"""
+from __future__ import annotations
+from datetime import datetime, timezone
+from typing import Annotated, Any, Dict, List, Literal, Optional, Tuple, Type
+import json
+
+from langchain_community.tools.sql_database.tool import BaseSQLDatabaseTool
+from langchain_core.callbacks import CallbackManagerForToolRun
+from langchain_core.tools import BaseTool
+from langgraph.prebuilt import InjectedState
+from pydantic import BaseModel, Field
+from sqlalchemy import bindparam, text
+
+from brick_assistant.config import settings
+from brick_assistant.tools.uuid_handles import expand_uuid_list
+
+AGGREGATES = {"avg": "AVG", "min": "MIN", "max": "MAX", "sum": "SUM", "count": "COUNT"}
+BUCKETS = ("none", "hour", "day", "week", "month")
+
+# bucket -> SQLite expression over the (ISO text) time column, `{ts}` is the quoted column
+_SQLITE_BUCKETS = {
+    "hour": "strftime('%Y-%m-%d %H:00:00', {ts})",
+    "day": "strftime('%Y-%m-%d', {ts})",
+    # weeks start on Monday, as date_trunc('week', ...) does
+    "week": "date({ts}, '-6 days', 'weekday 1')",
+    "month": "strftime('%Y-%m-01', {ts})",
+}
+
+
+class SensorStatsArgs(BaseModel):
+    uuids: List[str] = Field(
+        ..., description="UUIDs of the sensors/meters, as returned by rdf_toolkit, or UUID handles such as '@bcgw_temp'"
+    )
+    start: str = Field(..., description="Start of the window (inclusive), ISO 8601, e.g. '2024-05-01' or '2024-05-01T08:00:00'")
+    end: Optional[str] = Field(None, description="End of the window (exclusive), ISO 8601; omit for 'up to the latest reading'")
+    agg: Literal["avg", "min", "max", "sum", "count"] = Field("avg", description="Aggregate of the readings")
+    bucket: Literal["none", "hour", "day", "week", "month"] = Field(
+        "none", description="Time bucket: 'none' for one value per sensor over the whole window"
+    )
+    # UUID handles captured from rdf_toolkit results (graph state, not visible to the LLM)
+    uuid_sets: Annotated[Optional[Dict[str, List[str]]], InjectedState("uuid_sets")] = None
+
+
+def parse_time(value: str) -> datetime:
+    """ISO 8601 date/datetime; aware values are converted to naive UTC (the column stores UTC)."""
+    parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _quote(dialect, name: str) -> str:
+    # schema-qualified names ("public.readings") are quoted part by part
+    return ".".join(dialect.identifier_preparer.quote(part) for part in name.split("."))
+
+
+def build_statement(dialect, table: str, columns: Dict[str, str], agg: str, bucket: str, with_end: bool,
+                    max_rows: int):
+    """
+    Parameterized aggregation statement for `dialect` (a SQLAlchemy Dialect).
+
+    Bind parameters: uuids, start and (when `with_end`) end. Rows are (uuid, bucket, value, n),
+    bucket being NULL when `bucket` is 'none'.
+    """
+    if agg not in AGGREGATES:
+        raise ValueError(f"Unknown aggregate '{agg}'; expected one of {sorted(AGGREGATES)}")
+    if bucket not in BUCKETS:
+        raise ValueError(f"Unknown bucket '{bucket}'; expected one of {list(BUCKETS)}")
+    uuid_col = _quote(dialect, columns["uuid"])
+    ts_col = _quote(dialect, columns["time"])
+    value_col = _quote(dialect, columns["value"])
+    sqlite = dialect.name == "sqlite"
+
+    if bucket == "none":
+        bucket_expr = "NULL"
+    elif sqlite:
+        bucket_expr = _SQLITE_BUCKETS[bucket].format(ts=ts_col)
+    else:
+        bucket_expr = f"date_trunc('{bucket}', {ts_col})"
+    uuid_filter = f"{uuid_col} IN :uuids" if sqlite else f"{uuid_col} = ANY(:uuids)"
+    end_filter = f" AND {ts_col} < :end" if with_end else ""
+    group_by = f"{uuid_col}, {bucket_expr}" if bucket != "none" else uuid_col
+
+    stmt = text(
+        f"SELECT {uuid_col} AS uuid, {bucket_expr} AS bucket, {AGGREGATES[agg]}({value_col}) AS value, "
+        f"COUNT({value_col}) AS n "
+        f"FROM {_quote(dialect, table)} "
+        f"WHERE {uuid_filter} AND {ts_col} >= :start{end_filter} "
+        f"GROUP BY {group_by} "
+        f"ORDER BY {group_by} "
+        f"LIMIT {int(max_rows) + 1}"
+    )
+    if sqlite:
+        stmt = stmt.bindparams(bindparam("uuids", expanding=True))
+    return stmt
+
+
+def _bucket_label(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    return value
+
+
+def _number(value: Any, decimals: int) -> Any:
+    if value is None:
+        return None
+    value = float(value)
+    return int(value) if value.is_integer() else round(value, decimals)
+
+
+def summarize(rows: List[Tuple], uuids: List[str], agg: str, bucket: str, max_rows: int,
+              decimals: int = settings.SENSOR_STATS_DECIMALS) -> Dict[str, Any]:
+    """
+    Compact result: per UUID either [value, n] (bucket 'none') or a list of [bucket, value, n].
+
+    UUIDs without readings in the window are listed under 'missing'; 'truncated' is set when
+    more than `max_rows` rows matched.
+    """
+    truncated = len(rows) > max_rows
+    series: Dict[str, Any] = {}
+    for uuid, bucket_value, value, n in rows[:max_rows]:
+        point = [_number(value, decimals), int(n)]
+        if bucket == "none":
+            series[str(uuid)] = point
+        else:
+            series.setdefault(str(uuid), []).append([_bucket_label(bucket_value)] + point)
+    result: Dict[str, Any] = {
+        "agg": agg,
+        "bucket": bucket,
+        "columns": ["value", "n"] if bucket == "none" else ["bucket", "value", "n"],
+        "series": series,
+    }
+    missing = [u for u in uuids if u not in series]
+    if missing:
+        result["missing"] = missing
+    if truncated:
+        result["truncated"] = True
+    return result
+
+
+class SensorStatsTool(BaseSQLDatabaseTool, BaseTool):
+    """Aggregated sensor readings through one parameterized statement (see module docstring)."""
+
+    name: str = "sensor_stats"
+    description: str = (
+        "Aggregate sensor/meter readings over a time window: average, min, max, sum or count of the "
+        "values of the given UUIDs between start (inclusive) and end (exclusive), either one value per "
+        "UUID (bucket 'none') or per hour/day/week/month. Prefer it over writing SQL for these questions. "
+        "UUID handles ('@bcgw_temp') can be passed instead of the UUIDs they stand for. "
+        "Returns compact JSON: series per UUID, 'n' = number of readings, 'missing' = UUIDs without data."
+    )
+    args_schema: Type[BaseModel] = SensorStatsArgs
+
+    table: str = settings.SENSOR_TABLE
+    columns: Dict[str, str] = Field(default_factory=lambda: dict(settings.SENSOR_COLUMNS))
+    max_uuids: int = settings.SENSOR_STATS_MAX_UUIDS
+    max_rows: int = settings.SENSOR_STATS_MAX_ROWS
+
+    def query(self, uuids: List[str], start: str, end: Optional[str] = None, agg: str = "avg",
+              bucket: str = "none") -> Dict[str, Any]:
+        """Run the aggregation and return the summarized result; raises on invalid arguments or database errors."""
+        uuids = list(dict.fromkeys(u.strip() for u in uuids if u and u.strip()))
+        if not uuids:
+            raise ValueError("No UUIDs given")
+        if len(uuids) > self.max_uuids:
+            raise ValueError(f"Too many UUIDs ({len(uuids)}); at most {self.max_uuids} per call")
+        start_dt = parse_time(start)
+        end_dt = parse_time(end) if end else None
+        if end_dt is not None and end_dt <= start_dt:
+            raise ValueError(f"end ({end}) must be after start ({start})")
+
+        engine = self.db._engine
+        dialect = engine.dialect
+        stmt = build_statement(dialect, self.table, self.columns, agg, bucket, end_dt is not None, self.max_rows)
+        params: Dict[str, Any] = {"uuids": uuids, "start": start_dt}
+        if end_dt is not None:
+            params["end"] = end_dt
+        if dialect.name == "sqlite":
+            # SQLite stores timestamps as ISO text; compare in the same format
+            params = {k: v.isoformat(sep=" ") if isinstance(v, datetime) else v for k, v in params.items()}
+        with engine.connect() as connection:
+            rows = [tuple(r) for r in connection.execute(stmt, params).fetchall()]
+        return summarize(rows, uuids, agg, bucket, self.max_rows)
+
+    def _run(self, uuids: List[str], start: str, end: Optional[str] = None, agg: str = "avg", bucket: str = "none",
+             uuid_sets: Optional[Dict[str, List[str]]] = None,
+             run_manager: Optional[CallbackManagerForToolRun] = None) -> str:
+        try:
+            result = self.query(expand_uuid_list(uuids, uuid_sets), start, end=end, agg=agg, bucket=bucket)
+        except Exception as e:
+            return f"Error: {e}"
+        return json.dumps(result, ensure_ascii=False, separators=(",", ":"))
@@ -0,0 +1,199 @@
+"""
+Precompiled binary snapshots of building TTL files.
+
+A snapshot stores the graph as an interned term table plus a flat array of integer
+triples, so loading it skips rdflib's Turtle parser entirely. Layout (little-endian):
+
+    magic "BRKSNAP1" | n_terms u32 | n_triples u32 | table_len u32 | <table: JSON> | pad to 4 | triples u32[n_triples * 3]
+
+The table is a JSON object {"namespaces": {prefix: uri}, "terms": [[kind, value, datatype, lang], ...]}
+with kind 0 = URIRef, 1 = BNode, 2 = Literal. The triple array is read straight from
+a memory map.
+
+Compile all buildings with:
+
+    python -m brick_assistant.tools.snapshot [--ttl-dir data/ttl_files] [--out-dir data/snapshots]
+"""
+from __future__ import annotations
+from pathlib import Path
+from typing import Dict, List, Optional
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from rdflib import BNode, Graph, Literal, URIRef
+
+from brick_assistant.config import settings
+
+MAGIC = b"BRKSNAP1"
+_HEADER = struct.Struct("<8sIII")
+_URI, _BNODE, _LITERAL = 0, 1, 2
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+def snapshot_path_for(ttl_path: Path, snapshot_dir: Optional[Path] = None) -> Path:
+    """Return where the snapshot of `ttl_path` lives (e.g. bui_BCGW.ttl -> data/snapshots/bui_BCGW.snap)."""
+    snapshot_dir = settings.SNAPSHOT_FILES_PATH if snapshot_dir is None else Path(snapshot_dir)
+    return snapshot_dir / f"{Path(ttl_path).stem}.snap"
+
+
+# ---------- encoding ----------
+def _encode_term(term) -> List:
+    if isinstance(term, Literal):
+        return [_LITERAL, str(term), str(term.datatype) if term.datatype else None, term.language]
+    if isinstance(term, BNode):
+        return [_BNODE, str(term), None, None]
+    return [_URI, str(term), None, None]
+
+
+def _decode_term(kind: int, value: str, datatype: Optional[str], lang: Optional[str]):
+    if kind == _LITERAL:
+        return Literal(value, lang=lang, datatype=URIRef(datatype) if datatype else None)
+    if kind == _BNODE:
+        return BNode(value)
+    return URIRef(value)
+
+
+def write_snapshot(g: Graph, out_path: Path) -> Path:
+    """Serialize a graph into the snapshot format, atomically replacing `out_path`."""
+    index: Dict = {}
+    terms: List[List] = []
+    triples = array("I")
+    for triple in g:
+        for term in triple:
+            i = index.get(term)
+            if i is None:
+                i = index[term] = len(terms)
+                terms.append(_encode_term(term))
+            triples.append(i)
+
+    table = json.dumps(
+        {"namespaces": {p: str(ns) for p, ns in g.namespaces()}, "terms": terms},
+        separators=(",", ":"),
+    ).encode("utf-8")
+    if sys.byteorder != "little":
+        triples.byteswap()
+
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = out_path.with_suffix(out_path.suffix + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, len(terms), len(triples) // 3, len(table)))
+        f.write(table)
+        f.write(b"\0" * (-(_HEADER.size + len(table)) % 4))
+        f.write(triples.tobytes())
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+def compile_snapshot(ttl_path: Path, out_path: Optional[Path] = None) -> Path:
+    """Parse a TTL file once and write its snapshot."""
+    g = Graph()
+    g.parse(ttl_path, format="turtle")
+    return write_snapshot(g, out_path or snapshot_path_for(ttl_path))
+
+
+def compile_all(ttl_dir: Optional[Path] = None, out_dir: Optional[Path] = None) -> Dict[Path, Optional[str]]:
+    """
+    Compile a snapshot for every `bui_*.ttl` file in `ttl_dir`.
+
+    Returns:
+        Dict[Path, Optional[str]]: TTL path -> None on success, or the error message.
+    """
+    ttl_dir = settings.TTL_FILES_PATH if ttl_dir is None else Path(ttl_dir)
+    report: Dict[Path, Optional[str]] = {}
+    for ttl_path in sorted(ttl_dir.glob("bui_*.ttl")):
+        try:
+            compile_snapshot(ttl_path, snapshot_path_for(ttl_path, out_dir))
+            report[ttl_path] = None
+        except Exception as e:
+            report[ttl_path] = f"{e.__class__.__name__}: {e}"
+    return report
+
+
+# ---------- decoding ----------
+def load_snapshot(path: Path) -> Graph:
+    """Load a snapshot file into a fresh rdflib Graph."""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if len(mm) < _HEADER.size:
+            raise SnapshotError(f"Truncated snapshot: {path}")
+        magic, n_terms, n_triples, table_len = _HEADER.unpack_from(mm, 0)
+        if magic != MAGIC:
+            raise SnapshotError(f"Not a snapshot file: {path}")
+        table_end = _HEADER.size + table_len
+        offset = table_end + (-table_end % 4)
+        if offset + n_triples * 12 > len(mm):
+            raise SnapshotError(f"Truncated snapshot: {path}")
+
+        table = json.loads(bytes(mm[_HEADER.size:table_end]))
+        terms = [_decode_term(*t) for t in table["terms"]]
+        if len(terms) != n_terms:
+            raise SnapshotError(f"Corrupt term table: {path}")
+
+        g = Graph()
+        for prefix, uri in table["namespaces"].items():
+            g.bind(prefix, uri, override=True, replace=True)
+
+        view = memoryview(mm)[offset:offset + n_triples * 12]
+        if sys.byteorder == "little":
+            ids = view.cast("I")
+        else:
+            ids = array("I", view)
+            ids.byteswap()
+        try:
+            g.addN(
+                (terms[ids[i]], terms[ids[i + 1]], terms[ids[i + 2]], g)
+                for i in range(0, n_triples * 3, 3)
+            )
+        finally:
+            # release the buffer before the mmap closes
+            if isinstance(ids, memoryview):
+                ids.release()
+            view.release()
+    return g
+
+
+def load_building_graph(ttl_path: Path, snapshot_dir: Optional[Path] = None) -> Graph:
+    """
+    Load a building graph, preferring its snapshot when it is at least as fresh as the TTL.
+
+    Falls back to parsing the Turtle file when there is no snapshot, when it is stale,
+    or when it cannot be read.
+    """
+    ttl_path = Path(ttl_path)
+    ttl_mtime = os.stat(ttl_path).st_mtime_ns  # raises FileNotFoundError for unknown buildings
+    snap_path = snapshot_path_for(ttl_path, snapshot_dir)
+    try:
+        if os.stat(snap_path).st_mtime_ns >= ttl_mtime:
+            return load_snapshot(snap_path)
+    except (OSError, SnapshotError, ValueError, KeyError, IndexError):
+        pass
+    g = Graph()
+    g.parse(ttl_path, format="turtle")
+    return g
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compile building TTL files into binary snapshots.")
+    parser.add_argument("--ttl-dir", type=Path, default=settings.TTL_FILES_PATH)
+    parser.add_argument("--out-dir", type=Path, default=settings.SNAPSHOT_FILES_PATH)
+    args = parser.parse_args(argv)
+    report = compile_all(args.ttl_dir, args.out_dir)
+    for ttl_path, error in report.items():
+        if error is None:
+            print(f"{ttl_path} -> {snapshot_path_for(ttl_path, args.out_dir)}")
+        else:
+            print(f"{ttl_path} FAILED: {error.splitlines()[0]}")
+    if any(report.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
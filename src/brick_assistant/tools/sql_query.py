@@ -0,0 +1,163 @@
+"""
+Cached replacement for SQLDatabaseToolkit's `sql_db_query` tool.
+
+Results are memoized by normalized SQL text (comments stripped, whitespace collapsed,
+unquoted text lower-cased). Queries with a relative time window (NOW(), CURRENT_DATE,
+INTERVAL, ...) also carry a time bucket in their key, so "last week" results are reused
+only within the same bucket and naturally roll over.
+"""
+from __future__ import annotations
+from typing import Annotated, Any, Callable, Dict, List, Optional, Tuple
+import re
+import time
+
+from langchain_community.tools.sql_database.tool import QuerySQLDatabaseTool
+from langchain_core.callbacks import CallbackManagerForToolRun
+from langgraph.prebuilt import InjectedState
+from pydantic import BaseModel, Field
+
+from brick_assistant.config import settings
+from brick_assistant.tools.result_cache import ResultCache
+from brick_assistant.tools.sql_stream import stream_query_no_throw
+from brick_assistant.tools.sql_validator import DENIED_FUNCTIONS, WRITE_KEYWORDS, SQLParseError, tokenize
+from brick_assistant.tools.uuid_handles import expand_handles
+
+# string literal | quoted identifier | line comment | block comment | anything else
+_SQL_TOKEN_RE = re.compile(r"('(?:[^']|'')*')|(\"(?:[^\"]|\"\")*\")|(--[^\n]*)|(/\*.*?\*/)|([^'\"/-]+|[/-])", re.S)
+_RELATIVE_TIME_RE = re.compile(
+    r"\b(now|current_date|current_time|current_timestamp|localtime|localtimestamp|interval|"
+    r"sysdate|getdate|date_trunc)\b|'now'",
+    re.I,
+)
+
+
+def normalize_sql(query: str) -> str:
+    """Canonical form of a query: no comments, single spaces, lower-case outside quotes, no trailing ';'."""
+    parts = []
+    for literal, identifier, _line_comment, _block_comment, other in _SQL_TOKEN_RE.findall(query):
+        if literal or identifier:
+            parts.append(literal or identifier)
+        elif other:
+            parts.append(other.lower())
+        else:
+            parts.append(" ")
+    text = re.sub(r"\s+", " ", "".join(parts)).strip()
+    return text.rstrip(";").strip()
+
+
+def is_read_only(query: str) -> bool:
+    """True for a SELECT / WITH query without write keywords or side-effect functions anywhere in it."""
+    try:
+        tokens = [t.upper for t in tokenize(query) if t.kind != "ws"]
+    except SQLParseError:
+        return False
+    return bool(tokens) and tokens[0] in ("SELECT", "WITH") and not WRITE_KEYWORDS.union(DENIED_FUNCTIONS).intersection(tokens)
+
+
+def is_time_relative(normalized_query: str) -> bool:
+    """True if the query result depends on the current time."""
+    # string literals other than 'now' cannot make a query relative
+    unquoted = re.sub(r"'(?:[^']|'')*'", lambda m: m.group(0) if m.group(0).lower() == "'now'" else "''", normalized_query)
+    return bool(_RELATIVE_TIME_RE.search(unquoted))
+
+
+class SQLResultCache:
+    """
+    Time-bucketed result cache for read-only SQL queries.
+
+    Args:
+        ttl_s: Maximum age of any entry.
+        bucket_s: Width of the time bucket added to the key of time-relative queries.
+        max_entries / max_bytes: LRU bounds (see ResultCache).
+        clock: Time source, injectable for tests.
+    """
+
+    def __init__(self, ttl_s: float = settings.SQL_CACHE_TTL_S, bucket_s: float = settings.SQL_CACHE_BUCKET_S,
+                 max_entries: int = settings.SQL_CACHE_MAX_ENTRIES, max_bytes: int = settings.SQL_CACHE_MAX_BYTES,
+                 clock: Callable[[], float] = time.time):
+        self.bucket_s = bucket_s
+        self._clock = clock
+        self._results = ResultCache(max_entries=max_entries, max_bytes=max_bytes, ttl_s=ttl_s)
+
+    def key(self, database: str, query: str, parameters: Optional[Dict[str, Any]] = None) -> Optional[Tuple]:
+        """Cache key of `query` on `database`, or None when the query must not be cached (not read-only)."""
+        if not is_read_only(query):
+            return None
+        normalized = normalize_sql(query)
+        bucket = int(self._clock() // self.bucket_s) if is_time_relative(normalized) else None
+        return (database, normalized, bucket, tuple(sorted((parameters or {}).items())))
+
+    def run(self, database: str, query: str, execute: Callable[[str], Any],
+            parameters: Optional[Dict[str, Any]] = None) -> Any:
+        """Return the cached result of `query` (bound to `parameters`), or run `execute(query)` and cache successful results."""
+        key = self.key(database, query, parameters)
+        if key is None:
+            return execute(query)
+        return self._results.get_or_compute(
+            key, lambda: execute(query),
+            cacheable=lambda r: not (isinstance(r, str) and r.startswith("Error:")),
+        )
+
+    def invalidate(self, contains: Optional[str] = None, database: Optional[str] = None) -> int:
+        """
+        Drop cached results.
+
+        Args:
+            contains: Only queries whose normalized text contains this (e.g. a table name).
+            database: Only results of this database.
+
+        Returns:
+            int: Number of entries dropped.
+        """
+        needle = normalize_sql(contains) if contains else None
+        return self._results.invalidate(
+            lambda key: (database is None or key[0] == database) and (needle is None or needle in key[1])
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return self._results.stats()
+
+
+class SQLQueryInput(BaseModel):
+    query: str = Field(..., description="A detailed and correct SQL query.")
+    # UUID handles captured from rdf_toolkit results (graph state, not visible to the LLM)
+    uuid_sets: Annotated[Optional[Dict[str, List[str]]], InjectedState("uuid_sets")] = None
+
+
+class SQLQueryTool(QuerySQLDatabaseTool):
+    """
+    `sql_db_query` with an optional SQLResultCache in front of the database.
+
+    With `streaming`, queries run on a server-side cursor and return a bounded JSON summary
+    (first rows, row count, per-column stats, truncated flag; see tools/sql_stream.py)
+    instead of the full result. UUID handles (`uuid IN (@bcgw_temp)`) are expanded into
+    bound parameters from the graph state.
+    """
+
+    args_schema: type[BaseModel] = SQLQueryInput
+
+    cache: Optional[SQLResultCache] = None
+    streaming: bool = False
+    stream_max_rows: int = settings.SQL_STREAM_MAX_ROWS
+    stream_max_bytes: int = settings.SQL_STREAM_MAX_BYTES
+    stream_sample_rows: int = settings.SQL_STREAM_SAMPLE_ROWS
+
+    def _execute(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> Any:
+        if not self.streaming:
+            return self.db.run_no_throw(query, parameters=parameters)
+        return stream_query_no_throw(
+            self.db, query, parameters=parameters,
+            max_rows=self.stream_max_rows, max_bytes=self.stream_max_bytes, sample_rows=self.stream_sample_rows,
+        )
+
+    def _run(self, query: str, uuid_sets: Optional[Dict[str, List[str]]] = None,
+             run_manager: Optional[CallbackManagerForToolRun] = None) -> Any:
+        try:
+            query, parameters = expand_handles(query, uuid_sets)
+        except ValueError as e:
+            return f"Error: {e}"
+        if self.cache is None:
+            return self._execute(query, parameters)
+        # LazySQLDatabase knows its identity without connecting, so cache hits never open a connection
+        database = getattr(self.db, "database_key", None) or self.db._engine.url.render_as_string(hide_password=True)
+        return self.cache.run(database, query, lambda q: self._execute(q, parameters), parameters=parameters)
@@ -0,0 +1,110 @@
+"""
+Cached SQL schema introspection for the list_tables / get_schema nodes.
+
+`SchemaCatalog` reflects table names and per-table DDL (with sample rows) once and
+serves them from memory until the TTL expires or `refresh()` is called. The cached
+`sql_db_list_tables` / `sql_db_schema` tools use it, and `inject_schema` (see
+tools/functions.py) uses it to hand the timeseries table schema to generate_query
+without the call_get_schema LLM hop.
+"""
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import threading
+import time
+
+from langchain_community.tools.sql_database.tool import InfoSQLDatabaseTool, ListSQLDatabaseTool
+from langchain_community.utilities.sql_database import SQLDatabase
+from langchain_core.callbacks import CallbackManagerForToolRun
+
+from brick_assistant.config import settings
+
+
+class SchemaCatalog:
+    """
+    Per-process cache of a database's table names and table info.
+
+    Nothing is reflected until the first lookup, so creating a catalog opens no connection.
+    Only successful reflections are cached.
+    """
+
+    def __init__(self, db: SQLDatabase, ttl_s: Optional[float] = settings.SQL_SCHEMA_TTL_S):
+        self.db = db
+        self.ttl_s = ttl_s
+        self._lock = threading.Lock()
+        self._tables: Optional[Tuple[float, List[str]]] = None
+        self._info: Dict[str, Tuple[float, str]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    def _fresh(self, loaded_at: float) -> bool:
+        return self.ttl_s is None or time.monotonic() - loaded_at <= self.ttl_s
+
+    def table_names(self) -> List[str]:
+        with self._lock:
+            if self._tables is not None and self._fresh(self._tables[0]):
+                self.hits += 1
+                return list(self._tables[1])
+        names = sorted(self.db.get_usable_table_names())
+        with self._lock:
+            self.misses += 1
+            self._tables = (time.monotonic(), names)
+        return list(names)
+
+    def table_info(self, table_names: Sequence[str]) -> str:
+        """DDL and sample rows of `table_names`, in the format of SQLDatabase.get_table_info."""
+        blocks = []
+        for table in table_names:
+            with self._lock:
+                cached = self._info.get(table)
+                if cached is not None and self._fresh(cached[0]):
+                    self.hits += 1
+                    blocks.append(cached[1])
+                    continue
+            info = self.db.get_table_info([table])  # raises ValueError for unknown tables
+            with self._lock:
+                self.misses += 1
+                self._info[table] = (time.monotonic(), info)
+            blocks.append(info)
+        return "\n\n".join(blocks)
+
+    def table_info_no_throw(self, table_names: Sequence[str]) -> str:
+        try:
+            return self.table_info(table_names)
+        except ValueError as e:
+            return f"Error: {e}"
+
+    def refresh(self) -> None:
+        """Forget everything; the next lookups reflect the database again."""
+        with self._lock:
+            self._tables = None
+            self._info.clear()
+            self.refreshes += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "tables_cached": self._tables is not None,
+                "table_infos": len(self._info),
+                "hits": self.hits,
+                "misses": self.misses,
+                "refreshes": self.refreshes,
+            }
+
+
+class CachedListTablesTool(ListSQLDatabaseTool):
+    """`sql_db_list_tables` served from a SchemaCatalog."""
+
+    catalog: SchemaCatalog
+
+    def _run(self, tool_input: str = "", run_manager: Optional[CallbackManagerForToolRun] = None) -> str:
+        return ", ".join(self.catalog.table_names())
+
+
+class CachedTableInfoTool(InfoSQLDatabaseTool):
+    """`sql_db_schema` served from a SchemaCatalog."""
+
+    catalog: SchemaCatalog
+
+    def _run(self, table_names: str, run_manager: Optional[CallbackManagerForToolRun] = None) -> str:
+        return self.catalog.table_info_no_throw([t.strip() for t in table_names.split(",") if t.strip()])
@@ -0,0 +1,153 @@
+"""
+Streaming execution of sql_db_query with bounded memory and output.
+
+`stream_query` runs the query on a server-side cursor (`stream_results`; SQLite steps its
+cursor incrementally anyway), consumes rows in batches until a row or byte cap is reached,
+and keeps only running aggregates plus the first rows. The result is a compact summary:
+
+    {"columns": [...], "rows": [first N rows], "row_count": n, "truncated": bool,
+     "stats": {column: {"count", "min", "max", "mean"}}}
+
+`stats` is only included when not every row is shown; mean is computed for numeric columns,
+min/max for numeric and date/time columns.
+"""
+from __future__ import annotations
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence
+import json
+
+from langchain_community.utilities.sql_database import SQLDatabase
+from sqlalchemy import text
+
+from brick_assistant.config import settings
+
+_MAX_STRING_LENGTH = 300  # as SQLDatabase.run truncates long values
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return f"<{len(bytes(value))} bytes>"
+    if isinstance(value, str) and len(value) > _MAX_STRING_LENGTH:
+        return value[:_MAX_STRING_LENGTH] + "..."
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)[:_MAX_STRING_LENGTH]
+
+
+class ColumnStats:
+    """Running count / min / max / mean of one column."""
+
+    __slots__ = ("count", "min", "max", "total", "numeric")
+
+    def __init__(self):
+        self.count = 0
+        self.min = None
+        self.max = None
+        self.total = 0.0
+        self.numeric = True
+
+    def add(self, value: Any) -> None:
+        if value is None:
+            return
+        self.count += 1
+        is_number = isinstance(value, (int, float, Decimal)) and not isinstance(value, bool)
+        if not is_number:
+            self.numeric = False
+        if not (is_number or isinstance(value, (datetime, date, time))):
+            return
+        try:
+            if self.min is None or value < self.min:
+                self.min = value
+            if self.max is None or value > self.max:
+                self.max = value
+        except TypeError:  # mixed types in one column
+            self.min = self.max = None
+        if self.numeric:
+            self.total += float(value)
+
+    def summary(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {"count": self.count}
+        if self.min is not None:
+            out["min"] = _json_value(self.min)
+            out["max"] = _json_value(self.max)
+        if self.numeric and self.count:
+            out["mean"] = round(self.total / self.count, 6)
+        return out
+
+
+class ResultSummary:
+    """Accumulates a streamed result: the first `sample_rows` rows and per-column statistics."""
+
+    def __init__(self, columns: Sequence[str], sample_rows: int = settings.SQL_STREAM_SAMPLE_ROWS):
+        self.columns = list(columns)
+        self.sample_rows = sample_rows
+        self.rows: List[List[Any]] = []
+        self.row_count = 0
+        self.bytes = 0
+        self.truncated = False
+        self._stats = [ColumnStats() for _ in self.columns]
+
+    def add(self, row: Sequence[Any]) -> None:
+        self.row_count += 1
+        self.bytes += len(str(tuple(row)))
+        if len(self.rows) < self.sample_rows:
+            self.rows.append([_json_value(v) for v in row])
+        for stats, value in zip(self._stats, row, strict=True):
+            stats.add(value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {
+            "columns": self.columns,
+            "rows": self.rows,
+            "row_count": self.row_count,
+            "truncated": self.truncated,
+        }
+        if self.row_count > len(self.rows):
+            out["stats"] = {name: s.summary() for name, s in zip(self.columns, self._stats, strict=True) if s.count}
+        return out
+
+
+def stream_query(db: SQLDatabase, query: str, max_rows: int = settings.SQL_STREAM_MAX_ROWS,
+                 max_bytes: int = settings.SQL_STREAM_MAX_BYTES, sample_rows: int = settings.SQL_STREAM_SAMPLE_ROWS,
+                 fetch_size: int = settings.SQL_STREAM_FETCH_SIZE,
+                 parameters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Run `query` (with bound `parameters`) on a server-side cursor and summarize it without
+    materializing the result.
+
+    Streaming stops after `max_rows` rows or `max_bytes` of row text, setting 'truncated'.
+    Statements that return no rows give an empty summary.
+    """
+    with db._engine.connect() as connection:
+        streaming = connection.execution_options(stream_results=True, max_row_buffer=fetch_size)
+        result = streaming.execute(text(query), parameters or {})
+        try:
+            if not result.returns_rows:
+                return ResultSummary([], sample_rows).to_dict()
+            summary = ResultSummary(list(result.keys()), sample_rows)
+            for batch in result.partitions(fetch_size):
+                for row in batch:
+                    if summary.row_count >= max_rows or summary.bytes >= max_bytes:
+                        summary.truncated = True
+                        break
+                    summary.add(row)
+                if summary.truncated:
+                    break
+        finally:
+            # closes the server-side cursor; the rest of the result is never fetched
+            result.close()
+    return summary.to_dict()
+
+
+def stream_query_no_throw(db: SQLDatabase, query: str, **kwargs: Any) -> str:
+    """`stream_query` as compact JSON, or "Error: ..." like SQLDatabase.run_no_throw."""
+    try:
+        summary = stream_query(db, query, **kwargs)
+    except Exception as e:
+        return f"Error: {e}"
+    return json.dumps(summary, ensure_ascii=False, separators=(",", ":"))
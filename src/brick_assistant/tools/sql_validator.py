@@ -0,0 +1,239 @@
+"""
+Local static validator / rewriter for the queries of generate_query.
+
+It replaces the check_query LLM round trip with a tokenizer-based pass covering the same
+rule classes as CHECK_QUERY_SYSTEM_PROMPT, plus deterministic read-only enforcement:
+
+- errors (query rejected, sent back to generate_query): anything but a single SELECT / WITH ...
+  SELECT statement, write or DDL keywords, side-effect functions, `SELECT *`, NOT IN over a
+  subquery or a list containing NULL
+- rewrites: `= NULL` / `<> NULL` -> `IS [NOT] NULL`, missing LIMIT -> `LIMIT top_k`,
+  LIMIT above `max_rows` -> `LIMIT max_rows`
+- warnings (recorded only): UNION without ALL, BETWEEN (inclusive on both ends)
+
+Type mismatches, wrong join columns and function arities need the schema; those surface as
+database errors, which run_query already hands back to generate_query. Queries the tokenizer
+cannot read (unterminated quotes, unbalanced parentheses, dollar quoting, ...) are reported
+as unparsed so the caller can fall back to the LLM check.
+"""
+from __future__ import annotations
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+import re
+import threading
+
+from brick_assistant.config import settings
+
+_TOKEN_RE = re.compile(
+    r"""
+     (?P<ws>\s+)
+    |(?P<comment>--[^\n]*|/\*.*?\*/)
+    |(?P<string>'(?:[^']|'')*')
+    |(?P<ident>"(?:[^"]|"")*")
+    |(?P<number>\d+(?:\.\d*)?(?:[eE][-+]?\d+)?|\.\d+(?:[eE][-+]?\d+)?)
+    |(?P<word>[A-Za-z_][A-Za-z0-9_]*)
+    |(?P<op><>|!=|<=|>=|::|\|\||[-+*/%=<>(),.;\[\]:@^~&|#])
+    """,
+    re.X | re.S,
+)
+
+WRITE_KEYWORDS = frozenset({
+    "INSERT", "UPDATE", "DELETE", "MERGE", "UPSERT", "DROP", "ALTER", "CREATE", "TRUNCATE",
+    "GRANT", "REVOKE", "COPY", "INTO", "ATTACH", "DETACH", "VACUUM", "REINDEX", "CALL", "EXECUTE",
+})
+DENIED_FUNCTIONS = frozenset({
+    "PG_SLEEP", "PG_TERMINATE_BACKEND", "PG_CANCEL_BACKEND", "PG_READ_FILE", "PG_READ_BINARY_FILE",
+    "PG_LS_DIR", "LO_IMPORT", "LO_EXPORT", "SET_CONFIG", "DBLINK", "DBLINK_EXEC", "NEXTVAL", "SETVAL",
+    "LOAD_EXTENSION",
+})
+_SELECT_LIST_STARTERS = frozenset({"SELECT", "DISTINCT", "ALL", ",", "."})
+
+
+class SQLParseError(ValueError):
+    pass
+
+
+@dataclass
+class Token:
+    kind: str
+    text: str
+    depth: int = 0
+
+    @property
+    def upper(self) -> str:
+        return self.text.upper() if self.kind == "word" else self.text
+
+
+@dataclass
+class ValidationResult:
+    query: str
+    parsed: bool = True
+    errors: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+    rewrites: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return self.parsed and not self.errors
+
+    def feedback(self) -> str:
+        """Message for generate_query when the query is rejected."""
+        return "Error: query rejected by the SQL validator: " + "; ".join(self.errors or ["could not parse the query"])
+
+
+def tokenize(query: str) -> List[Token]:
+    """Tokens of `query` (whitespace kept, comments dropped) with their parenthesis depth."""
+    tokens: List[Token] = []
+    pos, depth = 0, 0
+    while pos < len(query):
+        m = _TOKEN_RE.match(query, pos)
+        if m is None:
+            raise SQLParseError(f"Cannot read the query at: {query[pos:pos + 20]!r}")
+        kind, text = m.lastgroup, m.group()
+        pos = m.end()
+        if kind == "comment":
+            kind, text = "ws", " "
+        if text == ")":
+            depth -= 1
+            if depth < 0:
+                raise SQLParseError("Unbalanced parentheses")
+        tokens.append(Token(kind, text, depth))
+        if text == "(":
+            depth += 1
+    if depth != 0:
+        raise SQLParseError("Unbalanced parentheses")
+    return tokens
+
+
+class SQLValidator:
+    """
+    Args:
+        top_k: LIMIT added to queries without one.
+        max_rows: Upper bound for explicit LIMITs.
+    """
+
+    def __init__(self, top_k: int = settings.TOP_K_RESULTS, max_rows: int = settings.SQL_MAX_ROWS):
+        self.top_k = top_k
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        self._counts: Counter = Counter()
+        self._rules: Counter = Counter()
+
+    def validate(self, query: str) -> ValidationResult:
+        try:
+            tokens = tokenize(query)
+        except SQLParseError as e:
+            result = ValidationResult(query=query, parsed=False, errors=[str(e)])
+        else:
+            result = ValidationResult(query=query)
+            self._check(tokens, result)
+            if result.ok:
+                result.query = "".join(t.text for t in tokens).strip()
+        self._record(result)
+        return result
+
+    # ---------- rules ----------
+    def _check(self, tokens: List[Token], result: ValidationResult) -> None:
+        # trailing semicolons are dropped; anything after one is a second statement
+        while tokens and (tokens[-1].kind == "ws" or tokens[-1].text == ";"):
+            tokens.pop()
+        sig = [t for t in tokens if t.kind != "ws"]
+        if not sig:
+            result.errors.append("empty query")
+            return
+        if any(t.text == ";" for t in sig):
+            result.errors.append("only a single statement is allowed")
+            return
+        first = next((t for t in sig if t.text != "("), sig[0])
+        if first.upper not in ("SELECT", "WITH"):
+            result.errors.append(f"only SELECT queries are allowed, not {first.text.upper()}")
+            return
+
+        for i, t in enumerate(sig):
+            nxt = sig[i + 1] if i + 1 < len(sig) else None
+            prev = sig[i - 1] if i else None
+            if t.kind != "word":
+                continue
+            if t.upper in WRITE_KEYWORDS:
+                result.errors.append(f"{t.upper} is not allowed in a read-only query")
+            elif t.upper in DENIED_FUNCTIONS and nxt is not None and nxt.text == "(":
+                result.errors.append(f"function {t.text.lower()}() is not allowed")
+            elif t.upper == "NULL" and prev is not None and prev.text in ("=", "<>", "!="):
+                rewritten = "IS" if prev.text == "=" else "IS NOT"
+                result.rewrites.append(f"'{prev.text} NULL' -> '{rewritten} NULL'")
+                prev.text = rewritten
+            elif t.upper == "UNION" and (nxt is None or nxt.upper != "ALL"):
+                result.warnings.append("UNION removes duplicates; use UNION ALL unless that is intended")
+            elif t.upper == "BETWEEN":
+                result.warnings.append("BETWEEN includes both ends; use >= start AND < end for time windows")
+        self._check_not_in(sig, result)
+        self._check_star(sig, result)
+        if not result.errors:
+            self._cap_rows(tokens, sig, result)
+
+    def _check_not_in(self, sig: List[Token], result: ValidationResult) -> None:
+        for i in range(len(sig) - 2):
+            if sig[i].upper == "NOT" and sig[i + 1].upper == "IN" and sig[i + 2].text == "(":
+                depth = sig[i + 2].depth + 1
+                inner = []
+                for t in sig[i + 3:]:
+                    if t.depth < depth:
+                        break
+                    inner.append(t)
+                if inner and inner[0].upper in ("SELECT", "WITH"):
+                    result.errors.append(
+                        "NOT IN (subquery) returns no rows if the subquery yields a NULL; use NOT EXISTS "
+                        "or filter the subquery with IS NOT NULL"
+                    )
+                elif any(t.upper == "NULL" and t.depth == depth for t in inner):
+                    result.errors.append("NOT IN list containing NULL never matches")
+
+    def _check_star(self, sig: List[Token], result: ValidationResult) -> None:
+        select_depth: Optional[int] = None
+        for i, t in enumerate(sig):
+            if t.upper == "SELECT":
+                select_depth = t.depth
+            elif t.upper == "FROM" and t.depth == select_depth:
+                select_depth = None
+            elif t.text == "*" and t.depth == select_depth and i and sig[i - 1].upper in _SELECT_LIST_STARTERS:
+                result.errors.append("SELECT * is not allowed; list only the columns needed")
+                return
+
+    def _cap_rows(self, tokens: List[Token], sig: List[Token], result: ValidationResult) -> None:
+        top = [t for t in sig if t.depth == 0]
+        for i, t in enumerate(top):
+            if t.upper == "FETCH":
+                return  # FETCH FIRST n ROWS: explicit, standard form
+            if t.upper == "LIMIT":
+                value = top[i + 1] if i + 1 < len(top) else None
+                if value is not None and value.kind == "number":
+                    if float(value.text) > self.max_rows:
+                        result.rewrites.append(f"LIMIT {value.text} -> LIMIT {self.max_rows}")
+                        value.text = str(self.max_rows)
+                elif value is not None and value.upper == "ALL":
+                    result.rewrites.append(f"LIMIT ALL -> LIMIT {self.max_rows}")
+                    value.text = str(self.max_rows)
+                return
+        result.rewrites.append(f"added LIMIT {self.top_k}")
+        tokens.extend([Token("ws", " "), Token("word", "LIMIT"), Token("ws", " "), Token("number", str(self.top_k))])
+
+    # ---------- metrics ----------
+    def _record(self, result: ValidationResult) -> None:
+        with self._lock:
+            self._counts["validated"] += 1
+            if not result.parsed:
+                self._counts["unparsed"] += 1
+            elif result.errors:
+                self._counts["rejected"] += 1
+            elif result.rewrites:
+                self._counts["rewritten"] += 1
+            if result.parsed:
+                for message in result.errors + result.warnings:
+                    self._rules[message.split(";")[0]] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Counts of validated, rejected, rewritten and unparsed queries, and hits per rule."""
+        with self._lock:
+            counts = {k: self._counts.get(k, 0) for k in ("validated", "rejected", "rewritten", "unparsed")}
+            return {**counts, "rules": dict(self._rules)}
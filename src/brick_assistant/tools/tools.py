@@ -1,20 +1,26 @@
-from typing import List, Tuple
+from collections import Counter, defaultdict
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 import json
 import os
-from rdflib import Graph, BNode
+from rdflib import BNode, Graph, RDF, URIRef
 from langchain.tools import BaseTool  
 from brick_assistant.config import settings
+from brick_assistant.tools.snapshot import load_building_graph
+from brick_assistant.tools.schema_cache import SchemaSummaryCache
 
 class BrickExploration(BaseTool):
     name: str = "brick_explore_tool"
     description: str = """
-Analyzes Brick schema TTL files to extract blank node patterns and predicate usage, enabling structured SPARQL query generation. Automatically detects nested RDF structures (e.g., 'brick:hasLocation → [brick:value]') and provides schema insights. Essential for querying building automation data with complex blank node relationships. Always includes required Brick and building prefixes in outputs.
+Summarizes the Brick schema of a building TTL file to extract blank node patterns and predicate usage, enabling structured SPARQL query generation. Automatically detects nested RDF structures (e.g., 'brick:hasLocation → [brick:value]') and provides schema insights. Essential for querying building automation data with complex blank node relationships. Always includes required Brick and building prefixes in outputs.
 
 Key capabilities:
 - Identifies all classes and predicates in Brick schema files
 - Identifies blank nodes and extracts their inner predicates and objects
 - Reveals nested property patterns for query formulation
 - Handles building-specific TTL file paths dynamically
+- Returns a compact JSON summary (class/predicate counts, blank node patterns, a few example triples) under a fixed size budget
 
 Use this tool to:
 1. Understand the structure of Brick schema TTL files
@@ -26,20 +32,118 @@ Example patterns detected:
 - brick:hasCoordinates → {brick:latitude, brick:longitude}
 """
 
+    max_bytes: int = settings.SCHEMA_SUMMARY_MAX_BYTES
+    ttl_files_path: Path = settings.TTL_FILES_PATH
+    # Directory of persisted summaries (see schema_cache.py); None disables the disk cache.
+    cache_dir: Optional[Path] = settings.SCHEMA_CACHE_PATH
+
     def _run(self, building: str) -> str:
-        file_path = settings.TTL_FILES_PATH / f"bui_{building.upper()}.ttl"        
+        file_path = Path(self.ttl_files_path) / f"bui_{building.upper()}.ttl"
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"TTL file not found: {file_path}")
-        
-        g = Graph()
-        g.parse(file_path, format="turtle")
-        
-        results: List[Tuple[str, str, str]] = []
-        for subj, predicate, obj in g:
-            if isinstance(obj,BNode):
-                for inner_subj, inner_pred, inner_obj in g.triples((obj,None,None)):
-                    results.append((f"This is the inner subject {inner_subj}", f"This is the inner predicate {inner_pred}", f"This is the object {inner_obj}"))
-            results.append((f"This is the subject {subj}", f"This is the predicate {predicate}", f"This is the object {obj}"))
-            output = json.dumps(results)
-            
-        return output
\ No newline at end of file
+
+        if self.cache_dir is not None:
+            summary = _summary_cache(Path(self.cache_dir), self.max_bytes).get(file_path, building)
+        else:
+            summary = summarize_schema(load_building_graph(file_path), building.upper(), max_bytes=self.max_bytes)
+        return json.dumps(summary, separators=(",", ":"))
+
+
+@lru_cache(maxsize=8)
+def _summary_cache(cache_dir: Path, max_bytes: int) -> SchemaSummaryCache:
+    return SchemaSummaryCache(cache_dir, max_bytes=max_bytes)
+
+
+def _json_size(value) -> int:
+    return len(json.dumps(value, separators=(",", ":")).encode("utf-8"))
+
+
+def summarize_schema(g: Graph, building: str, max_bytes: int = settings.SCHEMA_SUMMARY_MAX_BYTES,
+                     examples_per_predicate: int = settings.SCHEMA_EXAMPLES_PER_PREDICATE) -> Dict[str, Any]:
+    """
+    Summarize the schema of a building graph in a single pass over its triples.
+
+    The summary holds the prefixes, class and predicate histograms, blank-node shape patterns
+    (e.g. `brick:hasCoordinates -> [brick:latitude, brick:longitude]`) and a few example triples
+    per predicate. Its compact JSON encoding is kept under `max_bytes` (~4 bytes per token):
+    examples are dropped first, then entries of the longest of the class/predicate histograms and
+    blank-node patterns, and `truncated` is set.
+    """
+    prefixes = sorted(((p, str(ns)) for p, ns in g.namespaces() if str(ns)), key=lambda x: -len(x[1]))
+    used_prefixes: Dict[str, str] = {}
+
+    def short(term) -> str:
+        if isinstance(term, BNode):
+            return "_:b"
+        value = str(term)
+        if isinstance(term, URIRef):
+            for prefix, ns in prefixes:
+                if value.startswith(ns) and len(value) > len(ns):
+                    used_prefixes[prefix] = ns
+                    return f"{prefix}:{value[len(ns):]}"
+        return value
+
+    classes: Counter = Counter()
+    predicates: Counter = Counter()
+    bnode_props: Dict[BNode, Dict[str, str]] = defaultdict(dict)
+    bnode_uses: List[Tuple[str, BNode]] = []
+    example_refs: Dict[str, List[Tuple]] = defaultdict(list)
+    n_triples = 0
+
+    for subj, predicate, obj in g:
+        n_triples += 1
+        pred = short(predicate)
+        predicates[pred] += 1
+        if predicate == RDF.type:
+            classes[short(obj)] += 1
+        if isinstance(subj, BNode):
+            bnode_props[subj].setdefault(pred, short(obj))
+            continue
+        if isinstance(obj, BNode):
+            bnode_uses.append((pred, obj))
+        if len(example_refs[pred]) < examples_per_predicate:
+            example_refs[pred].append((short(subj), pred, obj))
+
+    patterns: Dict[str, set] = defaultdict(set)
+    for pred, node in bnode_uses:
+        patterns[pred].update(bnode_props.get(node, {}))
+
+    # inlined blank nodes are dicts, which do not compare: order by the encoded example
+    examples = sorted(
+        ([s, p, bnode_props.get(o, {}) if isinstance(o, BNode) else short(o)]
+         for refs in example_refs.values() for s, p, o in refs),
+        key=lambda e: json.dumps(e, sort_keys=True, default=str),
+    )
+
+    summary: Dict[str, Any] = {
+        "building": building,
+        "triples": n_triples,
+        "prefixes": dict(sorted(used_prefixes.items())),
+        "blank_node_patterns": {p: sorted(props) for p, props in sorted(patterns.items())},
+        "classes": dict(sorted(classes.items(), key=lambda kv: (-kv[1], kv[0]))),
+        "predicates": dict(sorted(predicates.items(), key=lambda kv: (-kv[1], kv[0]))),
+        "examples": [],
+        "truncated": False,
+    }
+
+    size = _json_size(summary)
+    for example in examples:
+        cost = _json_size(example) + 1
+        if size + cost > max_bytes:
+            summary["truncated"] = True
+            break
+        summary["examples"].append(example)
+        size += cost
+
+    # Still over budget: drop the last entries (the rarest, for the histograms) of the longest
+    # section. The running size is an estimate, so re-measure before stopping.
+    sections = ("classes", "predicates", "blank_node_patterns")
+    while any(summary[s] for s in sections):
+        if size <= max_bytes:
+            size = _json_size(summary)
+            if size <= max_bytes:
+                break
+        summary["truncated"] = True
+        name, value = summary[max(sections, key=lambda s: len(summary[s]))].popitem()
+        size -= _json_size({name: value}) - 1
+    return summary
@@ -0,0 +1,132 @@
+"""
+Short handles for the UUID sets returned by rdf_toolkit.
+
+The UUIDs of temperature_sensors_uuid / generic_sensors / meters results are kept in the
+graph state under handles such as `@bcgw_temp` (`@bcgw_temp_zone_1` with a location filter,
+`@portfolio_meters` for every building of a multi-building call). Generated SQL refers to
+the handle instead of copying dozens of UUIDs:
+
+    SELECT uuid, avg(value) FROM sensor_data WHERE uuid IN (@bcgw_temp) GROUP BY uuid
+
+and `expand_handles` turns it into bound parameters (`uuid IN (:uuid_0, :uuid_1, ...)`)
+right before execution.
+"""
+from __future__ import annotations
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import re
+
+# rdf_toolkit operation -> handle suffix
+HANDLE_OPERATIONS = {"temperature_sensors_uuid": "temp", "generic_sensors": "sensors", "meters": "meters"}
+PORTFOLIO_PREFIX = "portfolio"
+
+_HANDLE = r"@([a-z][a-z0-9_]*)"
+# 1: quoted text (left alone) | 2: IN (@a, @b) / = ANY(@a) | 6: any other handle
+_EXPAND_RE = re.compile(
+    r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\")"
+    r"|(\bIN\s*\(\s*" + _HANDLE + r"(?:\s*,\s*" + _HANDLE + r")*\s*\)|=\s*ANY\s*\(\s*" + _HANDLE + r"\s*\))"
+    r"|" + _HANDLE,
+    re.I,
+)
+
+
+def merge_uuid_sets(left: Optional[Dict[str, List[str]]], right: Optional[Dict[str, List[str]]]) -> Dict[str, List[str]]:
+    """State reducer: later captures of a handle replace earlier ones."""
+    return {**(left or {}), **(right or {})}
+
+
+def _slug(value: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", value.lower()).strip("_")
+
+
+def handle_name(building: str, operation: str, location_filter: Optional[str] = None) -> str:
+    """Handle of the UUID set of `operation` in `building`, e.g. '@bcgw_temp' (without the state lookup)."""
+    name = f"{_slug(building)}_{HANDLE_OPERATIONS[operation]}"
+    if location_filter:
+        name += f"_{_slug(location_filter)}"
+    return "@" + name
+
+
+def _uuids(payload: Dict[str, Any]) -> List[str]:
+    found = []
+    for value in payload.values():
+        if isinstance(value, list):
+            found.extend(item["uuid"] for item in value if isinstance(item, dict) and item.get("uuid"))
+    return list(dict.fromkeys(str(u) for u in found))
+
+
+def uuid_sets_from_result(result: Dict[str, Any], args: Dict[str, Any]) -> Dict[str, List[str]]:
+    """
+    Handles -> UUIDs of one rdf_toolkit result (empty for operations without UUIDs or on errors).
+
+    Args:
+        result: The tool output (single-building or portfolio form).
+        args: The arguments of the rdf_toolkit call.
+    """
+    operation = args.get("operation")
+    if operation not in HANDLE_OPERATIONS or not isinstance(result, dict):
+        return {}
+    location_filter = args.get("location_filter")
+    sets: Dict[str, List[str]] = {}
+    if isinstance(result.get("buildings"), dict):
+        for building, payload in result["buildings"].items():
+            if isinstance(payload, dict) and "error" not in payload:
+                sets[handle_name(building, operation, location_filter)] = _uuids(payload)
+        if len(sets) > 1:
+            combined = list(dict.fromkeys(u for uuids in sets.values() for u in uuids))
+            sets[handle_name(PORTFOLIO_PREFIX, operation, location_filter)] = combined
+    elif result.get("building") and "error" not in result:
+        sets[handle_name(result["building"], operation, location_filter)] = _uuids(result)
+    return sets
+
+
+def _lookup(name: str, uuid_sets: Dict[str, List[str]]) -> List[str]:
+    handle = "@" + name.lower()
+    if handle not in uuid_sets:
+        known = ", ".join(sorted(uuid_sets)) or "none yet (call rdf_toolkit first)"
+        raise ValueError(f"Unknown UUID handle {handle}; available: {known}")
+    return uuid_sets[handle]
+
+
+def expand_handles(query: str, uuid_sets: Optional[Dict[str, List[str]]]) -> Tuple[str, Dict[str, str]]:
+    """
+    Replace `IN (@h, ...)` / `= ANY(@h)` by an IN list of bound parameters.
+
+    Returns:
+        Tuple[str, Dict[str, str]]: The rewritten query and its parameters ({} when the query has no handles).
+
+    Raises:
+        ValueError: Unknown handle, or a handle used outside IN (...) / = ANY(...).
+    """
+    if "@" not in query:
+        return query, {}
+    uuid_sets = uuid_sets or {}
+    params: Dict[str, str] = {}
+
+    def replace(m: re.Match) -> str:
+        if m.group(1):
+            return m.group(1)
+        if m.group(2):
+            names = re.findall(_HANDLE, m.group(2), re.I)
+            uuids = list(dict.fromkeys(u for n in names for u in _lookup(n, uuid_sets)))
+            if not uuids:
+                return "IN (NULL)"
+            placeholders = []
+            for u in uuids:
+                key = f"uuid_{len(params)}"
+                params[key] = u
+                placeholders.append(f":{key}")
+            return "IN (" + ", ".join(placeholders) + ")"
+        name = m.group(6)
+        _lookup(name, uuid_sets)
+        raise ValueError(f"UUID handle @{name} must be used as `uuid IN (@{name})`")
+
+    return _EXPAND_RE.sub(replace, query), params
+
+
+def expand_uuid_list(uuids: Iterable[str], uuid_sets: Optional[Dict[str, List[str]]]) -> List[str]:
+    """UUID list with every '@handle' entry replaced by its UUIDs."""
+    expanded: List[str] = []
+    for item in uuids:
+        item = item.strip()
+        expanded.extend(_lookup(item[1:], uuid_sets or {}) if item.startswith("@") else [item])
+    return list(dict.fromkeys(expanded))
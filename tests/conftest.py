@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+import os
+import shutil
+
+import pytest
+from langchain_community.utilities.sql_database import SQLDatabase
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from brick_assistant.config import settings
+from brick_assistant.tools import rdf_query
+
+DATA = Path(__file__).resolve().parents[1] / "data"
+START = datetime(2024, 5, 1)
+SENSORS = {"u1": 10.0, "u2": 20.0}  # uuid -> base value
+
+
+@pytest.fixture
+def sensor_db():
+    """In-memory SQLite sensor_data: u1 and u2, hourly readings for 3 days from 2024-05-01 (value = base + hour of day)."""
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    with engine.begin() as connection:
+        connection.execute(text('CREATE TABLE sensor_data (uuid TEXT, "timestamp" TEXT, value REAL)'))
+        rows = [
+            {"uuid": uuid, "ts": (START + timedelta(hours=h)).isoformat(sep=" "), "value": base + h % 24}
+            for uuid, base in SENSORS.items()
+            for h in range(72)
+        ]
+        connection.execute(text("INSERT INTO sensor_data VALUES (:uuid, :ts, :value)"), rows)
+    return SQLDatabase(engine)
+
+
+@pytest.fixture
+def ttl_dir(tmp_path, monkeypatch):
+    """TTL directory holding a copy of bui_BCGW.ttl, with rdf_query's caches emptied around the test."""
+    shutil.copy(DATA / "ttl_files" / "bui_BCGW.ttl", tmp_path / "bui_BCGW.ttl")
+    monkeypatch.setattr(settings, "TTL_FILES_PATH", tmp_path)
+    monkeypatch.setattr(settings, "SNAPSHOT_FILES_PATH", tmp_path / "snapshots")
+    monkeypatch.setattr(settings, "METADATA_FILE", DATA / "metadataloc.json")
+    rdf_query.graph_cache.invalidate()
+    rdf_query.invalidate_results()
+    yield tmp_path
+    rdf_query.graph_cache.invalidate()
+    rdf_query.invalidate_results()
+
+
+def add_zone(path: Path, zone: str = "BCGW_Extra") -> None:
+    """Append a zone of BCGW to a TTL file and move its mtime forward."""
+    with open(path, "a") as file:
+        file.write(f"\n<urn:Building#{zone}> a <https://brickschema.org/schema/Brick#Zone> ;\n"
+                   "    <https://brickschema.org/schema/Brick#isPartOf> <urn:Building#BCGW> .\n")
+    touch(path)
+
+
+def touch(path: Path) -> None:
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
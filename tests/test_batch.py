@@ -0,0 +1,49 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+from langgraph.checkpoint.memory import MemorySaver
+
+from brick_assistant.config.configs import AgentConfig
+from brick_assistant.graphs.wuerth_vanilla_graph_dev_rdf import WuerthVanillaGraphRDF
+from brick_assistant.helpers.scripted_llm import ScriptedChatModel, offline_responder
+
+DATA = Path(__file__).resolve().parents[1] / "data"
+QUESTIONS = ["What is the area of BCGW?", "Which zones exist in Grottaminarda?", "How many buildings are in Paris?"]
+
+
+@pytest.fixture
+def saver():
+    return MemorySaver()
+
+
+@pytest.fixture
+def graph(saver):
+    keys = AgentConfig(
+        database_uri="sqlite://",
+        openai_api_key="offline",
+        metadata_file=DATA / "metadataloc.json",
+        ttl_files_path=DATA / "ttl_files",
+        llm_cache_enabled=False,
+    )
+    llm = ScriptedChatModel(responder=offline_responder(keys.metadata_file))
+    return WuerthVanillaGraphRDF(keys=keys, llm=llm, checkpointer=saver)
+
+
+def test_run_batch_leaves_no_checkpoints(graph, saver):
+    records = graph.run_batch(QUESTIONS, max_concurrency=3)
+    assert [r["error"] for r in records] == [None] * 3
+    assert records[0]["response"].startswith("Offline answer from rdf_toolkit")
+    assert len({r["thread_id"] for r in records}) == 3
+    assert not saver.storage
+
+
+def test_arun_batch_leaves_no_checkpoints(graph, saver):
+    records = asyncio.run(graph.arun_batch(QUESTIONS, max_concurrency=2))
+    assert [r["error"] for r in records] == [None] * 3
+    assert not saver.storage
+
+
+def test_conversations_keep_their_checkpoints(graph, saver):
+    graph._compiled_graph().invoke(graph._prepare_input({"user_prompt": QUESTIONS[0]}), graph._thread_config("t1"))
+    assert "t1" in saver.storage
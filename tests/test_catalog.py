@@ -0,0 +1,45 @@
+from brick_assistant.tools import rdf_query
+from brick_assistant.tools.catalog import BuildingCatalog
+from brick_assistant.tools.rdf_query import graph_cache
+
+from conftest import add_zone, touch
+
+
+def counters():
+    stats = graph_cache.stats()
+    return stats["misses"], stats["reloads"]
+
+
+def test_catalog_shares_the_graph_cache(ttl_dir):
+    misses, _ = counters()
+    catalog = BuildingCatalog(graphs=graph_cache).refresh()
+    row = catalog.rows["BCGW"]
+    assert (row.location, row.area_m2, row.zone_count) == ("Bussolengo", 1527.0, 8)
+    assert counters()[0] == misses + 1
+
+    # rdf_toolkit reuses the graph parsed for the catalog
+    zones = rdf_query._run_single(rdf_query.RDFToolkitArgs(building_name="BCGW", operation="zones"))
+    assert len(zones["zones"]) == 8
+    assert counters()[0] == misses + 1
+
+
+def test_catalog_follows_file_changes(ttl_dir):
+    catalog = BuildingCatalog(graphs=graph_cache).refresh()
+    row = catalog.rows["BCGW"]
+    misses, reloads = counters()
+
+    touch(ttl_dir / "bui_BCGW.ttl")
+    assert catalog.refresh().rows["BCGW"] is row  # same content: row kept, no reparse
+    assert counters() == (misses, reloads)
+
+    add_zone(ttl_dir / "bui_BCGW.ttl")
+    assert catalog.refresh().rows["BCGW"].zone_count == 9
+    assert counters() == (misses + 1, reloads + 1)
+
+
+def test_catalog_without_graph_cache(ttl_dir):
+    before = counters()
+    catalog = BuildingCatalog(ttl_dir=ttl_dir).refresh()
+    assert catalog.rows["BCGW"].zone_count == 8
+    assert counters() == before
+    assert [r.building for r in catalog.top_k("area_m2", 1)] == ["BCGW"]
@@ -0,0 +1,92 @@
+import json
+import uuid
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from brick_assistant.helpers.context_budget import ContextBudget, _tokens
+
+NODE = "generate_query"
+
+
+def sensor_output(n=40):
+    sensors = [
+        {"sensor": f"https://brickschema.org/schema/Brick#Sensor_{i}", "uuid": str(uuid.UUID(int=i)), "value": i * 1.5}
+        for i in range(n)
+    ]
+    return json.dumps(sensors, indent=4)
+
+
+def tool_round(call_id, content):
+    call = {"name": "rdf_toolkit", "args": {"building_name": "BCGW"}, "id": call_id, "type": "tool_call"}
+    return [AIMessage(content="", tool_calls=[call]), ToolMessage(content=content, tool_call_id=call_id)]
+
+
+def conversation():
+    return [
+        HumanMessage(content="Which temperature sensors are in BCGW?"),
+        *tool_round("call_1", sensor_output()),
+        *tool_round("call_2", sensor_output()),
+    ]
+
+
+def test_under_budget_is_unchanged():
+    messages = conversation()
+    budget = ContextBudget({NODE: _tokens(messages)})
+    assert budget.fit(messages, NODE) == messages
+    stats = budget.stats()
+    assert stats["tokens_trimmed"] == 0
+    assert stats["nodes"][NODE]["compacted_calls"] == 0
+
+
+def test_budget_is_enforced_on_older_outputs():
+    messages = conversation()
+    latest = _tokens(messages[-2:])
+    budget = ContextBudget({NODE: latest + 700})
+    fitted = budget.fit(messages, NODE)
+
+    assert _tokens(fitted) <= latest + 700
+    assert len(fitted) == len(messages)
+    old = json.loads(fitted[2].content)
+    assert old["compacted_tool_output"] is True
+    assert old["uuids"] == [str(uuid.UUID(int=i)) for i in range(40)]
+    # the input list and the graph state are left untouched
+    assert messages[2].content == sensor_output()
+
+
+def test_latest_tool_round_is_verbatim():
+    messages = conversation()
+    budget = ContextBudget({NODE: 1})
+    fitted = budget.fit(messages, NODE)
+
+    assert fitted[-1].content == messages[-1].content
+    assert fitted[2].content != messages[2].content
+    assert budget.stats()["nodes"][NODE]["over_budget"] == 1
+
+
+def test_parallel_results_after_last_ai_message_are_verbatim():
+    calls = [{"name": "rdf_toolkit", "args": {}, "id": f"call_{i}", "type": "tool_call"} for i in range(2)]
+    messages = [
+        HumanMessage(content="zones and meters of BCGW"),
+        AIMessage(content="", tool_calls=calls),
+        ToolMessage(content=sensor_output(), tool_call_id="call_0"),
+        ToolMessage(content=sensor_output(), tool_call_id="call_1"),
+    ]
+    fitted = ContextBudget({NODE: 1}).fit(messages, NODE)
+    assert fitted == messages
+
+
+def test_trimmed_tokens_are_recorded():
+    messages = conversation()
+    budget = ContextBudget({"default": 1, "final_answer": None})
+    fitted = budget.fit(messages, NODE)
+    budget.fit(messages, "final_answer")
+
+    stats = budget.stats()
+    node = stats["nodes"][NODE]
+    assert node["calls"] == 1
+    assert node["compacted_calls"] == 1
+    assert node["tokens_in"] == _tokens(messages)
+    assert node["tokens_sent"] == _tokens(fitted)
+    assert node["tokens_trimmed"] == node["tokens_in"] - node["tokens_sent"] > 0
+    assert stats["nodes"]["final_answer"]["tokens_trimmed"] == 0
+    assert stats["tokens_trimmed"] == node["tokens_trimmed"]
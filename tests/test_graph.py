@@ -0,0 +1,91 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from brick_assistant.config.configs import AgentConfig
+from brick_assistant.graphs.wuerth_single_call_graph_rdf import WuerthSingleCallGraphRDF
+from brick_assistant.graphs.wuerth_vanilla_graph_dev_rdf import WuerthVanillaGraphRDF
+from brick_assistant.helpers.scripted_llm import ScriptedChatModel, offline_responder
+
+DATA = Path(__file__).resolve().parents[1] / "data"
+QUESTION = "What is the area of BCGW?"
+
+
+def offline_graph(cls, **config):
+    keys = AgentConfig(
+        database_uri="sqlite://",
+        openai_api_key="offline",
+        metadata_file=DATA / "metadataloc.json",
+        ttl_files_path=DATA / "ttl_files",
+        llm_cache_enabled=False,
+        **config,
+    )
+    return cls(keys=keys, llm=ScriptedChatModel(responder=offline_responder(keys.metadata_file)))
+
+
+@pytest.fixture
+def graph():
+    return offline_graph(WuerthVanillaGraphRDF)
+
+
+def nodes(updates):
+    return [next(iter(u)) for u in updates]
+
+
+def final_answer(updates):
+    return updates[-1]["tables_or_end"]["messages"][-1].content
+
+
+def test_run_returns_the_final_state(graph):
+    state = graph.run({"user_prompt": QUESTION})
+    assert state["messages"][-1].content.startswith("Offline answer from rdf_toolkit")
+    assert graph.result is state
+
+
+def test_run_stream_collects_node_updates(graph):
+    updates = graph.run({"user_prompt": QUESTION}, stream=True)
+    assert isinstance(updates, list)
+    assert nodes(updates)[:2] == ["metadata_keys_call", "intent_fast_path"]
+    assert "rdf_toolkit" in {node for u in updates for node in u}
+    assert final_answer(updates).startswith("Offline answer from rdf_toolkit")
+    assert graph.result == updates[-1]
+
+
+def test_stream_yields_updates_as_nodes_finish(graph):
+    stream = graph.stream({"user_prompt": QUESTION})
+    assert next(stream) == {"metadata_keys_call": graph.result["metadata_keys_call"]}
+    updates = [graph.result, *stream]
+    assert nodes(updates) == nodes(graph.run({"user_prompt": QUESTION}, stream=True))
+    assert final_answer(updates).startswith("Offline answer from rdf_toolkit")
+
+
+def test_astream_matches_stream(graph):
+    async def collect():
+        return [u async for u in graph.astream({"user_prompt": QUESTION})]
+
+    updates = asyncio.run(collect())
+    assert nodes(updates) == nodes(graph.stream({"user_prompt": QUESTION}))
+    assert final_answer(updates).startswith("Offline answer from rdf_toolkit")
+
+
+def test_arun_matches_run(graph):
+    state = asyncio.run(graph.arun({"user_prompt": QUESTION}))
+    assert state["messages"][-1].content == graph.run({"user_prompt": QUESTION})["messages"][-1].content
+
+
+@pytest.mark.parametrize("cls, route", [
+    (WuerthVanillaGraphRDF, ["evaluate_user_query", "tables_or_rdf"]),
+    (WuerthSingleCallGraphRDF, ["evaluate_and_route"]),
+])
+def test_entry_node_routes_to_the_first_tool(cls, route):
+    graph = offline_graph(cls, intent_fast_path=False)
+    updates = graph.run({"user_prompt": QUESTION}, stream=True)
+    assert nodes(updates) == ["metadata_keys_call", *route, "rdf_toolkit", "capture_uuid_handles", "tables_or_end"]
+    assert final_answer(updates).startswith('Offline answer from rdf_toolkit: {"building": "BCGW"')
+
+
+def test_single_call_fast_path_falls_back_to_its_entry_node():
+    graph = offline_graph(WuerthSingleCallGraphRDF)
+    updates = graph.run({"user_prompt": "How many buildings are in Paris?"}, stream=True)
+    assert nodes(updates) == ["metadata_keys_call", "intent_fast_path", "evaluate_and_route"]
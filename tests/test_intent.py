@@ -0,0 +1,47 @@
+import pytest
+
+from brick_assistant.tools.intent import IntentMatcher
+
+BUILDINGS = {"BCFT": "Cremona", "BCGW": "Bussolengo", "BCGG": "Roma Corso Francia", "BCGR": "Grottaminarda"}
+
+
+@pytest.fixture
+def matcher():
+    return IntentMatcher(BUILDINGS)
+
+
+# live values and locations inside a building must reach the LLM/SQL path
+@pytest.mark.parametrize("question", [
+    "what is the temperature in area 2 of BCFT right now?",
+    "What is the current power of BCGW meter",
+    "temperature of BCGW zone 1 now",
+    "Which zones in BCGW are too hot?",
+    "What is the latest humidity in the BCGG zones?",
+    "Is it cold in the BCGR zones currently?",
+    "energy of the BCGW meters",
+    "average temperature of the BCGW sensors last week",
+    "Which building has the most zones?",
+])
+def test_vetoed(matcher, question):
+    assert matcher.match(question) is None
+
+
+@pytest.mark.parametrize("question, operation, buildings", [
+    ("What's the area of the Bussolengo building?", "area", ("BCGW",)),
+    ("How many temperature sensors are in the BCGW ?", "temperature_sensors_uuid", ("BCGW",)),
+    ("Which energy meters are in BCGW?", "meters", ("BCGW",)),
+    ("List the power meters of BCFT", "meters", ("BCFT",)),
+    ("Which zones exist in Grottaminarda?", "zones", ("BCGR",)),
+    ("zones of BCGW and BCGG", "zones", ("BCGW", "BCGG")),
+])
+def test_matched(matcher, question, operation, buildings):
+    match = matcher.match(question)
+    assert match is not None
+    assert (match.operation, match.buildings) == (operation, buildings)
+
+
+def test_stats_count_attempts_and_matches(matcher):
+    matcher.match("zones of BCGW")
+    matcher.match("temperature of BCGW zone 1 now")
+    stats = matcher.stats()
+    assert (stats["attempts"], stats["matches"], stats["by_operation"]) == (2, 1, {"zones": 1})
@@ -0,0 +1,124 @@
+import json
+import types
+
+import pytest
+from langchain_core.load import dumps
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration
+
+from brick_assistant.config.configs import AgentConfig
+from brick_assistant.config import settings
+from brick_assistant.helpers import llm_cache
+from brick_assistant.helpers.llm_cache import SQLiteLRUCache, canonical_prompt, node_scope
+
+LLM = "offline-model"
+
+
+def conversation(run):
+    """One tool round as serialized by the chat model cache; ids differ on every run."""
+    call_id = f"call_{run}_rdf"
+    return dumps([
+        HumanMessage(content="What is the area of BCGW?", id=f"human-{run}"),
+        AIMessage(
+            content="",
+            id=f"ai-{run}",
+            tool_calls=[{"name": "rdf_toolkit", "args": {"building_name": "BCGW"}, "id": call_id}],
+            response_metadata={"model_name": LLM, "run": run},
+        ),
+        ToolMessage(content='{"area": 1527}', tool_call_id=call_id, id=f"tool-{run}"),
+    ])
+
+
+def answer(text):
+    return [ChatGeneration(message=AIMessage(content=text))]
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(llm_cache, "time", types.SimpleNamespace(time=clock.time))
+    return clock
+
+
+def test_canonical_prompt_drops_run_specific_ids():
+    first, second = canonical_prompt(conversation(1)), canonical_prompt(conversation(2))
+    assert first == second
+    assert "human-1" not in first and "ai-1" not in first
+    assert "response_metadata" not in first
+
+
+def test_canonical_prompt_renumbers_tool_call_ids_in_order():
+    messages = json.loads(canonical_prompt(conversation(1)))
+    ai, tool = messages[1]["kwargs"], messages[2]["kwargs"]
+    assert ai["tool_calls"][0]["id"] == "call_0"
+    assert tool["tool_call_id"] == "call_0"
+
+
+def test_canonical_prompt_keeps_content_and_non_json_prompts():
+    assert canonical_prompt(conversation(1)) != canonical_prompt(conversation(1).replace("BCGW", "BCGX"))
+    assert canonical_prompt("plain prompt") == "plain prompt"
+
+
+def test_repeated_question_hits(tmp_path):
+    cache = SQLiteLRUCache(tmp_path / "cache.sqlite")
+    cache.update(conversation(1), LLM, answer("1527 m2"))
+    assert cache.lookup(conversation(2), LLM)[0].message.content == "1527 m2"
+    assert cache.lookup(conversation(2), "other-model") is None
+    assert cache.stats()["nodes"]["default"] == {"hits": 1, "misses": 1, "expired": 0, "bypassed": 0, "hit_rate": 0.5}
+
+
+def test_ttl_expiry(tmp_path, clock):
+    cache = SQLiteLRUCache(tmp_path / "cache.sqlite", policies={"generate_query": {"ttl_s": 60}})
+    with node_scope("generate_query"):
+        cache.update(conversation(1), LLM, answer("SELECT 1"))
+        clock.now += 59
+        assert cache.lookup(conversation(1), LLM) is not None
+        clock.now += 2
+        assert cache.lookup(conversation(1), LLM) is None
+    # the node without a TTL keeps its entries
+    cache.update(conversation(1), "model-b", answer("kept"))
+    clock.now += 10_000
+    assert cache.lookup(conversation(1), "model-b") is not None
+    assert cache.stats()["nodes"]["generate_query"]["expired"] == 1
+    assert cache.stats()["entries"] == 1
+
+
+def test_lru_eviction(tmp_path, clock):
+    cache = SQLiteLRUCache(tmp_path / "cache.sqlite", max_entries=2)
+    for model in ("a", "b"):
+        clock.now += 1
+        cache.update(conversation(1), model, answer(model))
+    clock.now += 1
+    assert cache.lookup(conversation(1), "a") is not None  # "b" is now the least recently used
+    clock.now += 1
+    cache.update(conversation(1), "c", answer("c"))
+
+    assert cache.lookup(conversation(1), "b") is None
+    assert cache.lookup(conversation(1), "a") is not None
+    assert cache.lookup(conversation(1), "c") is not None
+    assert cache.stats()["entries"] == 2
+    assert cache.evictions == 1
+
+
+def test_disabled_node_is_bypassed(tmp_path):
+    cache = SQLiteLRUCache(tmp_path / "cache.sqlite", policies={"check_query": False})
+    with node_scope("check_query"):
+        cache.update(conversation(1), LLM, answer("ok"))
+        assert cache.lookup(conversation(1), LLM) is None
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["nodes"]["check_query"]["bypassed"] == 1
+
+
+def test_agent_config_defaults_to_the_settings_path(tmp_path):
+    keys = AgentConfig(
+        database_uri="sqlite://", openai_api_key="offline", metadata_file=tmp_path / "metadata.json", ttl_files_path=tmp_path / "ttl"
+    )
+    assert keys.llm_cache_path == settings.LLM_CACHE_PATH
@@ -0,0 +1,46 @@
+import pytest
+from rdflib import Graph
+
+from brick_assistant.config import settings
+from brick_assistant.tools import rdf_query
+from brick_assistant.tools.rdf_index import index_for
+from brick_assistant.tools.rdf_query import QUERIES, RDFToolkitArgs
+
+from conftest import DATA
+
+
+@pytest.fixture(scope="module")
+def bcgw():
+    g = Graph()
+    g.parse(DATA / "ttl_files" / "bui_BCGW.ttl", format="turtle")
+    return g
+
+
+@pytest.mark.parametrize("operation", sorted(QUERIES))
+def test_index_rows_match_sparql(bcgw, operation, monkeypatch):
+    rows = {}
+    for mode in ("index", "sparql"):
+        monkeypatch.setattr(settings, "RDF_QUERY_MODE", mode)
+        rows[mode] = rdf_query._select(bcgw, operation)
+    assert rows["index"] == rows["sparql"]
+
+    monkeypatch.setattr(settings, "RDF_QUERY_MODE", "verify")
+    assert rdf_query._select(bcgw, operation) == rows["sparql"]
+
+
+@pytest.mark.parametrize("operation", sorted(QUERIES))
+@pytest.mark.parametrize("options", [{}, {"limit": 3}, {"location_filter": "bcgw"}])
+def test_index_results_match_sparql(ttl_dir, operation, options, monkeypatch):
+    args = RDFToolkitArgs(building_name="BCGW", operation=operation, **options)
+    results = {}
+    for mode in ("index", "sparql"):
+        monkeypatch.setattr(settings, "RDF_QUERY_MODE", mode)
+        results[mode] = rdf_query._run_single(args)
+    assert "error" not in results["index"]
+    assert results["index"] == results["sparql"]
+
+
+def test_bcgw_exercises_every_operation(bcgw):
+    # the comparisons above are only meaningful on non-empty results
+    rows = index_for(bcgw).rows
+    assert all(rows[operation] for operation in QUERIES)
@@ -0,0 +1,25 @@
+from brick_assistant.tools import rdf_query
+from brick_assistant.tools.rdf_query import RDFToolkitArgs, graph_cache, result_cache
+
+from conftest import add_zone
+
+
+def test_reloading_a_changed_file_drops_its_results(ttl_dir):
+    args = RDFToolkitArgs(building_name="BCGW", operation="zones")
+    zones = rdf_query._run_single(args)["zones"]
+    rdf_query._run_single(args.model_copy(update={"operation": "area"}))
+    assert len(result_cache) == 2
+
+    add_zone(ttl_dir / "bui_BCGW.ttl")
+
+    reloads = graph_cache.stats()["reloads"]
+    assert len(rdf_query._run_single(args)["zones"]) == len(zones) + 1
+    assert graph_cache.stats()["reloads"] == reloads + 1
+    assert len(result_cache) == 1  # the old zones and area results were dropped
+
+
+def test_invalidate_results_by_building(ttl_dir):
+    rdf_query._run_single(RDFToolkitArgs(building_name="bcgw", operation="area"))
+    assert rdf_query.invalidate_results("FOO") == 0
+    assert rdf_query.invalidate_results("BCGW") == 1
+    assert len(result_cache) == 0
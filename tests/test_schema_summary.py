@@ -0,0 +1,83 @@
+import json
+from pathlib import Path
+
+import pytest
+from rdflib import BNode, Graph, Literal, Namespace, URIRef
+from rdflib.namespace import RDF
+
+from brick_assistant.tools.tools import summarize_schema
+
+BRICK = Namespace("https://brickschema.org/schema/Brick#")
+DATA = Path(__file__).resolve().parents[1] / "data" / "ttl_files"
+
+
+def size(summary) -> int:
+    return len(json.dumps(summary, separators=(",", ":")).encode("utf-8"))
+
+
+def blank_node_graph(shapes: int) -> Graph:
+    """One entity per shape, each linked through its own predicate to a blank node with its own properties."""
+    g = Graph()
+    g.bind("brick", BRICK)
+    for i in range(shapes):
+        entity, node = URIRef(f"urn:b#e{i}"), BNode()
+        g.add((entity, RDF.type, BRICK.Point))
+        g.add((entity, BRICK[f"hasShape{i:03d}"], node))
+        for j in range(3):
+            g.add((node, BRICK[f"shape{i:03d}Property{j}"], Literal(j)))
+    return g
+
+
+def test_small_budget_trims_blank_node_patterns():
+    g = blank_node_graph(200)
+    full = summarize_schema(g, "X", max_bytes=10**6)
+    assert len(full["blank_node_patterns"]) == 200 and not full["truncated"]
+
+    summary = summarize_schema(g, "X", max_bytes=2000)
+    assert summary["truncated"]
+    assert size(summary) <= 2000
+    assert 0 < len(summary["blank_node_patterns"]) < 200
+
+
+@pytest.mark.parametrize("max_bytes", [300, 1000, 4000, 8000])
+def test_budget_holds_on_building_files(max_bytes):
+    for path in sorted(DATA.glob("bui_*.ttl"))[:5]:
+        summary = summarize_schema(Graph().parse(path), path.stem[4:], max_bytes=max_bytes)
+        assert size(summary) <= max_bytes or not (
+            summary["classes"] or summary["predicates"] or summary["blank_node_patterns"]
+        )
+
+
+def test_untruncated_summary():
+    g = blank_node_graph(2)
+    summary = summarize_schema(g, "X")
+    assert summary["blank_node_patterns"] == {
+        "brick:hasShape000": ["brick:shape000Property0", "brick:shape000Property1", "brick:shape000Property2"],
+        "brick:hasShape001": ["brick:shape001Property0", "brick:shape001Property1", "brick:shape001Property2"],
+    }
+    assert summary["classes"] == {"brick:Point": 2}
+    assert summary["triples"] == 10 and not summary["truncated"]
+
+
+TWO_BLANK_NODES = """
+@prefix brick: <https://brickschema.org/schema/Brick#> .
+@prefix bldg: <urn:Building#> .
+bldg:X brick:hasPoint [ brick:value "1" ], [ brick:value "2" ] .
+"""
+
+BLANK_NODE_AND_URI = """
+@prefix brick: <https://brickschema.org/schema/Brick#> .
+@prefix bldg: <urn:Building#> .
+bldg:X brick:hasPoint [ brick:value "1" ], bldg:P1 .
+"""
+
+
+@pytest.mark.parametrize("ttl", [TWO_BLANK_NODES, BLANK_NODE_AND_URI])
+def test_examples_with_blank_nodes_on_one_predicate(ttl):
+    g = Graph().parse(data=ttl, format="turtle")
+    summary = summarize_schema(g, "X")
+    examples = [e for e in summary["examples"] if e[1] == "brick:hasPoint"]
+    assert len(examples) == 2
+    assert summary["blank_node_patterns"] == {"brick:hasPoint": ["brick:value"]}
+    # deterministic order, whatever order rdflib yields the triples in
+    assert summary == summarize_schema(Graph().parse(data=ttl, format="turtle"), "X")
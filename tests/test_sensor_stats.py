@@ -0,0 +1,74 @@
+import pytest
+
+from brick_assistant.tools.sensor_stats import SensorStatsTool
+
+
+@pytest.fixture
+def tool(sensor_db):
+    return SensorStatsTool(db=sensor_db)
+
+
+# u1 reads 10 + hour of day, hourly from 2024-05-01 00:00 for 3 days
+@pytest.mark.parametrize("agg, expected", [
+    ("avg", [21.5, 24]),
+    ("min", [10, 24]),
+    ("max", [33, 24]),
+    ("sum", [516, 24]),
+    ("count", [24, 24]),
+])
+def test_aggregates_without_bucket(tool, agg, expected):
+    result = tool.query(["u1"], "2024-05-01", end="2024-05-02", agg=agg)
+    assert result["series"] == {"u1": expected}
+    assert result["columns"] == ["value", "n"]
+    assert "missing" not in result and "truncated" not in result
+
+
+@pytest.mark.parametrize("bucket, expected", [
+    ("hour", [["2024-05-01 00:00:00", 10, 1], ["2024-05-01 01:00:00", 11, 1]]),
+    ("day", [["2024-05-01", 21.5, 24], ["2024-05-02", 21.5, 24], ["2024-05-03", 21.5, 24]]),
+    ("week", [["2024-04-29", 21.5, 72]]),  # weeks start on Monday
+    ("month", [["2024-05-01", 21.5, 72]]),
+])
+def test_buckets(tool, bucket, expected):
+    end = "2024-05-01T02:00:00" if bucket == "hour" else None
+    result = tool.query(["u1"], "2024-05-01", end=end, bucket=bucket)
+    assert result["series"] == {"u1": expected}
+    assert result["columns"] == ["bucket", "value", "n"]
+
+
+def test_window_is_start_inclusive_end_exclusive(tool):
+    result = tool.query(["u2"], "2024-05-01T10:00:00", end="2024-05-01T12:00:00", agg="count")
+    assert result["series"] == {"u2": [2, 2]}
+
+
+def test_missing_uuids(tool):
+    result = tool.query(["u1", "nope"], "2024-05-01", end="2024-05-02")
+    assert list(result["series"]) == ["u1"]
+    assert result["missing"] == ["nope"]
+
+
+def test_truncated(sensor_db):
+    tool = SensorStatsTool(db=sensor_db, max_rows=5)
+    result = tool.query(["u1", "u2"], "2024-05-01", bucket="hour")
+    assert result["truncated"] is True
+    assert sum(len(points) for points in result["series"].values()) == 5
+
+
+@pytest.mark.parametrize("end", ["2024-05-01", "2024-04-30"])
+def test_end_not_after_start_is_rejected(tool, end):
+    with pytest.raises(ValueError, match="must be after start"):
+        tool.query(["u1"], "2024-05-01", end=end)
+
+
+def test_max_uuids(sensor_db):
+    tool = SensorStatsTool(db=sensor_db, max_uuids=2)
+    with pytest.raises(ValueError, match="Too many UUIDs"):
+        tool.query(["u1", "u2", "u3"], "2024-05-01")
+    assert tool.query(["u1", "u2", "u1"], "2024-05-01", agg="count")["series"] == {"u1": [72, 72], "u2": [72, 72]}
+
+
+def test_run_reports_errors_and_expands_handles(tool):
+    assert tool._run(uuids=[], start="2024-05-01").startswith("Error: No UUIDs")
+    out = tool._run(uuids=["@bcgw_temp"], start="2024-05-01", end="2024-05-02", agg="max",
+                    uuid_sets={"@bcgw_temp": ["u1", "u2"]})
+    assert out == '{"agg":"max","bucket":"none","columns":["value","n"],"series":{"u1":[33,24],"u2":[43,24]}}'
@@ -0,0 +1,92 @@
+import os
+
+import pytest
+from rdflib import Graph, Literal, URIRef
+from rdflib.compare import isomorphic
+
+from brick_assistant.tools.snapshot import (
+    MAGIC, SnapshotError, compile_all, compile_snapshot, load_building_graph, load_snapshot, snapshot_path_for,
+)
+from conftest import add_zone, touch
+
+EXTRA_ZONE = URIRef("urn:Building#BCGW_Extra")
+
+TERM_KINDS = """
+@prefix brick: <https://brickschema.org/schema/Brick#> .
+@prefix xsd: <http://www.w3.org/2001/XMLSchema#> .
+<urn:Building#B1> a brick:Building ;
+    brick:hasLocation [ brick:value "Bussolengo"@it ] ;
+    brick:area [ brick:value "1527"^^xsd:integer ; brick:hasUnit "square meter" ] .
+"""
+
+
+def parse(path):
+    g = Graph()
+    g.parse(path, format="turtle")
+    return g
+
+
+def test_round_trip_is_isomorphic(ttl_dir):
+    ttl_path = ttl_dir / "bui_BCGW.ttl"
+    snap_path = compile_snapshot(ttl_path)
+
+    assert snap_path == snapshot_path_for(ttl_path) == ttl_dir / "snapshots" / "bui_BCGW.snap"
+    assert snap_path.read_bytes().startswith(MAGIC)
+    expected, loaded = parse(ttl_path), load_snapshot(snap_path)
+    assert len(loaded) == len(expected)
+    assert isomorphic(loaded, expected)
+    assert dict(loaded.namespaces())["brick"] == dict(expected.namespaces())["brick"]
+
+
+def test_round_trip_keeps_blank_nodes_and_literal_types(tmp_path):
+    ttl_path = tmp_path / "bui_B1.ttl"
+    ttl_path.write_text(TERM_KINDS)
+    loaded = load_snapshot(compile_snapshot(ttl_path, tmp_path / "bui_B1.snap"))
+
+    assert isomorphic(loaded, parse(ttl_path))
+    assert Literal("Bussolengo", lang="it") in set(loaded.objects())
+    assert Literal("1527", datatype=URIRef("http://www.w3.org/2001/XMLSchema#integer")) in set(loaded.objects())
+
+
+def test_fresh_snapshot_is_loaded(ttl_dir):
+    ttl_path = ttl_dir / "bui_BCGW.ttl"
+    original = ttl_path.read_text()
+    add_zone(ttl_path)
+    snap_path = compile_snapshot(ttl_path)
+    # back to the original Turtle, as old as the snapshot: only the snapshot has the extra zone
+    ttl_path.write_text(original)
+    os.utime(ttl_path, ns=(os.stat(snap_path).st_atime_ns, os.stat(snap_path).st_mtime_ns))
+
+    assert (EXTRA_ZONE, None, None) in load_building_graph(ttl_path)
+
+
+def test_stale_snapshot_is_ignored(ttl_dir):
+    ttl_path = ttl_dir / "bui_BCGW.ttl"
+    compile_snapshot(ttl_path)
+    assert (EXTRA_ZONE, None, None) not in load_building_graph(ttl_path)
+
+    add_zone(ttl_path)  # the TTL is now newer than its snapshot
+    g = load_building_graph(ttl_path)
+    assert (EXTRA_ZONE, None, None) in g
+    assert isomorphic(g, parse(ttl_path))
+
+
+def test_unreadable_snapshot_falls_back_to_the_ttl(ttl_dir):
+    ttl_path = ttl_dir / "bui_BCGW.ttl"
+    snap_path = compile_snapshot(ttl_path)
+    snap_path.write_bytes(b"not a snapshot")
+    touch(snap_path)
+
+    with pytest.raises(SnapshotError):
+        load_snapshot(snap_path)
+    assert isomorphic(load_building_graph(ttl_path), parse(ttl_path))
+
+
+def test_compile_all_reports_each_building(ttl_dir):
+    (ttl_dir / "bui_BROKEN.ttl").write_text("this is not turtle")
+    report = compile_all(ttl_dir, ttl_dir / "out")
+
+    assert report[ttl_dir / "bui_BCGW.ttl"] is None
+    assert report[ttl_dir / "bui_BROKEN.ttl"]
+    assert (ttl_dir / "out" / "bui_BCGW.snap").exists()
+    assert not (ttl_dir / "out" / "bui_BROKEN.snap").exists()
@@ -0,0 +1,115 @@
+import types
+
+import pytest
+from sqlalchemy import text
+
+from brick_assistant.tools import result_cache
+from brick_assistant.tools.sql_query import SQLQueryTool, SQLResultCache, normalize_sql
+
+COUNT = "SELECT COUNT(*) FROM sensor_data WHERE uuid = 'u1'"
+
+
+class Clock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def add_reading(db, uuid="u1"):
+    with db._engine.begin() as connection:
+        connection.execute(text("INSERT INTO sensor_data VALUES (:uuid, '2024-06-01 00:00:00', 1.0)"), {"uuid": uuid})
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def cache(clock):
+    return SQLResultCache(ttl_s=60, bucket_s=300, clock=clock)
+
+
+@pytest.fixture
+def tool(sensor_db, cache):
+    return SQLQueryTool(db=sensor_db, cache=cache)
+
+
+def test_hit_and_miss(tool, sensor_db, cache):
+    assert tool._run(COUNT) == "[(72,)]"
+    add_reading(sensor_db)
+    # equivalent text (case, whitespace, comment, trailing ';') hits the cached, now stale, result
+    assert tool._run("select count(*)  from sensor_data -- u1 only\n where uuid = 'u1';") == "[(72,)]"
+    # string literals are case-sensitive: a different query
+    assert tool._run("SELECT COUNT(*) FROM sensor_data WHERE uuid = 'U1'") == "[(0,)]"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 2)
+
+
+def test_ttl_expiry(tool, sensor_db, cache, monkeypatch):
+    monotonic = Clock(100.0)
+    monkeypatch.setattr(result_cache, "time", types.SimpleNamespace(monotonic=monotonic))
+    assert tool._run(COUNT) == "[(72,)]"
+    add_reading(sensor_db)
+    monotonic.now += 59
+    assert tool._run(COUNT) == "[(72,)]"
+    monotonic.now += 2
+    assert tool._run(COUNT) == "[(73,)]"
+    assert cache.stats()["expirations"] == 1
+
+
+def test_time_relative_queries_roll_over_with_the_bucket(tool, sensor_db, clock):
+    query = "SELECT COUNT(*) FROM sensor_data WHERE uuid = 'u1' AND \"timestamp\" < datetime('now')"
+    assert tool._run(query) == "[(72,)]"
+    add_reading(sensor_db)
+    assert tool._run(query) == "[(72,)]"
+    clock.now += 300
+    assert tool._run(query) == "[(73,)]"
+
+
+def test_invalidate(tool, sensor_db, cache):
+    other = "SELECT COUNT(*) FROM sensor_data WHERE uuid = 'u2'"
+    tool._run(COUNT)
+    tool._run(other)
+    add_reading(sensor_db)
+    add_reading(sensor_db, "u2")
+    assert cache.invalidate(contains="uuid = 'u1'") == 1
+    assert tool._run(COUNT) == "[(73,)]"
+    assert tool._run(other) == "[(72,)]"
+    assert cache.invalidate(database="postgresql://elsewhere") == 0
+    assert cache.invalidate(contains="SENSOR_DATA") == 2
+    assert tool._run(other) == "[(73,)]"
+
+
+def test_errors_and_writes_are_not_cached(tool, sensor_db, cache):
+    assert tool._run("SELECT nope FROM sensor_data").startswith("Error:")
+    assert cache.stats()["entries"] == 0
+    assert cache.key("db", "DELETE FROM sensor_data") is None
+
+
+@pytest.mark.parametrize("query", [
+    "WITH gone AS (DELETE FROM sensor_data WHERE uuid = 'u1' RETURNING *) SELECT COUNT(*) FROM gone",
+    "SELECT * INTO backup FROM sensor_data",
+    "SELECT 1; DROP TABLE sensor_data",
+    "SELECT nextval('readings_seq')",
+    "SELECT 'unterminated",
+])
+def test_queries_with_side_effects_are_not_cacheable(cache, query):
+    assert cache.key("db", query) is None
+
+
+def test_write_keywords_in_literals_do_not_block_caching(cache):
+    assert cache.key("db", "WITH t AS (SELECT 'delete' AS op) SELECT op FROM t") is not None
+
+
+def test_bound_parameters_are_part_of_the_key(tool, cache):
+    query = "SELECT COUNT(*) FROM sensor_data WHERE uuid IN (@bcgw_temp)"
+    assert tool._run(query, uuid_sets={"@bcgw_temp": ["u1"]}) == "[(72,)]"
+    assert tool._run(query, uuid_sets={"@bcgw_temp": ["u1", "u2"]}) == "[(144,)]"
+    assert cache.stats()["entries"] == 2
+
+
+def test_normalize_sql():
+    assert normalize_sql("SELECT  a /* x */ FROM \"T\"\n WHERE b = 'X' ;") == "select a from \"T\" where b = 'X'"
@@ -0,0 +1,141 @@
+import pytest
+
+from brick_assistant.tools.sql_validator import SQLParseError, SQLValidator, tokenize
+
+
+@pytest.fixture
+def validator():
+    return SQLValidator(top_k=5, max_rows=100)
+
+
+@pytest.mark.parametrize("query", [
+    "SELECT uuid FROM sensor_data LIMIT 5",
+    "select uuid from sensor_data limit 5;",
+    "WITH t AS (SELECT uuid FROM sensor_data) SELECT uuid FROM t LIMIT 5",
+    "(SELECT uuid FROM sensor_data) LIMIT 5",
+    "SELECT 'DROP TABLE x; --' AS s, \"insert\" FROM t LIMIT 5",
+    "SELECT uuid FROM sensor_data -- DELETE FROM t\nLIMIT 5",
+])
+def test_accepted_unchanged(validator, query):
+    result = validator.validate(query)
+    assert result.ok, result.errors
+    assert result.rewrites == []
+
+
+@pytest.mark.parametrize("query, error", [
+    ("", "empty query"),
+    ("SELECT 1; SELECT 2", "only a single statement is allowed"),
+    ("SELECT 1; DROP TABLE sensor_data", "only a single statement is allowed"),
+    ("DELETE FROM sensor_data", "only SELECT queries are allowed, not DELETE"),
+    ("EXPLAIN SELECT 1", "only SELECT queries are allowed, not EXPLAIN"),
+    ("WITH d AS (DELETE FROM t RETURNING uuid) SELECT uuid FROM d", "DELETE is not allowed in a read-only query"),
+    ("SELECT uuid INTO backup FROM t", "INTO is not allowed in a read-only query"),
+    ("SELECT pg_sleep(10)", "function pg_sleep() is not allowed"),
+    ("SELECT nextval('seq')", "function nextval() is not allowed"),
+])
+def test_rejected(validator, query, error):
+    result = validator.validate(query)
+    assert not result.ok
+    assert error in result.errors
+    assert result.feedback().startswith("Error: query rejected by the SQL validator:")
+
+
+def test_denied_function_name_as_column_is_allowed(validator):
+    assert validator.validate("SELECT nextval FROM t LIMIT 5").ok
+
+
+@pytest.mark.parametrize("query, ok", [
+    ("SELECT * FROM t LIMIT 5", False),
+    ("SELECT DISTINCT * FROM t LIMIT 5", False),
+    ("SELECT a, t.* FROM t LIMIT 5", False),
+    ("SELECT uuid FROM (SELECT * FROM t) s LIMIT 5", False),
+    ("SELECT COUNT(*) FROM t LIMIT 5", True),
+    ("SELECT value * 2 AS v FROM t LIMIT 5", True),
+    ("SELECT uuid FROM t WHERE EXISTS (SELECT 1 FROM u) LIMIT 5", True),
+])
+def test_star(validator, query, ok):
+    result = validator.validate(query)
+    assert result.ok is ok
+    if not ok:
+        assert result.errors == ["SELECT * is not allowed; list only the columns needed"]
+
+
+@pytest.mark.parametrize("query, error", [
+    ("SELECT uuid FROM t WHERE uuid NOT IN (SELECT uuid FROM u) LIMIT 5", "NOT IN (subquery)"),
+    ("SELECT uuid FROM t WHERE uuid NOT IN ('a', NULL) LIMIT 5", "NOT IN list containing NULL never matches"),
+    ("SELECT uuid FROM t WHERE uuid NOT IN ('a', coalesce(NULL, 'b')) LIMIT 5", None),
+    ("SELECT uuid FROM t WHERE uuid NOT IN ('a', 'b') LIMIT 5", None),
+    ("SELECT uuid FROM t WHERE uuid IN (SELECT uuid FROM u) LIMIT 5", None),
+])
+def test_not_in(validator, query, error):
+    errors = validator.validate(query).errors
+    if error is None:
+        assert errors == []
+    else:
+        assert len(errors) == 1 and errors[0].startswith(error)
+
+
+def test_null_comparison_rewrite(validator):
+    result = validator.validate("SELECT uuid FROM t WHERE value = NULL AND unit <> NULL AND x != null LIMIT 5")
+    assert result.ok
+    assert result.query == "SELECT uuid FROM t WHERE value IS NULL AND unit IS NOT NULL AND x IS NOT null LIMIT 5"
+    assert result.rewrites == ["'= NULL' -> 'IS NULL'", "'<> NULL' -> 'IS NOT NULL'", "'!= NULL' -> 'IS NOT NULL'"]
+
+
+@pytest.mark.parametrize("query, expected, rewrites", [
+    ("SELECT uuid FROM t", "SELECT uuid FROM t LIMIT 5", ["added LIMIT 5"]),
+    ("SELECT uuid FROM t;", "SELECT uuid FROM t LIMIT 5", ["added LIMIT 5"]),
+    ("SELECT uuid FROM t LIMIT 50", "SELECT uuid FROM t LIMIT 50", []),
+    ("SELECT uuid FROM t LIMIT 5000", "SELECT uuid FROM t LIMIT 100", ["LIMIT 5000 -> LIMIT 100"]),
+    ("SELECT uuid FROM t LIMIT ALL", "SELECT uuid FROM t LIMIT 100", ["LIMIT ALL -> LIMIT 100"]),
+    ("SELECT uuid FROM t LIMIT 5000 OFFSET 10", "SELECT uuid FROM t LIMIT 100 OFFSET 10", ["LIMIT 5000 -> LIMIT 100"]),
+    # only the outer query is capped
+    ("SELECT uuid FROM (SELECT uuid FROM t LIMIT 5000) s", "SELECT uuid FROM (SELECT uuid FROM t LIMIT 5000) s LIMIT 5",
+     ["added LIMIT 5"]),
+    ("SELECT uuid FROM t FETCH FIRST 10 ROWS ONLY", "SELECT uuid FROM t FETCH FIRST 10 ROWS ONLY", []),
+])
+def test_limit(validator, query, expected, rewrites):
+    result = validator.validate(query)
+    assert result.ok
+    assert result.query == expected
+    assert result.rewrites == rewrites
+
+
+def test_warnings_do_not_reject(validator):
+    result = validator.validate("SELECT a FROM t WHERE ts BETWEEN '2024-01-01' AND '2024-02-01' UNION SELECT b FROM u")
+    assert result.ok
+    assert len(result.warnings) == 2
+
+
+@pytest.mark.parametrize("query", [
+    "SELECT uuid FROM t LIMIT $1",
+    "SELECT uuid FROM t WHERE name = 'unterminated",
+    "SELECT (uuid FROM t",
+    "SELECT uuid) FROM t",
+])
+def test_unparsed_queries_fall_back(validator, query):
+    result = validator.validate(query)
+    assert not result.parsed and not result.ok
+    assert result.query == query
+    assert result.feedback().startswith("Error: query rejected by the SQL validator:")
+
+
+def test_tokenize_depth():
+    tokens = [t for t in tokenize("SELECT (a + (b)) FROM t") if t.kind != "ws"]
+    assert [(t.text, t.depth) for t in tokens] == [
+        ("SELECT", 0), ("(", 0), ("a", 1), ("+", 1), ("(", 1), ("b", 2), (")", 1), (")", 0), ("FROM", 0), ("t", 0),
+    ]
+    with pytest.raises(SQLParseError):
+        tokenize("SELECT ((1)")
+
+
+def test_stats(validator):
+    validator.validate("SELECT uuid FROM t LIMIT 5")
+    validator.validate("SELECT uuid FROM t")
+    validator.validate("DELETE FROM t")
+    validator.validate("SELECT uuid FROM t LIMIT $1")
+    stats = validator.stats()
+    assert {k: stats[k] for k in ("validated", "rejected", "rewritten", "unparsed")} == {
+        "validated": 4, "rejected": 1, "rewritten": 1, "unparsed": 1,
+    }
+    assert stats["rules"] == {"only SELECT queries are allowed, not DELETE": 1}